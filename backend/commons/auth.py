@@ -1,17 +1,24 @@
+import asyncio
 import time
-import jwt
-import os
-from passlib.context import CryptContext  # pss ver hash
+from functools import lru_cache
 from fastapi import HTTPException, status
-from dotenv import load_dotenv
+from commons.settings import settings
 
+# passlib/bcrypt and PyJWT (with its cryptography backends) are imported on
+# first use to keep app startup fast
 
-load_dotenv()
+JWT_SECRET = settings.jwt_secret
+JWT_ALGORITHM = settings.jwt_algorithm
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
-JWT_SECRET = os.environ.get("secret")
-JWT_ALGORITHM = os.environ.get("algorithm")
+@lru_cache(maxsize=1)
+def get_pwd_context():
+    """
+    Build the bcrypt password context on first use.
+    """
+    from passlib.context import CryptContext  # pss ver hash
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
 def signJWT(
@@ -33,6 +40,8 @@ def signJWT(
         "status": user_status,
         "expires": time.time() + expiry_duration,
     }
+    import jwt
+
     token = jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
     return token
 
@@ -49,6 +58,8 @@ def encodeJWT(payload: dict = {}, expiry_duration: int = 3600):
 
     payload_copy = dict(payload) if payload else {}
     payload_copy["expires"] = time.time() + expiry_duration
+    import jwt
+
     token = jwt.encode(payload_copy, JWT_SECRET, algorithm=JWT_ALGORITHM)
     return token
 
@@ -57,6 +68,8 @@ def decodeJWT(token: str):
     """
     Decode a JWT token to extract user role, id, status, and expiry time.
     """
+    import jwt
+
     try:
         decoded_token = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
         return decoded_token if decoded_token.get("expires") > time.time() else None
@@ -68,14 +81,28 @@ def encrypt_password(password: str) -> str:
     """
     Encrypt a plain password using bcrypt hashing.
     """
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verify if the provided plain password matches the hashed password.
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
+
+
+async def encrypt_password_async(password: str) -> str:
+    """
+    Hash a password in a worker thread so bcrypt does not block the event loop.
+    """
+    return await asyncio.to_thread(encrypt_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a password in a worker thread so bcrypt does not block the event loop.
+    """
+    return await asyncio.to_thread(verify_password, plain_password, hashed_password)
 
 
 def encode_reset_password_token(email: str, expiry_duration: int = 300) -> str:
@@ -89,5 +116,7 @@ def encode_reset_password_token(email: str, expiry_duration: int = 300) -> str:
         )
 
     payload = {"email": email, "expires": time.time() + expiry_duration}
+    import jwt
+
     token = jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
     return token
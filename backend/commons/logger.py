@@ -1,17 +1,38 @@
 import logging
 import os
+from commons.settings import settings
+
+_file_handlers = {}
+
+
+class LazyFileHandler(logging.FileHandler):
+    """
+    File handler that creates its directory and opens the file on the first
+    record instead of at import time.
+    """
+
+    def __init__(self, filename: str, mode: str = "a"):
+        super().__init__(filename=filename, mode=mode, delay=True)
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
 
 
 def get_file_handler(
-    log_name: str, mode: int, formatter: logging.Formatter, save_path: str = "logs"
+    log_name: str, mode: int, formatter: logging.Formatter, save_path: str = None
 ):
-    os.makedirs(save_path, exist_ok=True)
+    save_path = save_path or settings.log_dir
+    filename = os.path.join(save_path, log_name)
+    # One handler per log file, shared by every logger
+    if filename in _file_handlers:
+        return _file_handlers[filename]
+
     # file logs
-    file_handler = logging.FileHandler(
-        filename=os.path.join(save_path, log_name), mode="a"
-    )
+    file_handler = LazyFileHandler(filename=filename, mode="a")
     file_handler.setLevel(mode)
     file_handler.setFormatter(formatter)
+    _file_handlers[filename] = file_handler
     return file_handler
 
 
@@ -19,15 +40,13 @@ def config_logger(logger: logging.Logger, debug_mode: bool = True):
     formatter = logging.Formatter(
         "[pid=%(process)s] - [%(asctime)s] - [%(name)s] - [%(levelname)s] - [%(message)s]"
     )
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.DEBUG)
-    console_handler.setFormatter(formatter)
 
     debug_logger = get_file_handler(
         log_name="debug.log", mode=logging.DEBUG, formatter=formatter
     )
 
-    logger.addHandler(debug_logger)
+    if debug_logger not in logger.handlers:
+        logger.addHandler(debug_logger)
 
     logger.setLevel(logging.DEBUG)
     return logger
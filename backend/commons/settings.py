@@ -0,0 +1,138 @@
+"""
+Application Settings Module
+
+Loads the .env file once and exposes every environment-driven setting
+through a single shared Settings instance.
+"""
+
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+class Settings:
+    """
+    Environment-driven application settings.
+
+    Attributes:
+        jwt_secret: Secret used to sign JWT tokens (env: secret)
+        jwt_algorithm: JWT signing algorithm (env: algorithm)
+        mongodb_uri: MongoDB connection string
+        database_name: MongoDB database name
+        repository_backend: "mongo", or "memory" to keep every document in
+            the process (no database needed)
+        gmail_user: Sender address for outgoing emails
+        gmail_app_password: SMTP password for the sender address
+        smtp_host: SMTP server host
+        smtp_port: SMTP server port
+        smtp_start_tls: Whether to upgrade the SMTP connection with STARTTLS
+        log_dir: Directory for log files
+        loop_monitor_interval: Seconds between two event-loop lag probes
+        loop_block_threshold: Seconds without a loop tick reported as blocking
+        server_host: Address the production server binds to
+        server_port: Port the production server binds to
+        server_workers: Number of worker processes (defaults to CPU count)
+        graceful_timeout: Seconds a worker waits for in-flight requests on
+            shutdown
+        cache_backend: "memory" (per process), "redis" (shared, required to
+            cache with several workers) or "none"
+        redis_url: Redis connection string for the shared cache
+        user_cache_ttl: Seconds a cached user profile stays valid
+        user_cache_max_entries: Maximum number of cached user profiles
+        order_cache_ttl: Seconds a cached order response stays valid
+        order_cache_max_entries: Maximum number of cached order responses
+        order_batch_max_size: Maximum number of orders in one batch request
+        export_batch_size: Documents fetched per cursor batch by order exports
+        order_number_block_size: Order numbers reserved per counter round-trip
+        idempotency_ttl_seconds: Seconds a stored Idempotency-Key response is kept
+        idempotency_wait_seconds: Seconds a duplicate request waits for the
+            request that holds its Idempotency-Key
+        idempotency_lock_seconds: Seconds after which a key still processing
+            is considered abandoned and may be taken over
+        scheduler_enabled: Run the background jobs in this process
+        order_stats_rebuild_hours: Hours between two user_order_stats rebuilds
+        order_archive_after_days: Days without change after which completed
+            and cancelled orders are moved to orders_archive
+        order_archive_batch_size: Orders moved per archival batch
+        order_archive_interval_hours: Hours between two archival runs
+        order_events_source: Source of the order stream events: memory (writes
+            of this process), change_stream (replica set) or auto
+        sse_max_connections: Open order streams allowed per worker
+        sse_queue_size: Events buffered per order stream before a resync
+        sse_heartbeat_seconds: Seconds between two keepalives on idle streams
+    """
+
+    def __init__(self):
+        self.jwt_secret = os.environ.get("secret")
+        self.jwt_algorithm = os.environ.get("algorithm")
+
+        self.mongodb_uri = os.getenv("MONGODB_URI", "mongodb://localhost:27017")
+        self.database_name = os.getenv("DATABASE_NAME", "authentication")
+        self.repository_backend = os.getenv("REPOSITORY_BACKEND", "mongo").lower()
+
+        self.gmail_user = os.environ.get("gmail_user")
+        self.gmail_app_password = os.environ.get("gmail_app_password")
+        self.smtp_host = os.getenv("SMTP_HOST", "smtp.gmail.com")
+        self.smtp_port = int(os.getenv("SMTP_PORT", "587"))
+        self.smtp_start_tls = _env_bool("SMTP_START_TLS", True)
+
+        self.log_dir = os.getenv("LOG_DIR", "logs")
+
+        self.loop_monitor_interval = float(os.getenv("LOOP_MONITOR_INTERVAL", "0.1"))
+        self.loop_block_threshold = float(os.getenv("LOOP_BLOCK_THRESHOLD", "0.25"))
+
+        self.server_host = os.getenv("HOST", "0.0.0.0")
+        self.server_port = int(os.getenv("PORT", "8000"))
+        self.server_workers = int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1))
+        self.graceful_timeout = int(os.getenv("GRACEFUL_TIMEOUT", "30"))
+
+        self.cache_backend = os.getenv("CACHE_BACKEND", "memory").lower()
+        self.redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+        self.user_cache_ttl = float(os.getenv("USER_CACHE_TTL", "60"))
+        self.user_cache_max_entries = int(os.getenv("USER_CACHE_MAX_ENTRIES", "10000"))
+        self.order_cache_ttl = float(os.getenv("ORDER_CACHE_TTL", "300"))
+        self.order_cache_max_entries = int(
+            os.getenv("ORDER_CACHE_MAX_ENTRIES", "10000")
+        )
+        self.order_batch_max_size = int(os.getenv("ORDER_BATCH_MAX_SIZE", "500"))
+        self.export_batch_size = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+        self.order_number_block_size = int(os.getenv("ORDER_NUMBER_BLOCK_SIZE", "100"))
+        self.idempotency_ttl_seconds = int(
+            os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400")
+        )
+        self.idempotency_wait_seconds = float(
+            os.getenv("IDEMPOTENCY_WAIT_SECONDS", "10")
+        )
+        self.idempotency_lock_seconds = float(
+            os.getenv("IDEMPOTENCY_LOCK_SECONDS", "60")
+        )
+
+        self.scheduler_enabled = _env_bool("SCHEDULER_ENABLED", False)
+        self.order_stats_rebuild_hours = float(
+            os.getenv("ORDER_STATS_REBUILD_HOURS", "24")
+        )
+        self.order_archive_after_days = float(
+            os.getenv("ORDER_ARCHIVE_AFTER_DAYS", "90")
+        )
+        self.order_archive_batch_size = int(
+            os.getenv("ORDER_ARCHIVE_BATCH_SIZE", "1000")
+        )
+        self.order_archive_interval_hours = float(
+            os.getenv("ORDER_ARCHIVE_INTERVAL_HOURS", "24")
+        )
+
+        self.order_events_source = os.getenv("ORDER_EVENTS_SOURCE", "auto")
+        self.sse_max_connections = int(os.getenv("SSE_MAX_CONNECTIONS", "1000"))
+        self.sse_queue_size = int(os.getenv("SSE_QUEUE_SIZE", "100"))
+        self.sse_heartbeat_seconds = float(os.getenv("SSE_HEARTBEAT_SECONDS", "15"))
+
+
+settings = Settings()
@@ -1,4 +1 @@
 from commons.logger import logger
-from dotenv import load_dotenv
-
-load_dotenv()
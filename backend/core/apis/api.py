@@ -1,6 +1,17 @@
 from fastapi import FastAPI
 from contextlib import asynccontextmanager
 from core.database.database import connect_to_mongo, close_mongo_connection
+from core.utils.loop_monitor import loop_monitor, RouteTrackingMiddleware
+from core.utils.serializers import ORJSONResponse
+from core.utils.cache import cache_stats
+from core.utils.single_flight import single_flight_stats
+from core.utils.scheduler import start_scheduler, stop_scheduler
+from core.cruds.order_crud import order_numbers
+from core.utils.order_events import (
+    order_events,
+    start_order_events,
+    stop_order_events,
+)
 
 from core.apis.routers.user_router import user_router
 from core.apis.routers.order_router import order_router
@@ -13,12 +24,18 @@ logging = logger(__name__)
 async def lifespan(app: FastAPI):
     try:
         logging.info("Starting API")
+        loop_monitor.start()
         await connect_to_mongo()
+        start_scheduler()
+        await start_order_events()
     except Exception as e:
         logging.error(f"Error connecting to MongoDB: {e}")
     yield
     logging.info("Shutting down API")
+    stop_scheduler()
+    await stop_order_events()
     await close_mongo_connection()
+    await loop_monitor.stop()
 
 
 app = FastAPI(
@@ -26,6 +43,7 @@ app = FastAPI(
     description="API for user and order management",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 from fastapi.middleware.cors import CORSMiddleware
@@ -37,6 +55,7 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(RouteTrackingMiddleware, monitor=loop_monitor)
 
 app.include_router(user_router, tags=["User Management"])
 app.include_router(order_router, tags=["Order Management"])
@@ -45,3 +64,14 @@ app.include_router(order_router, tags=["Order Management"])
 @app.get("/", tags=["Health"])
 async def root():
     return {"message": "Welcome to the User Management API!"}
+
+
+@app.get("/health/metrics", tags=["Health"])
+async def metrics():
+    return {
+        "event_loop": loop_monitor.stats(),
+        "cache": cache_stats(),
+        "single_flight": single_flight_stats(),
+        "order_numbers": order_numbers.stats(),
+        "order_events": order_events.stats(),
+    }
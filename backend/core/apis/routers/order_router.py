@@ -1,17 +1,42 @@
-from fastapi import APIRouter, HTTPException, Depends, Query
+from typing import Optional, Union
+from fastapi import (
+    APIRouter,
+    HTTPException,
+    Depends,
+    Query,
+    Header,
+    Path,
+    Response,
+)
 from core.apis.schemas.requests.order_request import (
     OrderCreateRequest,
     OrderUpdateRequest,
+    OrderBatchCreateRequest,
+    OrderStatusBatchUpdateRequest,
+    OrderLookupRequest,
 )
 from core.apis.schemas.responses.order_responses import (
     OrderResponse,
+    OrderPartialResponse,
     OrderListResponse,
+    OrderPartialListResponse,
     OrderMessageResponse,
+    OrderBatchCreateResponse,
+    OrderStatusBatchUpdateResponse,
+    OrderLookupResponse,
 )
 from core.controllers.order_controller import OrderController
+from core.utils.idempotency import run_idempotent
+from core.utils.serializers import (
+    ORJSONResponse,
+    ORDER_FIELDS,
+    parse_fields,
+    etag_matches,
+)
 from core import logger
 from fastapi.security import OAuth2PasswordBearer
 from commons.auth import decodeJWT
+from commons.settings import settings
 
 logging = logger(__name__)
 
@@ -19,10 +44,20 @@ order_router = APIRouter()
 
 oauth2_schema = OAuth2PasswordBearer(tokenUrl="/v1/users/login")
 
+FIELDS_DESCRIPTION = "Comma-separated list of fields to return (sparse fieldset)"
+IDEMPOTENCY_DESCRIPTION = (
+    "Retries with the same key and body return the first response instead "
+    "of creating the order again"
+)
+
 
 @order_router.post("/v1/orders", status_code=201, response_model=OrderMessageResponse)
 async def create_order(
-    request: OrderCreateRequest, token: str = Depends(oauth2_schema)
+    request: OrderCreateRequest,
+    idempotency_key: Optional[str] = Header(
+        None, min_length=1, max_length=255, description=IDEMPOTENCY_DESCRIPTION
+    ),
+    token: str = Depends(oauth2_schema),
 ):
     try:
         logging.info("calling POST /v1/orders")
@@ -37,8 +72,18 @@ async def create_order(
                 detail="Not authorized to create order for another user",
             )
 
-        result = await OrderController().create_order(request.model_dump())
-        return OrderMessageResponse(**result)
+        order_data = request.model_dump()
+
+        async def create():
+            result = await OrderController().create_order(order_data)
+            return ORJSONResponse(result, status_code=201)
+
+        return await run_idempotent(
+            f"orders:{user_details.get('id')}",
+            idempotency_key,
+            request.model_dump(mode="json"),
+            create,
+        )
     except HTTPException:
         raise
     except Exception as error:
@@ -46,23 +91,174 @@ async def create_order(
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
-@order_router.get("/v1/orders/{order_id}", response_model=OrderResponse)
-async def get_order(order_id: str, token: str = Depends(oauth2_schema)):
+@order_router.post("/v1/orders/batch", response_model=OrderBatchCreateResponse)
+async def create_orders_batch(
+    request: OrderBatchCreateRequest, token: str = Depends(oauth2_schema)
+):
     try:
-        logging.info(f"calling GET /v1/orders/{order_id}")
+        logging.info(f"calling POST /v1/orders/batch with {len(request.orders)} orders")
         user_details = decodeJWT(token)
         if not user_details:
             raise HTTPException(status_code=401, detail="Invalid or expired token")
 
-        result = await OrderController().get_order(order_id)
+        if len(request.orders) > settings.order_batch_max_size:
+            raise HTTPException(
+                status_code=400,
+                detail=f"A batch accepts at most {settings.order_batch_max_size} orders",
+            )
+
+        # Items for another user are rejected one by one in the results
+        result = await OrderController().create_orders(
+            request.orders, owner_id=user_details.get("id")
+        )
+        return ORJSONResponse(result)
+    except HTTPException:
+        raise
+    except Exception as error:
+        logging.error(f"Error in POST /v1/orders/batch: {str(error)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
 
-        # Authorization check: only the owner can view their order
-        if result.get("user_id") != user_details.get("id"):
+@order_router.post("/v1/orders/lookup", response_model=OrderLookupResponse)
+async def lookup_orders(
+    request: OrderLookupRequest,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    token: str = Depends(oauth2_schema),
+):
+    try:
+        logging.info(f"calling POST /v1/orders/lookup with {len(request.ids)} ids")
+        user_details = decodeJWT(token)
+        if not user_details:
+            raise HTTPException(status_code=401, detail="Invalid or expired token")
+
+        if len(request.ids) > settings.order_batch_max_size:
             raise HTTPException(
-                status_code=403, detail="Not authorized to access this order"
+                status_code=400,
+                detail=f"A lookup accepts at most {settings.order_batch_max_size} ids",
             )
 
-        return OrderResponse(**result)
+        # Only the caller's orders are returned; others are listed as missing
+        result = await OrderController().lookup_orders(
+            request.ids,
+            owner_id=user_details.get("id"),
+            fields=parse_fields(fields, ORDER_FIELDS),
+        )
+        return ORJSONResponse(result)
+    except HTTPException:
+        raise
+    except Exception as error:
+        logging.error(f"Error in POST /v1/orders/lookup: {str(error)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@order_router.patch(
+    "/v1/orders/batch/status", response_model=OrderStatusBatchUpdateResponse
+)
+async def transition_order_statuses(
+    request: OrderStatusBatchUpdateRequest, token: str = Depends(oauth2_schema)
+):
+    try:
+        logging.info(
+            f"calling PATCH /v1/orders/batch/status with {len(request.order_ids)} ids"
+        )
+        user_details = decodeJWT(token)
+        if not user_details:
+            raise HTTPException(status_code=401, detail="Invalid or expired token")
+
+        if len(request.order_ids) > settings.order_batch_max_size:
+            raise HTTPException(
+                status_code=400,
+                detail=f"A batch accepts at most {settings.order_batch_max_size} orders",
+            )
+
+        # Orders of other users are reported as errors in the results
+        result = await OrderController().transition_statuses(
+            request.order_ids, request.status, owner_id=user_details.get("id")
+        )
+        return ORJSONResponse(result)
+    except HTTPException:
+        raise
+    except Exception as error:
+        logging.error(f"Error in PATCH /v1/orders/batch/status: {str(error)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+async def _order_response(
+    order_id: str, user_id: str, fields: Optional[str], if_none_match: Optional[str]
+):
+    requested_fields = parse_fields(fields, ORDER_FIELDS)
+    if requested_fields:
+        result = await OrderController().get_order_fields(
+            order_id, requested_fields, owner_id=user_id
+        )
+        return ORJSONResponse(result)
+
+    entry = await OrderController().get_order_response(order_id)
+
+    # Authorization check: only the owner can view their order
+    if entry["user_id"] != user_id:
+        raise HTTPException(
+            status_code=403, detail="Not authorized to access this order"
+        )
+
+    headers = {
+        "ETag": entry["etag"],
+        "Last-Modified": entry["last_modified"],
+        "Cache-Control": "private, no-cache",
+    }
+    if etag_matches(if_none_match, entry["etag"]):
+        return Response(status_code=304, headers=headers)
+    return Response(
+        content=entry["body"], media_type="application/json", headers=headers
+    )
+
+
+@order_router.get(
+    "/v1/orders/by-number/{order_number}",
+    response_model=Union[OrderResponse, OrderPartialResponse],
+)
+async def get_order_by_number(
+    order_number: int = Path(..., ge=0),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    if_none_match: Optional[str] = Header(None),
+    token: str = Depends(oauth2_schema),
+):
+    try:
+        logging.info(f"calling GET /v1/orders/by-number/{order_number}")
+        user_details = decodeJWT(token)
+        if not user_details:
+            raise HTTPException(status_code=401, detail="Invalid or expired token")
+
+        # Same response, ETag and cache as GET /v1/orders/{order_id}
+        order_id = await OrderController().get_order_id_by_number(order_number)
+        return await _order_response(
+            order_id, user_details.get("id"), fields, if_none_match
+        )
+    except HTTPException:
+        raise
+    except Exception as error:
+        logging.error(f"Error in GET /v1/orders/by-number/{order_number}: {str(error)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@order_router.get(
+    "/v1/orders/{order_id}",
+    response_model=Union[OrderResponse, OrderPartialResponse],
+)
+async def get_order(
+    order_id: str,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    if_none_match: Optional[str] = Header(None),
+    token: str = Depends(oauth2_schema),
+):
+    try:
+        logging.info(f"calling GET /v1/orders/{order_id}")
+        user_details = decodeJWT(token)
+        if not user_details:
+            raise HTTPException(status_code=401, detail="Invalid or expired token")
+        return await _order_response(
+            order_id, user_details.get("id"), fields, if_none_match
+        )
     except HTTPException:
         raise
     except Exception as error:
@@ -70,10 +266,13 @@ async def get_order(order_id: str, token: str = Depends(oauth2_schema)):
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
-@order_router.get("/v1/orders", response_model=OrderListResponse)
+@order_router.get(
+    "/v1/orders", response_model=Union[OrderListResponse, OrderPartialListResponse]
+)
 async def list_orders(
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     token: str = Depends(oauth2_schema),
 ):
     try:
@@ -84,8 +283,10 @@ async def list_orders(
 
         # In a real app, you might want to filter by user_id here
         # but for now we follow the general list_all request
-        result = await OrderController().list_orders(skip=skip, limit=limit)
-        return OrderListResponse(**result)
+        result = await OrderController().list_orders(
+            skip=skip, limit=limit, fields=parse_fields(fields, ORDER_FIELDS)
+        )
+        return ORJSONResponse(result)
     except HTTPException:
         raise
     except Exception as error:
@@ -113,7 +314,7 @@ async def update_order(
         result = await OrderController().update_order(
             order_id, request.model_dump(exclude_none=True)
         )
-        return OrderMessageResponse(**result)
+        return ORJSONResponse(result)
     except HTTPException:
         raise
     except Exception as error:
@@ -137,7 +338,7 @@ async def delete_order(order_id: str, token: str = Depends(oauth2_schema)):
             )
 
         result = await OrderController().delete_order(order_id)
-        return OrderMessageResponse(**result)
+        return ORJSONResponse(result)
     except HTTPException:
         raise
     except Exception as error:
@@ -1,4 +1,7 @@
-from fastapi import APIRouter, HTTPException, Depends
+from datetime import datetime
+from typing import List, Literal, Optional, Union
+from fastapi import APIRouter, HTTPException, Depends, Query, Header
+from fastapi.responses import StreamingResponse
 from core.apis.schemas.requests.user_request import (
     UserCreateRequest,
     UserLoginRequest,
@@ -13,13 +16,32 @@ from core.apis.schemas.responses.user_response import (
     PasswordResetResponce,
     UserUpdateResponse,
     UserResponse,
+    UserPartialResponse,
     UserDeleteResponse,
     ForgotPasswordResponse,
 )
+from core.apis.schemas.responses.order_responses import (
+    OrderPageResponse,
+    OrderSearchResponse,
+    OrderTotalsResponse,
+    OrderStatusBreakdownResponse,
+    OrderDailyRevenueResponse,
+)
 from core.controllers.user_controller import UserController
+from core.controllers.order_controller import OrderController
+from core.controllers.order_analytics_controller import OrderAnalyticsController
+from core.models.order_model import OrderStatus
+from core.utils.export import EXPORT_FORMATS
+from core.utils.idempotency import identity_scope, run_idempotent
+from core.utils.serializers import (
+    ORJSONResponse,
+    USER_FIELDS,
+    ORDER_FIELDS,
+    parse_fields,
+)
 from core import logger
 from fastapi.security import OAuth2PasswordBearer
-from commons.auth import decodeJWT
+from commons.auth import decodeJWT, signJWT
 
 logging = logger(__name__)
 
@@ -28,13 +50,42 @@ user_router = APIRouter()
 oauth2_schema = OAuth2PasswordBearer(tokenUrl="/v1/users/login")
 
 
+def _reissue_access_token(body: dict) -> str:
+    # Access tokens are not stored with idempotent responses: a replayed
+    # signup gets a new one
+    user = body["user"]
+    return signJWT(id=user["id"], expiry_duration=3600, user_status=user["status"])
+
+
 @user_router.post("/v1/users", status_code=201, response_model=UserCreateResponse)
-async def create_user(request: UserCreateRequest):
+async def create_user(
+    request: UserCreateRequest,
+    idempotency_key: Optional[str] = Header(
+        None,
+        min_length=1,
+        max_length=255,
+        description="Retries with the same key and body return the first "
+        "response instead of signing up again",
+    ),
+):
     try:
         logging.info("calling /v1/user")
+        payload = request.model_dump(mode="json")
         request = request.model_dump()
-        result = await UserController().create_user(request)
-        return UserCreateResponse(**result)
+
+        async def create():
+            result = await UserController().create_user(request)
+            return ORJSONResponse(result, status_code=201)
+
+        # Signup has no user id yet: keys are scoped by the email, so two
+        # clients sending the same key do not collide
+        return await run_idempotent(
+            identity_scope("users", payload["email"]),
+            idempotency_key,
+            payload,
+            create,
+            private_fields={"access_token": _reissue_access_token},
+        )
     except HTTPException:
         raise
     except Exception as error:
@@ -48,7 +99,7 @@ async def user_login(login_request: UserLoginRequest):
         logging.info("calling /v1/user_login")
         login_request = login_request.model_dump()
         result = await UserController().login_user(login_request)
-        return UserCreateResponse(**result)
+        return ORJSONResponse(result, status_code=201)
     except HTTPException:
         raise
     except Exception as error:
@@ -56,15 +107,28 @@ async def user_login(login_request: UserLoginRequest):
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
-@user_router.get("/v1/users/me", response_model=UserResponse)
-async def get_user_me(token: str = Depends(oauth2_schema)):
+@user_router.get(
+    "/v1/users/me", response_model=Union[UserResponse, UserPartialResponse]
+)
+async def get_user_me(
+    fields: Optional[str] = Query(
+        None, description="Comma-separated list of fields to return"
+    ),
+    token: str = Depends(oauth2_schema),
+):
     try:
         logging.info("calling GET /v1/users/me")
         user_details = decodeJWT(token)
         if not user_details:
             raise HTTPException(status_code=401, detail="Invalid or expired token")
-        result = await UserController().get_user(user_details.get("id"))
-        return UserResponse(**result)
+        requested_fields = parse_fields(fields, USER_FIELDS)
+        if requested_fields:
+            result = await UserController().get_user_fields(
+                user_details.get("id"), requested_fields
+            )
+        else:
+            result = await UserController().get_user(user_details.get("id"))
+        return ORJSONResponse(result)
     except HTTPException:
         raise
     except Exception as error:
@@ -72,6 +136,244 @@ async def get_user_me(token: str = Depends(oauth2_schema)):
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+@user_router.get("/v1/users/me/orders", response_model=OrderPageResponse)
+async def get_my_orders(
+    status: Optional[List[OrderStatus]] = Query(
+        None, description="Only return orders in these statuses"
+    ),
+    created_from: Optional[datetime] = Query(
+        None, description="Earliest item_created_at (inclusive)"
+    ),
+    created_to: Optional[datetime] = Query(
+        None, description="Latest item_created_at (inclusive)"
+    ),
+    min_price: Optional[float] = Query(None, ge=0),
+    max_price: Optional[float] = Query(None, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor of the last page"),
+    fields: Optional[str] = Query(
+        None, description="Comma-separated list of fields to return"
+    ),
+    include_archived: bool = Query(
+        True, description="Include old completed/cancelled orders (archive)"
+    ),
+    token: str = Depends(oauth2_schema),
+):
+    try:
+        logging.info("calling GET /v1/users/me/orders")
+        user_details = decodeJWT(token)
+        if not user_details:
+            raise HTTPException(status_code=401, detail="Invalid or expired token")
+        if min_price is not None and max_price is not None and min_price > max_price:
+            raise HTTPException(
+                status_code=400, detail="min_price must not exceed max_price"
+            )
+        if created_from and created_to and created_from > created_to:
+            raise HTTPException(
+                status_code=400, detail="created_from must not be after created_to"
+            )
+
+        result = await OrderController().list_user_orders(
+            user_details.get("id"),
+            filters={
+                "statuses": status,
+                "created_from": created_from,
+                "created_to": created_to,
+                "min_price": min_price,
+                "max_price": max_price,
+            },
+            limit=limit,
+            cursor=cursor,
+            fields=parse_fields(fields, ORDER_FIELDS),
+            include_archived=include_archived,
+        )
+        return ORJSONResponse(result)
+    except HTTPException:
+        raise
+    except Exception as error:
+        logging.error(f"Error in GET /me/orders: {error}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@user_router.get("/v1/users/me/orders/search", response_model=OrderSearchResponse)
+async def search_my_orders(
+    q: str = Query(..., min_length=1, max_length=100, description="Search string"),
+    mode: Literal["text", "prefix"] = Query(
+        "text",
+        description="text: words in item_name / item_list, most relevant first; "
+        "prefix: item_name starting with q (autocomplete)",
+    ),
+    skip: int = Query(0, ge=0, le=1000),
+    limit: int = Query(20, ge=1, le=100),
+    fields: Optional[str] = Query(
+        None, description="Comma-separated list of fields to return"
+    ),
+    token: str = Depends(oauth2_schema),
+):
+    try:
+        logging.info("calling GET /v1/users/me/orders/search")
+        user_details = decodeJWT(token)
+        if not user_details:
+            raise HTTPException(status_code=401, detail="Invalid or expired token")
+        if not q.strip():
+            raise HTTPException(status_code=400, detail="q must not be blank")
+        result = await OrderController().search_user_orders(
+            user_details.get("id"),
+            q.strip(),
+            mode=mode,
+            skip=skip,
+            limit=limit,
+            fields=parse_fields(fields, ORDER_FIELDS),
+        )
+        return ORJSONResponse(result)
+    except HTTPException:
+        raise
+    except Exception as error:
+        logging.error(f"Error in GET /me/orders/search: {error}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@user_router.get("/v1/users/me/orders/stream", response_class=StreamingResponse)
+async def stream_my_orders(token: str = Depends(oauth2_schema)):
+    try:
+        logging.info("calling GET /v1/users/me/orders/stream")
+        user_details = decodeJWT(token)
+        if not user_details:
+            raise HTTPException(status_code=401, detail="Invalid or expired token")
+        events = OrderController().open_order_stream(user_details.get("id"))
+        # order_status events ({id, status, previous_status, item_updated_at};
+        # previous_status is null with the change_stream source) and resync
+        # events (re-fetch the orders, some events were dropped)
+        return StreamingResponse(
+            events,
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+    except HTTPException:
+        raise
+    except Exception as error:
+        logging.error(f"Error in GET /me/orders/stream: {error}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@user_router.get("/v1/users/me/orders/export", response_class=StreamingResponse)
+async def export_my_orders(
+    format: Literal["ndjson", "csv"] = Query("ndjson"),
+    after: Optional[str] = Query(
+        None, description="Resume after this order id (last id already received)"
+    ),
+    include_archived: bool = Query(
+        True, description="Include old completed/cancelled orders (archive)"
+    ),
+    token: str = Depends(oauth2_schema),
+):
+    try:
+        logging.info("calling GET /v1/users/me/orders/export")
+        user_details = decodeJWT(token)
+        if not user_details:
+            raise HTTPException(status_code=401, detail="Invalid or expired token")
+        chunks = OrderController().export_orders(
+            format,
+            user_id=user_details.get("id"),
+            after=after,
+            include_archived=include_archived,
+        )
+        # Rows are streamed as the Motor cursor is read: constant memory
+        return StreamingResponse(
+            chunks,
+            media_type=EXPORT_FORMATS[format],
+            headers={"Content-Disposition": f'attachment; filename="orders.{format}"'},
+        )
+    except HTTPException:
+        raise
+    except Exception as error:
+        logging.error(f"Error in GET /me/orders/export: {error}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+def _created_range(
+    created_from: Optional[datetime] = Query(
+        None, description="Earliest item_created_at (inclusive)"
+    ),
+    created_to: Optional[datetime] = Query(
+        None, description="Latest item_created_at (inclusive)"
+    ),
+) -> dict:
+    if created_from and created_to and created_from > created_to:
+        raise HTTPException(
+            status_code=400, detail="created_from must not be after created_to"
+        )
+    return {"created_from": created_from, "created_to": created_to}
+
+
+@user_router.get("/v1/users/me/orders/stats/totals", response_model=OrderTotalsResponse)
+async def get_my_order_totals(
+    created_range: dict = Depends(_created_range),
+    token: str = Depends(oauth2_schema),
+):
+    try:
+        logging.info("calling GET /v1/users/me/orders/stats/totals")
+        user_details = decodeJWT(token)
+        if not user_details:
+            raise HTTPException(status_code=401, detail="Invalid or expired token")
+        result = await OrderAnalyticsController().get_totals(
+            user_details.get("id"), **created_range
+        )
+        return ORJSONResponse(result)
+    except HTTPException:
+        raise
+    except Exception as error:
+        logging.error(f"Error in GET /me/orders/stats/totals: {error}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@user_router.get(
+    "/v1/users/me/orders/stats/status", response_model=OrderStatusBreakdownResponse
+)
+async def get_my_order_status_breakdown(
+    created_range: dict = Depends(_created_range),
+    token: str = Depends(oauth2_schema),
+):
+    try:
+        logging.info("calling GET /v1/users/me/orders/stats/status")
+        user_details = decodeJWT(token)
+        if not user_details:
+            raise HTTPException(status_code=401, detail="Invalid or expired token")
+        result = await OrderAnalyticsController().get_status_breakdown(
+            user_details.get("id"), **created_range
+        )
+        return ORJSONResponse(result)
+    except HTTPException:
+        raise
+    except Exception as error:
+        logging.error(f"Error in GET /me/orders/stats/status: {error}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@user_router.get(
+    "/v1/users/me/orders/stats/daily", response_model=OrderDailyRevenueResponse
+)
+async def get_my_daily_revenue(
+    created_range: dict = Depends(_created_range),
+    timezone: str = Query("UTC", description="IANA timezone used to split days"),
+    token: str = Depends(oauth2_schema),
+):
+    try:
+        logging.info("calling GET /v1/users/me/orders/stats/daily")
+        user_details = decodeJWT(token)
+        if not user_details:
+            raise HTTPException(status_code=401, detail="Invalid or expired token")
+        result = await OrderAnalyticsController().get_daily_revenue(
+            user_details.get("id"), timezone=timezone, **created_range
+        )
+        return ORJSONResponse(result)
+    except HTTPException:
+        raise
+    except Exception as error:
+        logging.error(f"Error in GET /me/orders/stats/daily: {error}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
 @user_router.patch("/v1/users/me", response_model=UserUpdateResponse)
 async def update_user_me(
     request: UpdateUserRequest, token: str = Depends(oauth2_schema)
@@ -84,7 +386,7 @@ async def update_user_me(
         result = await UserController().update_user(
             user_details.get("id"), request.model_dump(exclude_none=True)
         )
-        return UserUpdateResponse(**result)
+        return ORJSONResponse(result)
     except HTTPException:
         raise
     except Exception as error:
@@ -100,7 +402,7 @@ async def delete_user_me(token: str = Depends(oauth2_schema)):
         if not user_details:
             raise HTTPException(status_code=401, detail="Invalid or expired token")
         result = await UserController().delete_user(user_details.get("id"))
-        return UserDeleteResponse(**result)
+        return ORJSONResponse(result)
     except HTTPException:
         raise
     except Exception as error:
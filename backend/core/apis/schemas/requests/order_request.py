@@ -4,7 +4,7 @@ Order Request Schemas Module
 This module defines Pydantic request schemas for order-related API endpoints.
 """
 
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from pydantic import BaseModel, Field
 from core.models.order_model import OrderStatus
 from core.apis.schemas.requests.user_request import AddressCreateRequest
@@ -18,7 +18,6 @@ class OrderCreateRequest(BaseModel):
         user_id: The ID of the user who placed this order
         item_name: Name of the primary item
         price: Total price of the order
-        order_number: Unique identifier for the order
         item_list: List of all items in the order
         Address: Shipping address for the order
         status: Current status of the order (defaults to BOOKED)
@@ -27,7 +26,6 @@ class OrderCreateRequest(BaseModel):
     user_id: str = Field(..., description="The ID of the user who placed this order")
     item_name: str = Field(..., min_length=2, max_length=100, description="Item name")
     price: float = Field(..., ge=0, description="Price of the item")
-    order_number: int = Field(..., ge=0, description="Order ID")
     item_list: List[str] = Field(..., description="List of items")
     Address: AddressCreateRequest = Field(..., description="User's physical address")
     status: Optional[OrderStatus] = Field(
@@ -45,7 +43,6 @@ class OrderUpdateRequest(BaseModel):
         None, min_length=2, max_length=100, description="Item name"
     )
     price: Optional[float] = Field(None, ge=0, description="Price of the item")
-    order_number: Optional[int] = Field(None, ge=0, description="Order ID")
     item_list: Optional[List[str]] = Field(None, description="List of items")
     Address: Optional[AddressCreateRequest] = Field(
         None, description="User's physical address"
@@ -53,3 +50,43 @@ class OrderUpdateRequest(BaseModel):
     status: Optional[OrderStatus] = Field(
         None, description="Current status of the order"
     )
+
+
+class OrderBatchCreateRequest(BaseModel):
+    """
+    Request schema for creating several orders in one call.
+
+    Items are validated one by one against OrderCreateRequest, so an invalid
+    item is reported in the results instead of rejecting the whole batch.
+
+    Attributes:
+        orders: Orders to create (at most ORDER_BATCH_MAX_SIZE)
+    """
+
+    orders: List[Dict[str, Any]] = Field(
+        ..., min_length=1, description="Orders to create"
+    )
+
+
+class OrderStatusBatchUpdateRequest(BaseModel):
+    """
+    Request schema for moving several orders to a new status.
+
+    Attributes:
+        order_ids: IDs of the orders to update (at most ORDER_BATCH_MAX_SIZE)
+        status: Target status
+    """
+
+    order_ids: List[str] = Field(..., min_length=1, description="Order IDs")
+    status: OrderStatus = Field(..., description="Target status")
+
+
+class OrderLookupRequest(BaseModel):
+    """
+    Request schema for fetching several orders by ID.
+
+    Attributes:
+        ids: Order IDs to fetch (at most ORDER_BATCH_MAX_SIZE)
+    """
+
+    ids: List[str] = Field(..., min_length=1, description="Order IDs")
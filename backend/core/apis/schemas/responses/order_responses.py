@@ -4,7 +4,7 @@ Order Response Schemas Module
 This module defines Pydantic response schemas for order-related API endpoints.
 """
 
-from typing import List, Optional
+from typing import Dict, List, Optional, Union
 from datetime import datetime
 from pydantic import BaseModel, Field
 from core.models.order_model import OrderStatus
@@ -42,6 +42,34 @@ class OrderResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class OrderPartialResponse(BaseModel):
+    """
+    Sparse response schema for order data returned with a fields= query.
+
+    Only the id is always present; every other OrderResponse field is
+    included only when it was requested.
+    """
+
+    id: str = Field(..., description="Unique order identifier")
+    user_id: Optional[str] = Field(None, description="ID of the user")
+    item_name: Optional[str] = Field(None, description="Item name")
+    price: Optional[float] = Field(None, description="Price of the item")
+    order_number: Optional[int] = Field(None, description="Order ID")
+    item_list: Optional[List[str]] = Field(None, description="List of items")
+    Address: Optional[AddressResponse] = Field(
+        None, description="User's physical address"
+    )
+    status: Optional[OrderStatus] = Field(
+        None, description="Current status of the order"
+    )
+    item_created_at: Optional[datetime] = Field(
+        None, description="Order creation timestamp"
+    )
+    item_updated_at: Optional[datetime] = Field(
+        None, description="Order last update timestamp"
+    )
+
+
 class OrderListResponse(BaseModel):
     """
     Response schema for listing multiple orders.
@@ -55,6 +83,69 @@ class OrderListResponse(BaseModel):
     total: int = Field(..., description="Total number of orders")
 
 
+class OrderPartialListResponse(BaseModel):
+    """
+    Response schema for listing orders with a sparse fieldset.
+
+    Attributes:
+        orders: List of sparse order data
+        total: Total number of orders
+    """
+
+    orders: List[OrderPartialResponse] = Field(..., description="List of orders")
+    total: int = Field(..., description="Total number of orders")
+
+
+class OrderPageResponse(BaseModel):
+    """
+    Response schema for a keyset-paginated order listing.
+
+    Attributes:
+        orders: Orders of the page, newest first
+        next_cursor: Cursor of the next page, null on the last page
+    """
+
+    orders: List[Union[OrderResponse, OrderPartialResponse]] = Field(
+        ..., description="Orders of the page, newest first"
+    )
+    next_cursor: Optional[str] = Field(
+        None, description="Pass as cursor to fetch the next page"
+    )
+
+
+class OrderSearchResponse(BaseModel):
+    """
+    Response schema for an order search.
+
+    Attributes:
+        orders: Matching orders, most relevant (text) or alphabetical
+            (prefix) first
+        next_skip: skip of the next page, null on the last page
+    """
+
+    orders: List[Union[OrderResponse, OrderPartialResponse]] = Field(
+        ..., description="Matching orders"
+    )
+    next_skip: Optional[int] = Field(
+        None, description="Pass as skip to fetch the next page"
+    )
+
+
+class OrderLookupResponse(BaseModel):
+    """
+    Response schema for fetching several orders by ID.
+
+    Attributes:
+        orders: Orders found, in the order of the requested IDs
+        missing: Requested IDs that do not match an order of the caller
+    """
+
+    orders: List[Union[OrderResponse, OrderPartialResponse]] = Field(
+        ..., description="Orders found, in request order"
+    )
+    missing: List[str] = Field(..., description="IDs that were not found")
+
+
 class OrderMessageResponse(BaseModel):
     """
     Generic response schema for order operations with a message.
@@ -66,3 +157,135 @@ class OrderMessageResponse(BaseModel):
 
     message: str = Field(..., description="Success message")
     order: Optional[OrderResponse] = Field(None, description="Order data")
+
+
+class OrderBatchItemResult(BaseModel):
+    """
+    Outcome of one item of a batch request.
+
+    Attributes:
+        index: Position of the item in the request
+        status: "created" or "error"
+        order: Created order (when status is "created")
+        error: Reason of the failure (when status is "error")
+    """
+
+    index: int = Field(..., description="Position of the item in the request")
+    status: str = Field(..., description="created or error")
+    order: Optional[OrderResponse] = Field(None, description="Created order")
+    error: Optional[str] = Field(None, description="Reason of the failure")
+
+
+class OrderBatchCreateResponse(BaseModel):
+    """
+    Response schema for batch order creation.
+
+    Attributes:
+        results: One result per requested order, in request order
+        created: Number of orders created
+        failed: Number of orders rejected
+    """
+
+    results: List[OrderBatchItemResult] = Field(..., description="Per-item results")
+    created: int = Field(..., description="Number of orders created")
+    failed: int = Field(..., description="Number of orders rejected")
+
+
+class OrderStatusTransitionResult(BaseModel):
+    """
+    Outcome of the status transition of one order.
+
+    Attributes:
+        id: Order ID
+        outcome: "updated", "unchanged" (already in the target status) or
+            "error"
+        previous_status: Status before the transition, when the order was found
+        error: Reason of the failure (when outcome is "error")
+    """
+
+    id: str = Field(..., description="Order ID")
+    outcome: str = Field(..., description="updated, unchanged or error")
+    previous_status: Optional[OrderStatus] = Field(
+        None, description="Status before the transition"
+    )
+    error: Optional[str] = Field(None, description="Reason of the failure")
+
+
+class OrderStatusBatchUpdateResponse(BaseModel):
+    """
+    Response schema for bulk order status transitions.
+
+    Attributes:
+        results: One result per requested ID, in request order
+        updated: Number of orders moved to the target status
+        failed: Number of orders that could not be moved
+    """
+
+    results: List[OrderStatusTransitionResult] = Field(
+        ..., description="Per-order results"
+    )
+    updated: int = Field(..., description="Number of orders updated")
+    failed: int = Field(..., description="Number of orders not updated")
+
+
+class OrderTotalsResponse(BaseModel):
+    """
+    Response schema for the order totals of a user.
+
+    Attributes:
+        orders: Number of orders
+        cancelled_orders: Number of cancelled orders
+        total_spent: Sum of the price of the orders that are not cancelled
+        first_order_at: Creation time of the oldest order
+        last_order_at: Creation time of the newest order
+    """
+
+    orders: int = Field(..., description="Number of orders")
+    cancelled_orders: int = Field(..., description="Number of cancelled orders")
+    total_spent: float = Field(..., description="Sum of non-cancelled order prices")
+    first_order_at: Optional[datetime] = Field(None, description="Oldest order")
+    last_order_at: Optional[datetime] = Field(None, description="Newest order")
+
+
+class OrderStatusCount(BaseModel):
+    """
+    Orders of a user in one status.
+    """
+
+    status: OrderStatus = Field(..., description="Order status")
+    orders: int = Field(..., description="Number of orders")
+    total_price: float = Field(..., description="Sum of the order prices")
+
+
+class OrderStatusBreakdownResponse(BaseModel):
+    """
+    Response schema for the per-status order breakdown of a user.
+    """
+
+    statuses: List[OrderStatusCount] = Field(..., description="One row per status")
+
+
+class OrderDailyRevenue(BaseModel):
+    """
+    Orders of a user created on one day.
+
+    Attributes:
+        date: Day (YYYY-MM-DD) in the requested timezone
+        orders: Number of orders created that day
+        revenue: Sum of the price of the orders that are not cancelled
+        statuses: Number of orders per status
+    """
+
+    date: str = Field(..., description="Day (YYYY-MM-DD)")
+    orders: int = Field(..., description="Number of orders")
+    revenue: float = Field(..., description="Sum of non-cancelled order prices")
+    statuses: Dict[OrderStatus, int] = Field(..., description="Orders per status")
+
+
+class OrderDailyRevenueResponse(BaseModel):
+    """
+    Response schema for the daily revenue rollup of a user.
+    """
+
+    timezone: str = Field(..., description="Timezone used to split the days")
+    days: List[OrderDailyRevenue] = Field(..., description="Days with orders")
@@ -49,6 +49,44 @@ class UserResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class UserPartialResponse(BaseModel):
+    """
+    Sparse response schema for user data returned with a fields= query.
+
+    Only the id is always present; every other UserResponse field is
+    included only when it was requested.
+    """
+
+    id: str = Field(..., description="Unique user identifier")
+    first_name: Optional[str] = Field(None, description="User's first name")
+    last_name: Optional[str] = Field(None, description="User's last name")
+    email: Optional[EmailStr] = Field(None, description="User's email address")
+    mobile_number: Optional[str] = Field(None, description="User's mobile number")
+    address: Optional[AddressResponse] = Field(
+        None, description="User's physical address"
+    )
+    status: Optional[str] = Field(None, description="Current account status")
+    created_at: Optional[datetime] = Field(
+        None, description="Account creation timestamp"
+    )
+    updated_at: Optional[datetime] = Field(None, description="Last update timestamp")
+
+
+class UserOrderStatsResponse(BaseModel):
+    """
+    Order summary of a user.
+
+    Attributes:
+        orders: Number of orders
+        cancelled_orders: Number of cancelled orders
+        total_spent: Sum of the price of the orders that are not cancelled
+    """
+
+    orders: int = Field(..., description="Number of orders")
+    cancelled_orders: int = Field(..., description="Number of cancelled orders")
+    total_spent: float = Field(..., description="Sum of non-cancelled order prices")
+
+
 class UserCreateResponse(BaseModel):
     """
     Response schema for successful user creation.
@@ -61,11 +99,15 @@ class UserCreateResponse(BaseModel):
         access_token: JWT access token for authentication
         token_type: Type of token (always "bearer")
         message: Success message
+        order_stats: Order count and lifetime spend of the user
     """
 
     user: UserResponse = Field(..., description="Created user data")
     access_token: str = Field(..., description="JWT access token for authentication")
     orders: List[OrderResponse] = Field(default=[], description="List of user orders")
+    order_stats: Optional[UserOrderStatsResponse] = Field(
+        None, description="Order count and lifetime spend of the user"
+    )
 
 
 class UserListResponse(BaseModel):
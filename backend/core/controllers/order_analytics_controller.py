@@ -0,0 +1,64 @@
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from core.cruds.order_analytics_crud import OrderAnalyticsCRUD
+from core import logger
+from fastapi import HTTPException, status
+
+logging = logger(__name__)
+
+
+class OrderAnalyticsController:
+    def __init__(self):
+        self.OrderAnalyticsCRUD = OrderAnalyticsCRUD()
+
+    async def get_totals(self, user_id: str, created_from=None, created_to=None):
+        try:
+            logging.info("Executing OrderAnalyticsController.get_totals function")
+            return await self.OrderAnalyticsCRUD.totals(
+                user_id, created_from, created_to
+            )
+        except Exception as error:
+            logging.error(f"Error in OrderAnalyticsController.get_totals: {str(error)}")
+            raise error
+
+    async def get_status_breakdown(
+        self, user_id: str, created_from=None, created_to=None
+    ):
+        try:
+            logging.info(
+                "Executing OrderAnalyticsController.get_status_breakdown function"
+            )
+            statuses = await self.OrderAnalyticsCRUD.status_breakdown(
+                user_id, created_from, created_to
+            )
+            return {"statuses": statuses}
+        except Exception as error:
+            logging.error(
+                f"Error in OrderAnalyticsController.get_status_breakdown: {str(error)}"
+            )
+            raise error
+
+    async def get_daily_revenue(
+        self, user_id: str, created_from=None, created_to=None, timezone: str = "UTC"
+    ):
+        try:
+            logging.info(
+                "Executing OrderAnalyticsController.get_daily_revenue function"
+            )
+            try:
+                ZoneInfo(timezone)
+            except (ZoneInfoNotFoundError, ValueError):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Unknown timezone: {timezone}",
+                )
+            days = await self.OrderAnalyticsCRUD.daily_revenue(
+                user_id, created_from, created_to, timezone
+            )
+            return {"timezone": timezone, "days": days}
+        except HTTPException:
+            raise
+        except Exception as error:
+            logging.error(
+                f"Error in OrderAnalyticsController.get_daily_revenue: {str(error)}"
+            )
+            raise error
@@ -1,10 +1,44 @@
-from core.cruds.order_crud import OrderCRUD
+import orjson
+from pydantic import ValidationError
+from core.apis.schemas.requests.order_request import OrderCreateRequest
+from core.cruds.order_crud import (
+    OrderCRUD,
+    OrderStatusConflict,
+    order_cache,
+    order_cache_key,
+)
+from core.cruds.user_order_stats_crud import UserOrderStatsCRUD
+from core.models.order_model import Order
+from core.utils.serializers import (
+    serialize_order,
+    serialize_order_document,
+    serialize_partial_document,
+    entity_tag,
+    http_date,
+    encode_cursor,
+    decode_cursor,
+)
+from core.utils.export import stream_orders
+from core.utils.order_events import order_events, sse_stream
+from commons.settings import settings
 from core import logger
 from fastapi import HTTPException, status
+from odmantic import ObjectId
+from bson.errors import InvalidId
 
 logging = logger(__name__)
 
 
+def _describe_error(error: Exception) -> str:
+    # One line per invalid field, e.g. "price: Input should be ..."
+    if isinstance(error, ValidationError):
+        return "; ".join(
+            f"{'.'.join(str(part) for part in detail['loc'])}: {detail['msg']}"
+            for detail in error.errors()
+        )
+    return str(error)
+
+
 class OrderController:
     def __init__(self):
         self.OrderCRUD = OrderCRUD()
@@ -13,14 +47,97 @@ class OrderController:
         try:
             logging.info("Executing OrderController.create_order function")
             saved_order = await self.OrderCRUD.create_order(order_data)
-            order_data = saved_order.model_dump()
-            order_data["id"] = str(saved_order.id)
-            order_data["user_id"] = str(saved_order.user_id)
-            return {"order": order_data, "message": "Order created successfully"}
+            return {
+                "order": serialize_order(saved_order),
+                "message": "Order created successfully",
+            }
         except Exception as error:
             logging.error(f"Error in OrderController.create_order: {str(error)}")
             raise error
 
+    async def create_orders(self, items: list, owner_id: str):
+        """
+        Validate and create a batch of orders owned by owner_id.
+
+        Every item is validated in a single pass; the valid ones are inserted
+        with one insert_many. Returns one result per item, in request order.
+        """
+        try:
+            logging.info("Executing OrderController.create_orders function")
+            results = [None] * len(items)
+            valid = []
+            for index, item in enumerate(items):
+                try:
+                    request = OrderCreateRequest.model_validate(item)
+                    if request.user_id != owner_id:
+                        raise ValueError(
+                            "Not authorized to create order for another user"
+                        )
+                    valid.append((index, request.model_dump()))
+                except (ValidationError, ValueError) as error:
+                    results[index] = {
+                        "index": index,
+                        "status": "error",
+                        "error": _describe_error(error),
+                    }
+
+            # One block of order numbers for the whole batch
+            numbers = (
+                await self.OrderCRUD.allocate_order_numbers(len(valid)) if valid else []
+            )
+            orders, positions = [], []
+            for (index, order_data), number in zip(valid, numbers):
+                order_data["user_id"] = ObjectId(order_data["user_id"])
+                order_data["order_number"] = number
+                orders.append(Order(**order_data))
+                positions.append(index)
+
+            failed = await self.OrderCRUD.create_orders(orders) if orders else {}
+            for position, (index, order) in enumerate(zip(positions, orders)):
+                if position in failed:
+                    results[index] = {
+                        "index": index,
+                        "status": "error",
+                        "error": failed[position],
+                    }
+                else:
+                    results[index] = {
+                        "index": index,
+                        "status": "created",
+                        "order": serialize_order(order),
+                    }
+
+            created = sum(1 for result in results if result["status"] == "created")
+            return {
+                "results": results,
+                "created": created,
+                "failed": len(results) - created,
+            }
+        except Exception as error:
+            logging.error(f"Error in OrderController.create_orders: {str(error)}")
+            raise error
+
+    async def transition_statuses(self, order_ids: list, status, owner_id: str):
+        """
+        Move orders owned by owner_id to a new status, reporting per-id outcomes.
+        """
+        try:
+            logging.info("Executing OrderController.transition_statuses function")
+            results = await self.OrderCRUD.transition_statuses(
+                order_ids, status, owner_id
+            )
+            # Counted per order: an ID may be listed more than once
+            updated = len(
+                {result["id"] for result in results if result["outcome"] == "updated"}
+            )
+            failed = len(
+                {result["id"] for result in results if result["outcome"] == "error"}
+            )
+            return {"results": results, "updated": updated, "failed": failed}
+        except Exception as error:
+            logging.error(f"Error in OrderController.transition_statuses: {str(error)}")
+            raise error
+
     async def get_order(self, order_id: str):
         try:
             logging.info("Executing OrderController.get_order function")
@@ -29,28 +146,287 @@ class OrderController:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND, detail="Order not found"
                 )
-            order_data = found_order.model_dump()
-            order_data["id"] = str(found_order.id)
-            order_data["user_id"] = str(found_order.user_id)
-            return order_data
+            return serialize_order(found_order)
         except HTTPException:
             raise
         except Exception as error:
             logging.error(f"Error in OrderController.get_order: {str(error)}")
             raise error
 
-    async def list_orders(self, skip: int = 0, limit: int = 10):
+    async def get_order_response(self, order_id: str):
+        """
+        Return the cached GET response of an order.
+
+        Returns:
+            dict: body (serialized JSON bytes), etag, last_modified and the
+            owner's user_id (for the authorization check)
+        """
         try:
-            logging.info("Executing OrderController.list_orders function")
-            orders, total = await self.OrderCRUD.list_all(skip=skip, limit=limit)
+            logging.info("Executing OrderController.get_order_response function")
+            entry = await order_cache.get_or_load(
+                order_cache_key(order_id), lambda: self._build_response(order_id)
+            )
+            if not entry:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND, detail="Order not found"
+                )
+            return entry
+        except HTTPException:
+            raise
+        except Exception as error:
+            logging.error(f"Error in OrderController.get_order_response: {str(error)}")
+            raise error
+
+    async def _build_response(self, order_id: str):
+        found_order = await self.OrderCRUD.get_by_id_raw(order_id)
+        if not found_order:
+            return None
+        updated_at = found_order["item_updated_at"]
+        return {
+            "body": orjson.dumps(serialize_order_document(found_order)),
+            "etag": entity_tag(str(found_order["_id"]), updated_at),
+            "last_modified": http_date(updated_at),
+            "user_id": str(found_order["user_id"]),
+        }
 
-            order_list = []
-            for item in orders:
-                data = item.model_dump()
-                data["id"] = str(item.id)
-                data["user_id"] = str(item.user_id)
-                order_list.append(data)
+    async def get_order_id_by_number(self, order_number: int) -> str:
+        """
+        Resolve an order_number to the order id (404 if unknown).
+        """
+        try:
+            logging.info("Executing OrderController.get_order_id_by_number function")
+            order_id = await self.OrderCRUD.get_id_by_number(order_number)
+            if not order_id:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND, detail="Order not found"
+                )
+            return order_id
+        except HTTPException:
+            raise
+        except Exception as error:
+            logging.error(
+                f"Error in OrderController.get_order_id_by_number: {str(error)}"
+            )
+            raise error
 
+    async def get_order_fields(self, order_id: str, fields: list, owner_id: str):
+        """
+        Return a sparse view of an order owned by owner_id.
+        """
+        try:
+            logging.info("Executing OrderController.get_order_fields function")
+            # user_id is always fetched for the ownership check
+            found_order = await self.OrderCRUD.get_by_id_raw(
+                order_id, [*fields, "user_id"]
+            )
+            if not found_order:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND, detail="Order not found"
+                )
+            if str(found_order["user_id"]) != owner_id:
+                raise HTTPException(
+                    status_code=status.HTTP_403_FORBIDDEN,
+                    detail="Not authorized to access this order",
+                )
+            return serialize_partial_document(found_order, fields)
+        except HTTPException:
+            raise
+        except Exception as error:
+            logging.error(f"Error in OrderController.get_order: {str(error)}")
+            raise error
+
+    async def lookup_orders(self, ids: list, owner_id: str, fields: list = None):
+        """
+        Return the orders of owner_id matching ids, in request order, and the
+        IDs that were not found (unknown, invalid or owned by another user).
+        """
+        try:
+            logging.info("Executing OrderController.lookup_orders function")
+            object_ids = {}
+            for id in ids:
+                try:
+                    object_ids[id] = ObjectId(id)
+                except (InvalidId, TypeError):
+                    continue
+
+            found = {}
+            if object_ids:
+                found = await self.OrderCRUD.get_many_raw(
+                    list(set(object_ids.values())), owner_id, fields
+                )
+
+            orders, missing = [], []
+            for id in ids:
+                document = found.get(object_ids.get(id))
+                if document is None:
+                    missing.append(id)
+                elif fields:
+                    orders.append(serialize_partial_document(document, fields))
+                else:
+                    orders.append(serialize_order_document(document))
+            return {"orders": orders, "missing": missing}
+        except Exception as error:
+            logging.error(f"Error in OrderController.lookup_orders: {str(error)}")
+            raise error
+
+    async def list_user_orders(
+        self,
+        user_id: str,
+        filters: dict,
+        limit: int = 20,
+        cursor: str = None,
+        fields: list = None,
+        include_archived: bool = True,
+    ):
+        """
+        Return one page of the orders of a user, newest first.
+
+        Args:
+            user_id: Owner of the orders
+            filters: statuses, created_from, created_to, min_price, max_price
+            limit: Page size
+            cursor: next_cursor of the previous page
+            fields: Optional sparse fieldset
+            include_archived: Include the archived orders
+        """
+        try:
+            logging.info("Executing OrderController.list_user_orders function")
+            after = decode_cursor(cursor) if cursor else None
+            # One extra order tells whether there is a next page
+            orders = await self.OrderCRUD.list_by_user_raw(
+                user_id, filters, after, limit + 1, fields, include_archived
+            )
+
+            next_cursor = None
+            if len(orders) > limit:
+                orders = orders[:limit]
+                last = orders[-1]
+                next_cursor = encode_cursor(last["item_created_at"], last["_id"])
+
+            if fields:
+                order_list = [serialize_partial_document(o, fields) for o in orders]
+            else:
+                order_list = [serialize_order_document(o) for o in orders]
+            return {"orders": order_list, "next_cursor": next_cursor}
+        except HTTPException:
+            raise
+        except Exception as error:
+            logging.error(f"Error in OrderController.list_user_orders: {str(error)}")
+            raise error
+
+    async def search_user_orders(
+        self,
+        user_id: str,
+        q: str,
+        mode: str = "text",
+        skip: int = 0,
+        limit: int = 20,
+        fields: list = None,
+    ):
+        """
+        Search the orders of a user by item name.
+
+        Args:
+            user_id: Owner of the orders
+            q: Search string
+            mode: "text" (full-text over item_name and item_list, most
+                relevant first) or "prefix" (item_name starts with q,
+                alphabetical, for autocomplete)
+            skip / limit: Page of the results
+            fields: Optional sparse fieldset
+
+        Returns:
+            dict: {"orders": [...], "next_skip": skip of the next page or None}
+        """
+        try:
+            logging.info("Executing OrderController.search_user_orders function")
+            search = (
+                self.OrderCRUD.search_prefix_raw
+                if mode == "prefix"
+                else self.OrderCRUD.search_text_raw
+            )
+            # One extra order tells whether there is a next page
+            orders = await search(user_id, q, skip, limit + 1, fields)
+
+            next_skip = None
+            if len(orders) > limit:
+                orders = orders[:limit]
+                next_skip = skip + limit
+
+            if fields:
+                order_list = [serialize_partial_document(o, fields) for o in orders]
+            else:
+                order_list = [serialize_order_document(o) for o in orders]
+            return {"orders": order_list, "next_skip": next_skip}
+        except Exception as error:
+            logging.error(f"Error in OrderController.search_user_orders: {str(error)}")
+            raise error
+
+    def open_order_stream(self, user_id: str):
+        """
+        Subscribe to the status changes of the orders of a user.
+
+        Returns:
+            AsyncIterator[bytes]: text/event-stream chunks, until the client
+            disconnects
+
+        Raises:
+            HTTPException: 503 when this worker has no stream slot left
+        """
+        logging.info("Executing OrderController.open_order_stream function")
+        if not order_events.admit():
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many open order streams, retry later",
+                headers={"Retry-After": "5"},
+            )
+        return sse_stream(user_id)
+
+    def export_orders(
+        self,
+        format: str,
+        user_id: str = None,
+        after: str = None,
+        include_archived: bool = True,
+    ):
+        """
+        Return an async iterator of export chunks (NDJSON or CSV bytes).
+
+        Args:
+            format: "ndjson" or "csv"
+            user_id: Only export the orders of this user (all orders if None)
+            after: Resume after this order id (last id of an earlier export)
+            include_archived: Also export the archived orders
+
+        Raises:
+            HTTPException: 400 if after is not a valid order id
+        """
+        logging.info("Executing OrderController.export_orders function")
+        try:
+            after_id = ObjectId(after) if after else None
+        except (InvalidId, TypeError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid after id"
+            )
+        documents = self.OrderCRUD.iter_raw(
+            user_id=user_id,
+            after=after_id,
+            batch_size=settings.export_batch_size,
+            include_archived=include_archived,
+        )
+        return stream_orders(documents, format)
+
+    async def list_orders(self, skip: int = 0, limit: int = 10, fields: list = None):
+        try:
+            logging.info("Executing OrderController.list_orders function")
+            orders, total = await self.OrderCRUD.list_all_raw(
+                skip=skip, limit=limit, fields=fields
+            )
+
+            if fields:
+                order_list = [serialize_partial_document(o, fields) for o in orders]
+            else:
+                order_list = [serialize_order_document(o) for o in orders]
             return {"orders": order_list, "total": total}
         except Exception as error:
             logging.error(f"Error in OrderController.list_orders: {str(error)}")
@@ -61,33 +437,44 @@ class OrderController:
             logging.info(
                 f"Executing OrderController.get_user_orders function for user: {user_id}"
             )
-            orders = await self.OrderCRUD.get_by_user_id(user_id)
-
-            order_list = []
-            for item in orders:
-                data = item.model_dump()
-                data["id"] = str(item.id)
-                data["user_id"] = str(item.user_id)
-                order_list.append(data)
+            orders = await self.OrderCRUD.get_by_user_id_raw(user_id)
 
-            return order_list
+            return [serialize_order_document(item) for item in orders]
         except Exception as error:
             logging.error(f"Error in OrderController.get_user_orders: {str(error)}")
             raise error
 
+    async def get_user_order_stats(self, user_id: str):
+        """
+        Return the materialized order summary of a user (one indexed read).
+        """
+        try:
+            logging.info("Executing OrderController.get_user_order_stats function")
+            return await UserOrderStatsCRUD().get(user_id)
+        except Exception as error:
+            logging.error(
+                f"Error in OrderController.get_user_order_stats: {str(error)}"
+            )
+            raise error
+
     async def update_order(self, order_id: str, update_data: dict):
         try:
             logging.info("Executing OrderController.update_order function")
-            updated_order = await self.OrderCRUD.update_order(order_id, update_data)
+            try:
+                updated_order = await self.OrderCRUD.update_order(order_id, update_data)
+            except OrderStatusConflict as error:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT, detail=str(error)
+                )
             if not updated_order:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail="Order not found or no changes made",
                 )
-            order_data = updated_order.model_dump()
-            order_data["id"] = str(updated_order.id)
-            order_data["user_id"] = str(updated_order.user_id)
-            return {"order": order_data, "message": "Order updated successfully"}
+            return {
+                "order": serialize_order(updated_order),
+                "message": "Order updated successfully",
+            }
         except HTTPException:
             raise
         except Exception as error:
@@ -1,13 +1,15 @@
+import asyncio
 from core.cruds.user_crud import UserCRUD
 from core.apis.schemas.requests.user_request import UserCreateRequest
 from core import logger
 from fastapi import HTTPException, status
-from commons.auth import encrypt_password, signJWT, verify_password
+from odmantic.exceptions import DuplicateKeyError
+from commons.auth import encrypt_password_async, signJWT, verify_password_async
 from core.apis.schemas.requests.user_request import UserLoginRequest
-from core.utils.otp_generator import generate_otp
-from core.utils.email_service import send_email
 from datetime import datetime, timedelta
 from core.controllers.order_controller import OrderController
+from core.cruds.user_order_stats_crud import EMPTY_STATS
+from core.utils.serializers import serialize_user, serialize_partial_document
 
 logging = logger(__name__)
 
@@ -20,31 +22,35 @@ class UserController:
     async def create_user(self, user_request: dict):
         try:
             logging.info("Executing user_controller.create_user function")
-            user = await self.UserCRUD.get_by_email(user_request.get("email", ""))
-            if user:
+            user_request["hashed_password"] = await encrypt_password_async(
+                user_request.get("password", "")
+            )
+            user_request["status"] = "ACTIVE"
+            user_request.pop("password", None)
+            # Insert directly: the unique index on users.email rejects
+            # duplicates, also between concurrent signups
+            try:
+                saved_user = await self.UserCRUD.create(user_request)
+            except DuplicateKeyError:
                 logging.info("User with this email already exists")
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="User with this email already exists",
                 )
-            user_request["hashed_password"] = encrypt_password(
-                password=user_request.get("password", "")
-            )
-            user_request["status"] = "ACTIVE"
-            user_request.pop("password", None)
-            saved_user = await self.UserCRUD.create(user_request)
             access_token = signJWT(
                 id=str(saved_user.id),
                 expiry_duration=3600,
                 user_status=saved_user.status,
             )
-            user_data = saved_user.model_dump()
-            user_data["id"] = str(saved_user.id)  # Convert ObjectId to string
-
-            # Fetch orders for the new user (should be empty but good for consistency)
-            orders = await self.OrderController.get_user_orders(user_data["id"])
+            user_data = serialize_user(saved_user)
 
-            return {"user": user_data, "access_token": access_token, "orders": orders}
+            # A user that was just created has no orders: skip the queries
+            return {
+                "user": user_data,
+                "access_token": access_token,
+                "orders": [],
+                "order_stats": dict(EMPTY_STATS),
+            }
         except Exception as error:
             logging.error(f"Error in user_controller.create_user: {str(error)}")
             raise error
@@ -60,28 +66,45 @@ class UserController:
                     status_code=status.HTTP_401_UNAUTHORIZED,
                     detail="Invalid Email",
                 )
-                ## verify password
-            if not verify_password(
-                plain_password=login_data.get("password", ""),
-                hashed_password=user.hashed_password,
-            ):
-                logging.info("Login failed: Incorrect Password")
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Invalid Password",
+
+            # Fetch the orders and the order summary while the password is
+            # verified in a worker thread; discarded if verification fails
+            orders_task = asyncio.ensure_future(
+                asyncio.gather(
+                    self.OrderController.get_user_orders(str(user.id)),
+                    self.OrderController.get_user_order_stats(str(user.id)),
                 )
-            access_token = signJWT(
-                id=str(user.id),
-                expiry_duration=3600,
-                user_status=user.status,
             )
-            user_data = user.model_dump()
-            user_data["id"] = str(user.id)  # Convert ObjectId to string
-
-            # Fetch orders for the user
-            orders = await self.OrderController.get_user_orders(user_data["id"])
+            try:
+                if not await verify_password_async(
+                    plain_password=login_data.get("password", ""),
+                    hashed_password=user.hashed_password,
+                ):
+                    logging.info("Login failed: Incorrect Password")
+                    raise HTTPException(
+                        status_code=status.HTTP_401_UNAUTHORIZED,
+                        detail="Invalid Password",
+                    )
+                access_token = signJWT(
+                    id=str(user.id),
+                    expiry_duration=3600,
+                    user_status=user.status,
+                )
+                user_data = serialize_user(user)
+                orders, order_stats = await orders_task
+            finally:
+                if not orders_task.done():
+                    orders_task.cancel()
+                elif not orders_task.cancelled():
+                    # Mark a failure of a discarded query as retrieved
+                    orders_task.exception()
 
-            return {"user": user_data, "access_token": access_token, "orders": orders}
+            return {
+                "user": user_data,
+                "access_token": access_token,
+                "orders": orders,
+                "order_stats": order_stats,
+            }
         except Exception as error:
             logging.error(f"Error in user_controller.login_user: {str(error)}")
             raise error
@@ -89,14 +112,13 @@ class UserController:
     async def get_user(self, user_id: str):
         try:
             logging.info("Executing user_controller.get_user function")
-            user = await self.UserCRUD.get_by_id(user_id)
+            user = await self.UserCRUD.get_by_id(user_id, include_sensitive=False)
             if not user:
                 logging.warning("User not found")
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
                 )
-            user_data = user.model_dump()
-            user_data["id"] = str(user.id)
+            user_data = serialize_user(user)
             return user_data
         except HTTPException:
             raise
@@ -104,6 +126,22 @@ class UserController:
             logging.error(f"Error in user_controller.get_user: {str(error)}")
             raise error
 
+    async def get_user_fields(self, user_id: str, fields: list):
+        try:
+            logging.info("Executing user_controller.get_user_fields function")
+            user = await self.UserCRUD.get_by_id_raw(user_id, fields)
+            if not user:
+                logging.warning("User not found")
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
+                )
+            return serialize_partial_document(user, fields)
+        except HTTPException:
+            raise
+        except Exception as error:
+            logging.error(f"Error in user_controller.get_user_fields: {str(error)}")
+            raise error
+
     async def update_user(self, user_id: str, update_data: dict):
         try:
             logging.info("Executing user_controller.update_user function")
@@ -114,8 +152,7 @@ class UserController:
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail="User not found or no changes made",
                 )
-            user_data = updated_user.model_dump()
-            user_data["id"] = str(updated_user.id)
+            user_data = serialize_user(updated_user)
             return {"user": user_data, "message": "User updated successfully"}
         except HTTPException:
             raise
@@ -157,7 +194,7 @@ class UserController:
                 )
 
             old_password = request.get("old_password", "")
-            if not verify_password(old_password, user.hashed_password):
+            if not await verify_password_async(old_password, user.hashed_password):
                 logging.warning("Invalid old password")
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
@@ -179,7 +216,7 @@ class UserController:
                     detail="New password must be different from old password",
                 )
 
-            hashed_password = encrypt_password(new_password)
+            hashed_password = await encrypt_password_async(new_password)
 
             await self.UserCRUD.update(
                 str(user.id), {"hashed_password": hashed_password}
@@ -199,8 +236,13 @@ class UserController:
             logging.info(
                 f"Executing user_controller.forgot_password function for email: {forgot_password_request.get('email')}"
             )
+            # Email/OTP machinery is loaded on first use to keep startup fast
+            from core.utils.otp_generator import generate_otp
+            from core.utils.email_service import send_email
+            from core.utils.email_templates import get_otp_email_template
+
             email = forgot_password_request.get("email", "")
-            user = await self.UserCRUD.get_by_email(email)
+            user = await self.UserCRUD.get_by_email(email, include_sensitive=False)
             if not user:
                 logging.warning(f"User not found for email: {email}")
                 raise HTTPException(
@@ -223,7 +265,6 @@ class UserController:
             # Send OTP via email
             logging.info("Preparing to send email...")
             subject = "Password Reset OTP"
-            from core.utils.email_templates import get_otp_email_template
 
             # Get user's name for personalization
             user_name = f"{user.first_name} {user.last_name}"
@@ -290,7 +331,7 @@ class UserController:
                 raise HTTPException(status_code=400, detail="OTP has expired")
 
             # Update password and clear OTP
-            hashed_password = encrypt_password(new_password)
+            hashed_password = await encrypt_password_async(new_password)
             update_data = {
                 "hashed_password": hashed_password,
                 "otp": None,
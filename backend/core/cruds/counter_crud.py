@@ -0,0 +1,103 @@
+import asyncio
+from typing import Awaitable, Callable, Optional
+from core import logger
+from core.repositories import get_counter_repository
+
+logging = logger(__name__)
+
+
+class CounterCRUD:
+    """
+    Atomic operations on the counters collection.
+    """
+
+    def __init__(self):
+        self.repository = get_counter_repository()
+
+    async def reserve(self, name: str, count: int = 1) -> int:
+        """
+        Reserve count consecutive numbers of a counter with a single $inc.
+
+        Returns:
+            int: First reserved number; the block is [first, first + count)
+        """
+        try:
+            logging.info("Executing CounterCRUD.reserve function")
+            return await self.repository.reserve(name, count)
+        except Exception as error:
+            logging.error(f"Error in CounterCRUD.reserve: {str(error)}")
+            raise error
+
+    async def raise_to(self, name: str, value: int):
+        """
+        Move a counter up to value if it is lower (never down).
+        """
+        try:
+            logging.info("Executing CounterCRUD.raise_to function")
+            await self.repository.raise_to(name, value)
+        except Exception as error:
+            logging.error(f"Error in CounterCRUD.raise_to: {str(error)}")
+            raise error
+
+
+class SequenceAllocator:
+    """
+    Hand out numbers of a counter from blocks reserved per process.
+
+    Each reservation takes block_size numbers with one $inc; the next
+    allocations are served from memory until the block is used up, so most
+    callers need no round-trip. Numbers left in a block when the process
+    stops are never used: sequences are unique and increasing per process,
+    but have gaps.
+
+    floor, if given, returns the highest number already in use; the counter
+    is raised to it before the first reservation of the process.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        block_size: int,
+        floor: Optional[Callable[[], Awaitable[int]]] = None,
+    ):
+        self.name = name
+        self.block_size = block_size
+        self._floor = floor
+        self._next = 0
+        self._end = 0
+        self._lock = asyncio.Lock()
+        self.reservations = 0
+
+    async def allocate(self, count: int = 1) -> list:
+        """
+        Return count unused numbers, in increasing order.
+        """
+        async with self._lock:
+            take = min(count, self._end - self._next)
+            numbers = list(range(self._next, self._next + take))
+            self._next += take
+            missing = count - take
+            if missing:
+                counters = CounterCRUD()
+                if self._floor is not None:
+                    await counters.raise_to(self.name, await self._floor())
+                    self._floor = None
+                size = max(missing, self.block_size)
+                first = await counters.reserve(self.name, size)
+                self.reservations += 1
+                numbers.extend(range(first, first + missing))
+                self._next, self._end = first + missing, first + size
+            return numbers
+
+    async def next(self) -> int:
+        """
+        Return one unused number.
+        """
+        return (await self.allocate(1))[0]
+
+    def stats(self) -> dict:
+        return {
+            "block_size": self.block_size,
+            "reservations": self.reservations,
+            "remaining": self._end - self._next,
+        }
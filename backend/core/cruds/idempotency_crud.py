@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta
+from core import logger
+from core.models.idempotency_model import IdempotencyRecord, PROCESSING, COMPLETED
+from core.repositories import get_idempotency_repository
+from commons.settings import settings
+
+logging = logger(__name__)
+
+
+class IdempotencyCRUD:
+    """
+    Claim, complete and release idempotency keys.
+
+    A key is claimed by inserting its record: the unique _id makes exactly
+    one of several concurrent requests the owner.
+    """
+
+    def __init__(self):
+        self.repository = get_idempotency_repository()
+
+    async def claim(self, key: str, fingerprint: str):
+        """
+        Try to become the request that executes key.
+
+        A record left in processing for more than IDEMPOTENCY_LOCK_SECONDS
+        (its worker died) is taken over by a request with the same body.
+
+        Returns:
+            tuple: (True, None) if claimed, else (False, existing record or
+            None when it was released in the meantime)
+        """
+        try:
+            logging.info("Executing IdempotencyCRUD.claim function")
+            now = datetime.utcnow()
+            record = IdempotencyRecord(
+                key=key,
+                fingerprint=fingerprint,
+                locked_at=now,
+                expires_at=now + timedelta(seconds=settings.idempotency_ttl_seconds),
+            )
+            if await self.repository.insert(record.model_dump_doc()):
+                return True, None
+
+            stale = now - timedelta(seconds=settings.idempotency_lock_seconds)
+            if await self.repository.take_over(key, fingerprint, stale, now):
+                logging.warning(f"Took over stale idempotency key {key}")
+                return True, None
+            return False, await self.repository.find(key)
+        except Exception as error:
+            logging.error(f"Error in IdempotencyCRUD.claim: {str(error)}")
+            raise error
+
+    async def complete(self, key: str, status_code: int, body: bytes):
+        """
+        Store the response of the request that claimed key.
+        """
+        try:
+            logging.info("Executing IdempotencyCRUD.complete function")
+            await self.repository.complete(key, status_code, body)
+        except Exception as error:
+            logging.error(f"Error in IdempotencyCRUD.complete: {str(error)}")
+            raise error
+
+    async def release(self, key: str):
+        """
+        Forget a claimed key whose request failed, so a retry runs again.
+        """
+        try:
+            logging.info("Executing IdempotencyCRUD.release function")
+            await self.repository.release(key)
+        except Exception as error:
+            logging.error(f"Error in IdempotencyCRUD.release: {str(error)}")
+            raise error
@@ -0,0 +1,82 @@
+from datetime import datetime
+from core import logger
+from core.repositories import get_order_analytics_repository
+from odmantic import ObjectId
+
+logging = logger(__name__)
+
+
+class OrderAnalyticsCRUD:
+    """
+    Order statistics of a user, archived orders included.
+
+    With MongoDB they are computed by aggregation pipelines that only return
+    the aggregated rows (core.repositories.mongo).
+    """
+
+    def __init__(self):
+        self.repository = get_order_analytics_repository()
+
+    async def totals(
+        self,
+        user_id: str,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+    ) -> dict:
+        """
+        Count the orders of a user and sum their price.
+
+        Returns:
+            dict: orders, cancelled_orders, total_spent (cancelled orders
+            excluded), first_order_at, last_order_at
+        """
+        try:
+            logging.info("Executing OrderAnalyticsCRUD.totals function")
+            return await self.repository.totals(
+                ObjectId(user_id), created_from, created_to
+            )
+        except Exception as error:
+            logging.error(f"Error in OrderAnalyticsCRUD.totals: {str(error)}")
+            raise error
+
+    async def status_breakdown(
+        self,
+        user_id: str,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+    ) -> list:
+        """
+        Count the orders of a user and sum their price per status.
+        """
+        try:
+            logging.info("Executing OrderAnalyticsCRUD.status_breakdown function")
+            return await self.repository.status_breakdown(
+                ObjectId(user_id), created_from, created_to
+            )
+        except Exception as error:
+            logging.error(f"Error in OrderAnalyticsCRUD.status_breakdown: {str(error)}")
+            raise error
+
+    async def daily_revenue(
+        self,
+        user_id: str,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+        timezone: str = "UTC",
+    ) -> list:
+        """
+        Roll the orders of a user up per day of item_created_at.
+
+        Returns:
+            list: One {date, orders, revenue, statuses} row per day with
+            orders, oldest first. revenue excludes cancelled orders and
+            statuses counts the orders of the day per status.
+        """
+        try:
+            logging.info("Executing OrderAnalyticsCRUD.daily_revenue function")
+            return await self.repository.daily_revenue(
+                ObjectId(user_id), created_from, created_to, timezone
+            )
+        except Exception as error:
+            logging.error(f"Error in OrderAnalyticsCRUD.daily_revenue: {str(error)}")
+            raise error
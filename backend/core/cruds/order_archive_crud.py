@@ -0,0 +1,34 @@
+from datetime import datetime, timedelta
+from core import logger
+from core.repositories import get_order_archive_repository
+
+logging = logger(__name__)
+
+
+class OrderArchiveCRUD:
+    """
+    Moves old completed and cancelled orders from orders to orders_archive.
+
+    With MongoDB each batch is copied to the archive first (idempotent
+    upserts), then deleted from orders with the same filter. Reads falling
+    back to the archive therefore always find a moved order, and an
+    interrupted run is simply resumed by the next one.
+    """
+
+    def __init__(self):
+        self.repository = get_order_archive_repository()
+
+    async def archive_orders(self, older_than_days: float, batch_size: int = 1000):
+        """
+        Move the orders in a final status not updated for older_than_days.
+
+        Returns:
+            int: Number of orders moved
+        """
+        try:
+            logging.info("Executing OrderArchiveCRUD.archive_orders function")
+            cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+            return await self.repository.archive(cutoff, batch_size)
+        except Exception as error:
+            logging.error(f"Error in OrderArchiveCRUD.archive_orders: {str(error)}")
+            raise error
@@ -1,20 +1,94 @@
 from datetime import datetime
 from core import logger
-from core.database.database import get_engine
-from core.models.order_model import Order
+from core.models.order_model import Order, OrderStatus
+from core.cruds.counter_crud import SequenceAllocator
+from core.cruds.user_order_stats_crud import (
+    UserOrderStatsCRUD,
+    order_contribution,
+    combine,
+)
 from core.apis.schemas.requests.order_request import (
     OrderCreateRequest,
     OrderUpdateRequest,
 )
+from core.repositories import get_order_repository
+from core.utils.cache import get_cache
+from core.utils.single_flight import get_single_flight
+from core.utils.order_events import order_events, status_event
+from commons.settings import settings
 from odmantic import ObjectId
+from bson.errors import InvalidId
 
 logging = logger(__name__)
 
+# Serialized GET /v1/orders/{id} responses, keyed by order id
+order_cache = get_cache(
+    "order",
+    ttl=settings.order_cache_ttl,
+    max_entries=settings.order_cache_max_entries,
+)
+
+
+class OrderStatusConflict(Exception):
+    """
+    An update asked for a status change the order's current status does not
+    allow, or the status changed while the update was being applied.
+    """
+
+
+def order_cache_key(id) -> str:
+    """
+    Key of an order in order_cache. The id is normalized, so ids differing
+    only by hex case share one entry (and its invalidation).
+    """
+    return order_cache.key(str(ObjectId(id)))
+
+
+# order_number -> order id. Order numbers never change, and a missing
+# number is not cached, so entries only need to expire for memory.
+order_number_cache = get_cache(
+    "order_number",
+    ttl=settings.order_cache_ttl,
+    max_entries=settings.order_cache_max_entries,
+)
+
+
+async def _max_order_number() -> int:
+    return await get_order_repository().max_order_number()
+
+
+# Order numbers are reserved from the order_number counter in blocks of
+# ORDER_NUMBER_BLOCK_SIZE per process
+order_numbers = SequenceAllocator(
+    "order_number", settings.order_number_block_size, floor=_max_order_number
+)
+
+# Concurrent identical reads share one query. Results are shared between
+# the coalesced callers, so raw documents must be treated as read-only.
+order_reads = get_single_flight("order.get_by_id")
+user_order_reads = get_single_flight("order.get_by_user_id")
+
+
+def forget_order_reads(order_ids, user_ids=()):
+    """
+    Stop sharing the in-flight reads of orders (and order lists of users)
+    that were just written. Called before their cache entries are dropped:
+    a reader arriving after the write must not join a read started before
+    it, or it would put the previous document back into order_cache.
+    """
+    order_ids = {ObjectId(id) for id in order_ids}
+    user_ids = {ObjectId(id) for id in user_ids}
+    order_reads.forget_if(lambda key: key[0] in order_ids)
+    if user_ids:
+        user_order_reads.forget_if(lambda key: key[0] in user_ids)
+
 
 class OrderCRUD:
     def __init__(self):
         self.Order = Order
-        self.engine = get_engine()
+        self.repository = get_order_repository()
+        # Per-user order summary, kept in sync by every order write
+        self.stats = UserOrderStatsCRUD()
 
     async def create_order(self, order_data: dict):
         """
@@ -25,15 +99,62 @@ class OrderCRUD:
             # Convert user_id string to ObjectId if it's not already
             if isinstance(order_data.get("user_id"), str):
                 order_data["user_id"] = ObjectId(order_data["user_id"])
+            order_data["order_number"] = await order_numbers.next()
 
             new_order = Order(**order_data)
-            saved_order = await self.engine.save(new_order)
+            saved_order = await self.repository.insert(new_order)
+            await self.stats.apply(
+                saved_order.user_id,
+                order_contribution(saved_order.status, saved_order.price),
+            )
             logging.info(f"Order created with ID: {saved_order.id}")
             return saved_order
         except Exception as error:
             logging.error(f"Error in OrderCRUD.create_order: {str(error)}")
             raise error
 
+    async def allocate_order_numbers(self, count: int) -> list:
+        """
+        Allocate count unique order numbers (for create_orders).
+        """
+        try:
+            logging.info("Executing OrderCRUD.allocate_order_numbers function")
+            return await order_numbers.allocate(count)
+        except Exception as error:
+            logging.error(f"Error in OrderCRUD.allocate_order_numbers: {str(error)}")
+            raise error
+
+    async def create_orders(self, orders: list):
+        """
+        Insert several orders with one unordered insert_many.
+
+        Args:
+            orders: Validated Order instances
+
+        Returns:
+            dict: {position in orders: error message} for the orders that
+            were not inserted (empty when all succeeded)
+        """
+        try:
+            logging.info(f"Executing OrderCRUD.create_orders for {len(orders)} orders")
+            failed = await self.repository.insert_many(orders)
+            if failed:
+                logging.warning(f"{len(failed)} orders of the batch were not inserted")
+
+            # One $inc per owner for the inserted orders
+            deltas = {}
+            for position, order in enumerate(orders):
+                if position not in failed:
+                    deltas.setdefault(order.user_id, []).append(
+                        order_contribution(order.status, order.price)
+                    )
+            for user_id, contributions in deltas.items():
+                await self.stats.apply(user_id, combine(*contributions))
+            return failed
+        except Exception as error:
+            logging.error(f"Error in OrderCRUD.create_orders: {str(error)}")
+            raise error
+
     async def update_order(self, id: str, update_data: dict):
         """
         Update an existing order by ID.
@@ -51,25 +172,80 @@ class OrderCRUD:
 
             # Automatically update the timestamp
             update_dict["item_updated_at"] = datetime.utcnow()
+            if "item_name" in update_dict:
+                update_dict["item_name_lower"] = update_dict["item_name"].lower()
 
             # Perform atomic update
-            collection = self.engine.get_collection(Order)
             mongo_id = ObjectId(id)
 
-            result = await collection.update_one(
-                {"_id": mongo_id},
-                {"$set": update_dict},
-            )
-
-            if result.modified_count == 0:
-                # Check if it exists but no changes were made
-                existing = await self.get_by_id(id)
-                if not existing:
+            # A status change is checked against the current status and only
+            # applied while the order is still in it
+            expected_status = None
+            if "status" in update_dict:
+                current = await self.repository.find_by_id(
+                    mongo_id, ["status"], include_archived=False
+                )
+                if current is None:
                     logging.warning("Order not found for update")
                     return None
-                return existing
+                expected_status = OrderStatus(current["status"])
+                target = update_dict["status"]
+                if target != expected_status and not expected_status.can_transition_to(
+                    target
+                ):
+                    raise OrderStatusConflict(
+                        f"Cannot move an order from {expected_status.value} "
+                        f"to {target.value}"
+                    )
+                expected_status = expected_status.value
+
+            # The previous price/status give the change of the order summary
+            previous = await self.repository.update(
+                mongo_id, update_dict, expected_status
+            )
+            forget_order_reads([mongo_id], [previous["user_id"]] if previous else ())
+            await order_cache.delete(order_cache_key(id))
+
+            if previous is None:
+                if expected_status is not None and await self.repository.find_by_id(
+                    mongo_id, ["status"], include_archived=False
+                ):
+                    raise OrderStatusConflict(
+                        "Order status changed during the update, please retry"
+                    )
+                logging.warning("Order not found for update")
+                return None
 
-            updated_order = await self.get_by_id(id)
+            if "price" in update_dict or "status" in update_dict:
+                await self.stats.apply(
+                    previous["user_id"],
+                    combine(
+                        order_contribution(
+                            previous["status"], previous["price"], sign=-1
+                        ),
+                        order_contribution(
+                            update_dict.get("status", previous["status"]),
+                            update_dict.get("price", previous["price"]),
+                        ),
+                    ),
+                )
+
+            status = update_dict.get("status")
+            if status is not None and status != previous["status"]:
+                order_events.notify(
+                    str(previous["user_id"]),
+                    status_event(
+                        mongo_id,
+                        status,
+                        previous["status"],
+                        update_dict["item_updated_at"],
+                    ),
+                )
+
+            # Read past single-flight: a read started before the write
+            # would return the previous document
+            document = await self.repository.find_by_id(mongo_id)
+            updated_order = Order.model_validate_doc(document) if document else None
             logging.info("Order updated successfully")
             return updated_order
 
@@ -77,15 +253,126 @@ class OrderCRUD:
             logging.error(f"Error in OrderCRUD.update_order: {str(error)}")
             raise error
 
-    async def get_by_id(self, id: str):
+    async def transition_statuses(
+        self, ids: list, status: OrderStatus, user_id: str
+    ) -> list:
+        """
+        Move several orders of a user to a new status.
+
+        One $in read finds the current statuses, then a single unordered
+        bulk write applies the allowed transitions. Each update is guarded by
+        the status it was validated against, so an order changed concurrently
+        is reported as an error instead of being overwritten.
+
+        Args:
+            ids: Order IDs as strings
+            status: Target status
+            user_id: Owner of the orders
+
+        Returns:
+            list: One {"id", "outcome", "previous_status", "error"} dict per
+            requested ID, in request order
+        """
+        try:
+            logging.info(f"Executing OrderCRUD.transition_statuses for {len(ids)} ids")
+            outcomes = {}
+            object_ids = {}
+            for id in ids:
+                try:
+                    object_ids[id] = ObjectId(id)
+                except (InvalidId, TypeError):
+                    outcomes[id] = ("error", None, "Invalid order id")
+
+            current = await self.repository.find_many(
+                list(object_ids.values()), ["user_id", "status", "price"]
+            )
+
+            # Mongo stores milliseconds: truncate so the value can be matched
+            now = datetime.utcnow()
+            now = now.replace(microsecond=now.microsecond // 1000 * 1000)
+            attempted = {}
+            for id, object_id in object_ids.items():
+                document = current.get(object_id)
+                if document is None:
+                    outcomes[id] = ("error", None, "Order not found")
+                    continue
+                previous = OrderStatus(document["status"])
+                if str(document["user_id"]) != user_id:
+                    outcomes[id] = (
+                        "error",
+                        None,
+                        "Not authorized to update this order",
+                    )
+                elif previous == status:
+                    outcomes[id] = ("unchanged", previous, None)
+                elif not previous.can_transition_to(status):
+                    outcomes[id] = (
+                        "error",
+                        previous,
+                        f"Cannot move an order from {previous.value} to {status.value}",
+                    )
+                elif object_id not in attempted:
+                    attempted[object_id] = (id, previous, document["price"])
+
+            if attempted:
+                applied = await self.repository.update_statuses(
+                    {
+                        object_id: previous.value
+                        for object_id, (_, previous, _) in attempted.items()
+                    },
+                    status.value,
+                    now,
+                )
+                contributions = []
+                for object_id, (id, previous, price) in attempted.items():
+                    if object_id in applied:
+                        outcomes[id] = ("updated", previous, None)
+                        contributions += [
+                            order_contribution(previous, price, sign=-1),
+                            order_contribution(status, price),
+                        ]
+                        order_events.notify(
+                            user_id, status_event(object_id, status, previous, now)
+                        )
+                    else:
+                        outcomes[id] = (
+                            "error",
+                            previous,
+                            "Order status changed concurrently",
+                        )
+                forget_order_reads(applied, [user_id])
+                await order_cache.delete(
+                    *(order_cache_key(object_id) for object_id in applied)
+                )
+                if contributions:
+                    await self.stats.apply(user_id, combine(*contributions))
+
+            return [
+                {
+                    "id": id,
+                    "outcome": outcomes[id][0],
+                    "previous_status": outcomes[id][1],
+                    "error": outcomes[id][2],
+                }
+                for id in ids
+            ]
+        except Exception as error:
+            logging.error(f"Error in OrderCRUD.transition_statuses: {str(error)}")
+            raise error
+
+    async def get_by_id(self, id: str, include_archived: bool = True):
         """
         Retrieve a single order by its ID.
+
+        Falls back to the archive unless include_archived is False.
         """
         try:
             logging.info("Executing OrderCRUD.get_by_id Function")
-            order_id = ObjectId(id)
-            found_order = await self.engine.find_one(Order, Order.id == order_id)
-            return found_order
+            document = await self._find_document(
+                ObjectId(id), include_archived=include_archived
+            )
+            # Each caller gets its own model instance
+            return Order.model_validate_doc(document) if document else None
         except Exception as error:
             logging.error(f"Error in OrderCRUD.get_by_id: {str(error)}")
             raise error
@@ -96,43 +383,285 @@ class OrderCRUD:
         """
         try:
             logging.info("Executing OrderCRUD.list_all function")
-            orders = await self.engine.find(
-                Order, skip=skip, limit=limit, sort=Order.item_created_at.desc()
-            )
-            total = await self.engine.count(Order)
+            documents, total = await self.repository.list_page(skip, limit)
+            orders = [Order.model_validate_doc(document) for document in documents]
             return orders, total
         except Exception as error:
             logging.error(f"Error in OrderCRUD.list_all: {str(error)}")
             raise error
 
-    async def get_by_user_id(self, user_id: str):
+    async def get_by_user_id(self, user_id: str, include_archived: bool = True):
         """
-        Retrieve all orders for a specific user.
+        Retrieve all orders for a specific user, newest first.
+
+        Archived orders are merged in unless include_archived is False.
         """
         try:
             logging.info(
                 f"Executing OrderCRUD.get_by_user_id Function for user: {user_id}"
             )
-            mongo_user_id = ObjectId(user_id)
-            orders = await self.engine.find(
-                Order, Order.user_id == mongo_user_id, sort=Order.item_created_at.desc()
+            documents = await self._find_user_documents(
+                ObjectId(user_id), None, include_archived
             )
-            return orders
+            return [Order.model_validate_doc(document) for document in documents]
         except Exception as error:
             logging.error(f"Error in OrderCRUD.get_by_user_id: {str(error)}")
             raise error
 
+    async def get_id_by_number(self, order_number: int):
+        """
+        Return the id (string) of the order with this order_number, or None.
+        """
+        try:
+            logging.info("Executing OrderCRUD.get_id_by_number function")
+
+            async def load():
+                id = await self.repository.find_id_by_number(order_number)
+                return str(id) if id else None
+
+            return await order_number_cache.get_or_load(
+                order_number_cache.key(str(order_number)), load
+            )
+        except Exception as error:
+            logging.error(f"Error in OrderCRUD.get_id_by_number: {str(error)}")
+            raise error
+
+    async def get_by_id_raw(
+        self, id: str, fields: list | None = None, include_archived: bool = True
+    ):
+        """
+        Retrieve a single order as a raw BSON document.
+
+        Args:
+            id: Order ID as string
+            fields: Optional sparse fieldset pushed down as a projection
+            include_archived: Fall back to the archive
+        """
+        try:
+            logging.info("Executing OrderCRUD.get_by_id_raw Function")
+            return await self._find_document(ObjectId(id), fields, include_archived)
+        except Exception as error:
+            logging.error(f"Error in OrderCRUD.get_by_id_raw: {str(error)}")
+            raise error
+
+    async def list_all_raw(
+        self, skip: int = 0, limit: int = 10, fields: list | None = None
+    ):
+        """
+        Retrieve a page of orders as raw BSON documents.
+
+        Read-only fast path: skips ODMantic model hydration and validation.
+        """
+        try:
+            logging.info("Executing OrderCRUD.list_all_raw function")
+            return await self.repository.list_page(skip, limit, fields)
+        except Exception as error:
+            logging.error(f"Error in OrderCRUD.list_all_raw: {str(error)}")
+            raise error
+
+    async def list_by_user_raw(
+        self,
+        user_id: str,
+        filters: dict,
+        after: tuple | None,
+        limit: int,
+        fields: list | None = None,
+        include_archived: bool = True,
+    ) -> list:
+        """
+        Retrieve one page of a per-user listing as raw BSON documents.
+
+        Args:
+            user_id: Owner of the orders
+            filters: statuses, created_from, created_to, min_price, max_price
+            after: (item_created_at, _id) of the last order of the previous page
+            limit: Maximum number of orders returned
+            fields: Optional sparse fieldset; item_created_at is always read
+                to build the next cursor
+            include_archived: Merge in archived orders
+        """
+        try:
+            logging.info("Executing OrderCRUD.list_by_user_raw function")
+            return await self.repository.list_by_user(
+                ObjectId(user_id), filters, after, limit, fields, include_archived
+            )
+        except Exception as error:
+            logging.error(f"Error in OrderCRUD.list_by_user_raw: {str(error)}")
+            raise error
+
+    async def search_text_raw(
+        self,
+        user_id: str,
+        text: str,
+        skip: int,
+        limit: int,
+        fields: list | None = None,
+    ) -> list:
+        """
+        Full-text search over item_name and item_list, most relevant first.
+
+        Args:
+            user_id: Only search the orders of this user
+            text: $text search string (words, "phrases", -negations)
+            skip / limit: Page of the results
+            fields: Optional sparse fieldset
+
+        Returns:
+            list: Raw BSON documents, each with its relevance "score"
+        """
+        try:
+            logging.info("Executing OrderCRUD.search_text_raw function")
+            return await self.repository.search_text(
+                ObjectId(user_id), text, skip, limit, fields
+            )
+        except Exception as error:
+            logging.error(f"Error in OrderCRUD.search_text_raw: {str(error)}")
+            raise error
+
+    async def search_prefix_raw(
+        self,
+        user_id: str,
+        prefix: str,
+        skip: int,
+        limit: int,
+        fields: list | None = None,
+    ) -> list:
+        """
+        Case-insensitive item_name prefix search (autocomplete), ordered by
+        item name.
+
+        Args:
+            user_id: Only search the orders of this user
+            prefix: Start of the item name
+            skip / limit: Page of the results
+            fields: Optional sparse fieldset
+        """
+        try:
+            logging.info("Executing OrderCRUD.search_prefix_raw function")
+            return await self.repository.search_prefix(
+                ObjectId(user_id), prefix, skip, limit, fields
+            )
+        except Exception as error:
+            logging.error(f"Error in OrderCRUD.search_prefix_raw: {str(error)}")
+            raise error
+
+    async def iter_raw(
+        self,
+        user_id: str | None = None,
+        after: ObjectId | None = None,
+        batch_size: int = 1000,
+        include_archived: bool = True,
+    ):
+        """
+        Iterate over orders as raw BSON documents in _id order.
+
+        Documents are pulled batch_size at a time, so memory stays constant
+        whatever the number of orders.
+
+        Args:
+            user_id: Only iterate over the orders of this user
+            after: Resume after this _id (last exported order)
+            batch_size: Documents fetched per round-trip
+            include_archived: Merge in archived orders
+        """
+        logging.info("Executing OrderCRUD.iter_raw function")
+        owner = ObjectId(user_id) if user_id is not None else None
+        documents = self.repository.iterate(owner, after, batch_size, include_archived)
+        try:
+            async for document in documents:
+                yield document
+        except Exception as error:
+            logging.error(f"Error in OrderCRUD.iter_raw: {str(error)}")
+            raise error
+        finally:
+            await documents.aclose()
+
+    async def get_many_raw(
+        self,
+        ids: list,
+        user_id: str,
+        fields: list | None = None,
+        include_archived: bool = True,
+    ):
+        """
+        Retrieve the orders of a user matching a list of IDs with one $in query.
+
+        Args:
+            ids: Order IDs as ObjectId
+            user_id: Owner; orders of other users are not returned
+            fields: Optional sparse fieldset pushed down as a projection
+            include_archived: Look the IDs not found up in the archive
+
+        Returns:
+            dict: {ObjectId: raw document} for the orders found
+        """
+        try:
+            logging.info(f"Executing OrderCRUD.get_many_raw for {len(ids)} ids")
+            return await self.repository.find_many(
+                ids, fields, ObjectId(user_id), include_archived
+            )
+        except Exception as error:
+            logging.error(f"Error in OrderCRUD.get_many_raw: {str(error)}")
+            raise error
+
+    async def get_by_user_id_raw(
+        self, user_id: str, fields: list | None = None, include_archived: bool = True
+    ):
+        """
+        Retrieve all orders for a specific user as raw BSON documents.
+
+        Read-only fast path: skips ODMantic model hydration and validation.
+        Archived orders are merged in unless include_archived is False.
+        """
+        try:
+            logging.info(
+                f"Executing OrderCRUD.get_by_user_id_raw Function for user: {user_id}"
+            )
+            return await self._find_user_documents(
+                ObjectId(user_id), fields, include_archived
+            )
+        except Exception as error:
+            logging.error(f"Error in OrderCRUD.get_by_user_id_raw: {str(error)}")
+            raise error
+
+    async def _find_document(
+        self,
+        order_id: ObjectId,
+        fields: list | None = None,
+        include_archived: bool = True,
+    ):
+        # Hydrated and raw reads share the same query when fields is None
+        return await order_reads.do(
+            (order_id, tuple(fields or ()), include_archived),
+            lambda: self.repository.find_by_id(order_id, fields, include_archived),
+        )
+
+    async def _find_user_documents(
+        self, user_id: ObjectId, fields: list | None, include_archived: bool = True
+    ):
+        return await user_order_reads.do(
+            (user_id, tuple(fields or ()), include_archived),
+            lambda: self.repository.find_by_user(user_id, fields, include_archived),
+        )
+
     async def delete_order(self, id: str):
         """
         Delete an order by ID.
         """
         try:
             logging.info("Executing OrderCRUD.delete_order function")
-            mongo_id = ObjectId(id)
-            found_order = await self.engine.find_one(Order, Order.id == mongo_id)
-            if not found_order:
+            # Archived orders are read-only but can still be deleted
+            deleted_order = await self.repository.delete(ObjectId(id))
+            if not deleted_order:
                 return False
-            await self.engine.delete(found_order)
+            forget_order_reads([id], [deleted_order["user_id"]])
+            await order_cache.delete(order_cache_key(id))
+            await self.stats.apply(
+                deleted_order["user_id"],
+                order_contribution(
+                    deleted_order["status"], deleted_order["price"], sign=-1
+                ),
+            )
             logging.info(f"Order {id} deleted successfully")
             return True
         except Exception as error:
@@ -1,51 +1,161 @@
+from datetime import datetime
 from core import logger
-from core.database.database import get_engine
 from core.models.user_model import User
-from core.apis.schemas.requests.user_request import UserCreateRequest
+from core.repositories import get_user_repository
+from core.apis.schemas.requests.user_request import (
+    UserCreateRequest,
+    UpdateUserRequest,
+)
+from core.utils.cache import get_cache
+from core.utils.single_flight import get_single_flight
+from commons.settings import settings
 from odmantic import ObjectId  ## for id to string
 
 logging = logger(__name__)
 
+# Read-through cache of user profiles. Cached documents never contain the
+# sensitive fields below, whichever backend (in-process or shared) is used.
+user_cache = get_cache(
+    "user",
+    ttl=settings.user_cache_ttl,
+    max_entries=settings.user_cache_max_entries,
+)
+SENSITIVE_USER_FIELDS = {"hashed_password": "", "otp": None, "otp_expiry": None}
+
+
+def user_cache_key(id) -> str:
+    """
+    Key of a user profile in user_cache, with the id normalized (see
+    order_cache_key).
+    """
+    return user_cache.key("id", str(ObjectId(id)))
+
+
+# Concurrent reads of the same user share one query
+user_reads = get_single_flight("user.get_by_id")
+
 
 class UserCRUD:
     def __init__(self):
         self.User = User
-        self.engine = get_engine()
+        self.repository = get_user_repository()
 
     async def create(self, user_data: dict):
+        """
+        Insert a new user.
+
+        Raises:
+            DuplicateKeyError: a user with this email already exists (unique
+                index on users.email)
+        """
         try:
             logging.info("Executing UserCRUD.create function")
             user = User(**user_data)
-            saved_user = await self.engine.save(user)
+            saved_user = await self.repository.insert(user)
+            # Drop a stale email mapping left by a deleted account
+            await user_cache.delete(user_cache.key("email", saved_user.email))
             logging.info(f"User created with ID: {saved_user.id}")
             return saved_user
         except Exception as error:
             logging.error(f"Error in UserCRUD.create: {str(error)}")
             raise error
 
-    async def get_by_email(self, email: str):
+    async def get_by_email(self, email: str, include_sensitive: bool = True):
+        """
+        Retrieve a user by email.
+
+        Args:
+            email: User's email address
+            include_sensitive: When False the user may be served from the
+                profile cache, with hashed_password empty and otp/otp_expiry
+                unset. Pass True whenever credentials or the OTP are checked.
+        """
         try:
             logging.info("Executing UserCRUD.get_by_email function")
+            if not include_sensitive:
+                cached_id = await user_cache.get(user_cache.key("email", email))
+                if cached_id is not None:
+                    return await self.get_by_id(cached_id["id"], include_sensitive)
+
             # We look for a user in the database where the email matches the input
-            user = await self.engine.find_one(User, User.email == email)
+            document = await self.repository.find_by_email(email)
+            user = User.model_validate_doc(document) if document else None
             if user:
                 logging.info(f"User found with email: {email}")
+                await user_cache.set(
+                    user_cache.key("email", email), {"id": str(user.id)}
+                )
             return user
         except Exception as error:
             logging.error(f"Error in UserCRUD.get_by_email: {str(error)}")
             raise error
 
-    async def get_by_id(self, id: str):
+    async def get_by_id(self, id: str, include_sensitive: bool = True):
+        """
+        Retrieve a user by ID.
+
+        Args:
+            id: User ID as string
+            include_sensitive: When False the user is served from the
+                profile cache, with hashed_password empty and otp/otp_expiry
+                unset. Pass True whenever credentials or the OTP are checked.
+        """
         try:
             logging.info("Executing UserCRUD.get_by_id Function")
-            # Convert string ID to ObjectId for MongoDB query
-            user_id = ObjectId(id)
-            user = await self.engine.find_one(User, User.id == user_id)
-            return user
+            if not include_sensitive:
+                document = await user_cache.get_or_load(
+                    user_cache_key(id), lambda: self._load_profile(id)
+                )
+                return User.model_validate_doc(document) if document else None
+
+            document = await self._find_document(id)
+            # Each caller gets its own model instance
+            return User.model_validate_doc(document) if document else None
         except Exception as error:
             logging.error(f"Error in UserCRUD.get_by_id: {str(error)}")
             raise error
 
+    async def _find_document(self, id: str):
+        # Raw user document, shared by concurrent callers: do not mutate it
+        user_id = ObjectId(id)
+        return await user_reads.do(
+            str(user_id), lambda: self.repository.find_by_id(user_id)
+        )
+
+    async def _load_profile(self, id: str):
+        # Cacheable user document: sensitive fields are blanked before caching
+        document = await self._find_document(id)
+        if document:
+            document = {**document, **SENSITIVE_USER_FIELDS}
+        return document
+
+    async def invalidate(self, id: str, email: str = None):
+        """
+        Drop a user from the profile cache. The in-flight read of the user
+        is forgotten first, so a reader arriving after the write does not
+        cache the document it read before.
+        """
+        user_reads.forget(str(ObjectId(id)))
+        keys = [user_cache_key(id)]
+        if email:
+            keys.append(user_cache.key("email", email))
+        await user_cache.delete(*keys)
+
+    async def get_by_id_raw(self, id: str, fields: list):
+        """
+        Retrieve the requested fields of a user as a raw BSON document.
+
+        Args:
+            id: User ID as string
+            fields: Sparse fieldset pushed down as a Mongo projection
+        """
+        try:
+            logging.info("Executing UserCRUD.get_by_id_raw Function")
+            return await self.repository.find_by_id(ObjectId(id), fields)
+        except Exception as error:
+            logging.error(f"Error in UserCRUD.get_by_id_raw: {str(error)}")
+            raise error
+
     async def update(self, id: str, update_data: dict):
         """
         Update user by ID using atomic MongoDB update_one operation.
@@ -63,15 +173,12 @@ class UserCRUD:
             2. Filters out None values (only update what's provided)
             3. Uses MongoDB's $set operator for atomic update
             4. Automatically updates the updated_at timestamp
-            5. Returns the fresh updated user from database
+            5. Invalidates the cached profile
+            6. Returns the fresh updated user from database
         """
         try:
             logging.info("Executing UserCRUD.update function")
 
-            # Import UpdateUserRequest for validation
-            from core.apis.schemas.requests.user_request import UpdateUserRequest
-            from datetime import datetime
-
             # Step 1: Validate data with Pydantic schema
             validated_data = UpdateUserRequest(**update_data)
 
@@ -86,28 +193,28 @@ class UserCRUD:
             # Step 3: Add updated_at timestamp automatically
             update_dict["updated_at"] = datetime.utcnow()
 
-            # Step 4: Get the raw MongoDB collection (Motor driver)
-            collection = self.engine.get_collection(User)
-
-            # Step 5: Convert string ID to MongoDB ObjectId
+            # Step 4: Convert string ID to MongoDB ObjectId
             mongo_id = ObjectId(id)
 
-            # Step 6: Perform atomic update using MongoDB's $set operator
+            # Step 5: Perform atomic update using MongoDB's $set operator
             # This updates ONLY the specified fields without fetching first
-            result = await collection.update_one(
-                {"_id": mongo_id},  # Find document by ID
-                {"$set": update_dict},  # Update only these fields
-            )
+            modified = await self.repository.update(mongo_id, update_dict)
+
+            # Step 6: Drop the cached profile, it no longer matches the database
+            await self.invalidate(id)
 
             # Step 7: Check if any document was actually updated
-            if result.modified_count == 0:
+            if not modified:
                 logging.warning(
                     "No document was updated (user not found or no changes)"
                 )
                 return None
 
-            # Step 8: Fetch and return the updated user
-            updated_user = await self.get_by_id(id)
+            # Step 8: Fetch and return the updated user. Read past
+            # single-flight: a read started before the write would return
+            # the previous document
+            document = await self.repository.find_by_id(mongo_id)
+            updated_user = User.model_validate_doc(document) if document else None
             logging.info("User updated successfully")
             return updated_user
 
@@ -119,11 +226,10 @@ class UserCRUD:
     async def delete(self, id: str):
         try:
             logging.info("Executing UserCRUD.delete function")
-            mongo_id = ObjectId(id)
-            user = await self.engine.find_one(User, User.id == mongo_id)
-            if not user:
+            deleted = await self.repository.delete(ObjectId(id))
+            if not deleted:
                 return None
-            await self.engine.delete(user)
+            await self.invalidate(id, deleted["email"])
             return True
         except Exception as error:
             logging.error(f"Error in UserCRUD.delete: {str(error)}")
@@ -143,26 +249,23 @@ class UserCRUD:
         """
         try:
             logging.info("Executing UserCRUD.update_otp function")
-            from datetime import datetime
-
-            collection = self.engine.get_collection(User)
 
-            result = await collection.update_one(
-                {"email": email},
+            modified = await self.repository.update_by_email(
+                email,
                 {
-                    "$set": {
-                        "otp": otp,
-                        "otp_expiry": otp_expiry,
-                        "updated_at": datetime.utcnow(),
-                    }
+                    "otp": otp,
+                    "otp_expiry": otp_expiry,
+                    "updated_at": datetime.utcnow(),
                 },
             )
 
-            if result.modified_count == 0:
+            if not modified:
                 logging.warning("No document was updated (user not found)")
                 return None
 
             updated_user = await self.get_by_email(email)
+            if updated_user:
+                await self.invalidate(str(updated_user.id))
             logging.info("OTP updated successfully")
             return updated_user
 
@@ -0,0 +1,90 @@
+from core import logger
+from core.models.order_model import OrderStatus
+from core.repositories import get_user_order_stats_repository
+from core.repositories.base import STATS_FIELDS
+from odmantic import ObjectId
+
+logging = logger(__name__)
+
+EMPTY_STATS = {"orders": 0, "cancelled_orders": 0, "total_spent": 0.0}
+
+
+def order_contribution(status, price: float, sign: int = 1) -> dict:
+    """
+    Return what one order adds to (sign=1) or removes from (sign=-1) the
+    summary of its owner.
+    """
+    cancelled = OrderStatus(status) == OrderStatus.CANCELLED
+    return {
+        "orders": sign,
+        "cancelled_orders": sign if cancelled else 0,
+        "total_spent": 0.0 if cancelled else sign * price,
+    }
+
+
+def combine(*deltas: dict) -> dict:
+    """
+    Sum several contributions into one $inc.
+    """
+    return {field: sum(delta[field] for delta in deltas) for field in STATS_FIELDS}
+
+
+class UserOrderStatsCRUD:
+    """
+    Per-user order summary stored in user_order_stats.
+
+    Order writes apply their contribution with a single atomic $inc upsert
+    right after the order itself is written. Both writes are not in one
+    transaction: rebuild() recomputes the summaries from the orders and
+    fixes any drift. A summary incremented while the rebuild runs is skipped
+    (its $inc would be lost by the replacement) and fixed by the next run.
+    """
+
+    def __init__(self):
+        self.repository = get_user_order_stats_repository()
+
+    async def apply(self, user_id, delta: dict):
+        """
+        Add a contribution (see order_contribution/combine) to a summary.
+        """
+        try:
+            increments = {field: delta[field] for field in STATS_FIELDS if delta[field]}
+            if not increments:
+                return
+            await self.repository.increment(ObjectId(user_id), increments)
+        except Exception as error:
+            logging.error(f"Error in UserOrderStatsCRUD.apply: {str(error)}")
+            raise error
+
+    async def get(self, user_id: str) -> dict:
+        """
+        Return the summary of a user (zeros when the user has no orders).
+        """
+        try:
+            logging.info("Executing UserOrderStatsCRUD.get function")
+            document = await self.repository.find(ObjectId(user_id))
+            if not document:
+                return dict(EMPTY_STATS)
+            return {field: document.get(field, 0) for field in STATS_FIELDS}
+        except Exception as error:
+            logging.error(f"Error in UserOrderStatsCRUD.get: {str(error)}")
+            raise error
+
+    async def rebuild(self, user_id: str | None = None, batch_size: int = 1000):
+        """
+        Recompute summaries from the orders and orders_archive collections.
+
+        Args:
+            user_id: Only rebuild the summary of this user
+            batch_size: Summaries replaced per bulk_write
+
+        Returns:
+            int: Number of summaries written
+        """
+        try:
+            logging.info("Executing UserOrderStatsCRUD.rebuild function")
+            owner = ObjectId(user_id) if user_id else None
+            return await self.repository.rebuild(owner, batch_size)
+        except Exception as error:
+            logging.error(f"Error in UserOrderStatsCRUD.rebuild: {str(error)}")
+            raise error
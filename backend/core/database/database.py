@@ -1,10 +1,14 @@
-import os
 from motor.motor_asyncio import AsyncIOMotorClient
 from odmantic import AIOEngine
-from dotenv import load_dotenv
+from commons.settings import settings
 from core import logger
-
-load_dotenv()
+from core.models.user_model import User
+from core.models.order_model import (
+    Order,
+    ORDERS_ARCHIVE_COLLECTION,
+    ORDERS_ARCHIVE_INDEXES,
+)
+from core.models.idempotency_model import IdempotencyRecord
 
 logging = logger(__name__)
 
@@ -22,34 +26,55 @@ db_instance = Database()
 
 
 async def connect_to_mongo():
+    if settings.repository_backend == "memory":
+        logging.info("Using the in-memory repositories, not connecting to MongoDB")
+        return
+
     # Step 4: Create MongoDB client (lazy connection)
     try:
-        db_instance.client = AsyncIOMotorClient(
-            os.getenv("MONGODB_URI", "mongodb://localhost:27017")
-        )
+        db_instance.client = AsyncIOMotorClient(settings.mongodb_uri)
 
         # Step 5: Create ODMantic engine using the client
         db_instance.engine = AIOEngine(
             client=db_instance.client,
-            database=os.getenv("DATABASE_NAME", "authentication"),
+            database=settings.database_name,
         )
 
         # Step 6: Force a real connection check
-        await db_instance.client[os.getenv("DATABASE_NAME", "authentication")].command(
-            "ping"
-        )
+        await db_instance.client[settings.database_name].command("ping")
         logging.info("Connected to MongoDB")
     except Exception as e:
         logging.error(f"Failed to connect to MongoDB: {e}")
+        return
+
+    await ensure_indexes()
+
+
+async def ensure_indexes():
+    # Step 7: Create the indexes declared on the models (unique user email,
+    # per-user order listings, idempotency key expiry). Signup relies on the
+    # unique index to reject duplicate emails.
+    for model in (User, Order, IdempotencyRecord):
+        try:
+            await db_instance.engine.configure_database([model])
+            logging.info(f"MongoDB indexes of {model.__name__} are up to date")
+        except Exception as e:
+            logging.error(f"Failed to create MongoDB indexes of {model.__name__}: {e}")
+    try:
+        archive = db_instance.engine.database[ORDERS_ARCHIVE_COLLECTION]
+        await archive.create_indexes(ORDERS_ARCHIVE_INDEXES)
+        logging.info("MongoDB indexes of the order archive are up to date")
+    except Exception as e:
+        logging.error(f"Failed to create MongoDB indexes of the order archive: {e}")
 
 
 async def close_mongo_connection():
-    # Step 7: Close MongoDB client during shutdown
+    # Step 8: Close MongoDB client during shutdown
     if db_instance.client:
         db_instance.client.close()
         logging.info("Closed MongoDB connection")
 
 
 def get_engine() -> AIOEngine:
-    # Step 8: Provide ODMantic engine for CRUD operations
+    # Step 9: Provide ODMantic engine for CRUD operations
     return db_instance.engine
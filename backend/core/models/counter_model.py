@@ -0,0 +1,23 @@
+"""
+Counter Model Module
+
+Named monotonic counters (collection counters), incremented atomically with
+$inc to allocate sequence numbers such as Order.order_number.
+"""
+
+from odmantic import Field, Model
+
+
+class Counter(Model):
+    """
+    ODMantic Model representing a named counter.
+
+    Attributes:
+        name: Name of the sequence (primary key)
+        value: Last number handed out
+    """
+
+    name: str = Field(..., primary_field=True)
+    value: int = Field(default=0, ge=0, description="Last allocated number")
+
+    model_config = {"collection": "counters"}
@@ -0,0 +1,47 @@
+"""
+Idempotency Model Module
+
+Stored responses of requests sent with an Idempotency-Key header
+(collection idempotency_keys). Records are removed by a TTL index once
+expires_at has passed.
+"""
+
+from datetime import datetime
+from typing import Optional
+
+from odmantic import Field, Model
+from pymongo import IndexModel
+
+# Record states
+PROCESSING = "processing"
+COMPLETED = "completed"
+
+
+class IdempotencyRecord(Model):
+    """
+    ODMantic Model representing one idempotency key.
+
+    Attributes:
+        key: "<scope>:<Idempotency-Key>" (primary key)
+        fingerprint: Keyed hash of the request body the key was first used with
+        state: "processing" while the first request runs, then "completed"
+        status_code: Status code of the stored response
+        body: Body of the stored response
+        locked_at: When the processing request claimed the key
+        expires_at: When the record is deleted by the TTL index
+    """
+
+    key: str = Field(..., primary_field=True)
+    fingerprint: str = Field(..., description="Hash of the request body")
+    state: str = Field(default=PROCESSING, description="processing or completed")
+    status_code: Optional[int] = Field(default=None, description="Response status")
+    body: Optional[bytes] = Field(default=None, description="Response body")
+    locked_at: datetime = Field(default_factory=datetime.utcnow)
+    expires_at: datetime = Field(..., description="Expiry (TTL index)")
+
+    model_config = {
+        "collection": "idempotency_keys",
+        "indexes": lambda: [
+            IndexModel([("expires_at", 1)], expireAfterSeconds=0, name="expires_at_ttl")
+        ],
+    }
@@ -1,8 +1,10 @@
 from enum import Enum
 from typing import Optional
 from datetime import datetime
-from odmantic import Field, Model, ObjectId
-from pydantic import BaseModel, EmailStr, field_validator
+from odmantic import Field, Index, Model, ObjectId
+from odmantic.query import desc
+from pydantic import BaseModel, EmailStr, field_validator, model_validator
+from pymongo import IndexModel, TEXT
 from core.models.user_model import UserAddress, User
 
 
@@ -12,6 +14,37 @@ class OrderStatus(str, Enum):  ##from enum import Enum
     PENDING = "PENDING"
     COMPLETED = "COMPLETED"
 
+    def can_transition_to(self, target: "OrderStatus") -> bool:
+        """Check that an order in this status may be moved to target."""
+        return target in ORDER_STATUS_TRANSITIONS[self]
+
+
+# Allowed status changes; COMPLETED and CANCELLED are final
+ORDER_STATUS_TRANSITIONS = {
+    OrderStatus.BOOKED: {
+        OrderStatus.PENDING,
+        OrderStatus.COMPLETED,
+        OrderStatus.CANCELLED,
+    },
+    OrderStatus.PENDING: {OrderStatus.COMPLETED, OrderStatus.CANCELLED},
+    OrderStatus.COMPLETED: set(),
+    OrderStatus.CANCELLED: set(),
+}
+
+# Orders in a final status are moved to the archive collection once they
+# have not changed for ORDER_ARCHIVE_AFTER_DAYS. Archived documents keep the
+# Order shape; only the indexes needed by the reads that fall back to the
+# archive are built there.
+ORDERS_ARCHIVE_COLLECTION = "orders_archive"
+ARCHIVABLE_STATUSES = (OrderStatus.COMPLETED.value, OrderStatus.CANCELLED.value)
+ORDERS_ARCHIVE_INDEXES = [
+    IndexModel(
+        [("user_id", 1), ("item_created_at", -1), ("_id", -1)],
+        name="user_created",
+    ),
+    IndexModel([("order_number", 1)], unique=True, name="order_number_unique"),
+]
+
 
 class Order(Model):
     """
@@ -25,7 +58,8 @@ class Order(Model):
 
     item_name: str = Field(..., min_length=2, max_length=100, description="Item name")
     price: float = Field(..., ge=0, description="Price of the item")
-    order_number: int = Field(..., ge=0, description="Order ID")
+    # Allocated by the server from the order_number counter
+    order_number: int = Field(..., ge=0, unique=True, description="Order ID")
     item_list: list = Field(..., description="List of items")
     Address: UserAddress = Field(..., description="User's physical address")
     status: OrderStatus = Field(
@@ -37,3 +71,58 @@ class Order(Model):
     item_updated_at: datetime = Field(
         default_factory=datetime.utcnow, description="Item last update timestamp"
     )
+    item_name_lower: str = Field(
+        default="", description="Lower-cased item_name for prefix search"
+    )
+
+    @model_validator(mode="before")
+    @classmethod
+    def set_item_name_lower(cls, data):
+        """Derive item_name_lower from item_name (never set by callers)."""
+        if isinstance(data, dict) and isinstance(data.get("item_name"), str):
+            data = {**data, "item_name_lower": data["item_name"].lower()}
+        return data
+
+    # Per-user listings (GET /v1/users/me/orders): equality on user_id (and
+    # status), then the (item_created_at, _id) keyset sort, then price so a
+    # price range is filtered on the index keys. Every filter combination is
+    # served without a collection scan or an in-memory sort.
+    model_config = {
+        "indexes": lambda: [
+            Index(
+                Order.user_id,
+                Order.item_created_at.desc(),
+                desc(Order.id),
+                Order.price,
+                name="user_created_price",
+            ),
+            Index(
+                Order.user_id,
+                Order.status,
+                Order.item_created_at.desc(),
+                desc(Order.id),
+                Order.price,
+                name="user_status_created_price",
+            ),
+            # Per-user exports, resumed from the last exported _id
+            Index(Order.user_id, Order.id, name="user_id_export"),
+            # Search (GET /v1/users/me/orders/search). The user_id prefix
+            # scopes the text index to one user: $text queries must match
+            # user_id by equality and only scan that user's entries.
+            IndexModel(
+                [("user_id", 1), ("item_name", TEXT), ("item_list", TEXT)],
+                weights={"item_name": 3, "item_list": 1},
+                name="user_item_text",
+            ),
+            # Archival job: final orders by last update
+            Index(Order.status, Order.item_updated_at, name="status_updated"),
+            # Autocomplete: an anchored ^prefix regex on item_name_lower is
+            # an index range scan, already in (item_name_lower, _id) order
+            Index(
+                Order.user_id,
+                Order.item_name_lower,
+                Order.id,
+                name="user_item_name_prefix",
+            ),
+        ]
+    }
@@ -71,7 +71,8 @@ class User(Model):
     Attributes:
         first_name: User's first name
         last_name: User's last name
-        email: User's email address (unique identifier)
+        email: User's email address (unique identifier, enforced by a unique
+            index)
         mobile_number: User's 10-digit mobile number
         hashed_password: Bcrypt hashed password (never store plain text)
         address: User's physical address (embedded document)
@@ -86,7 +87,9 @@ class User(Model):
     last_name: str = Field(
         ..., min_length=2, max_length=50, description="User's last name"
     )
-    email: EmailStr = Field(..., description="User's email address (must be unique)")
+    email: EmailStr = Field(
+        ..., unique=True, description="User's email address (must be unique)"
+    )
     mobile_number: str = Field(
         ...,
         min_length=10,
@@ -0,0 +1,36 @@
+"""
+User Order Stats Model Module
+
+Materialized per-user order summary (collection user_order_stats), kept up
+to date with $inc by the order writes and rebuilt from the orders by the
+reconciliation job.
+"""
+
+from datetime import datetime
+
+from odmantic import Field, Model, ObjectId
+
+
+class UserOrderStats(Model):
+    """
+    ODMantic Model representing the order summary of a user.
+
+    Attributes:
+        user_id: Owner of the orders (primary key)
+        orders: Number of orders
+        cancelled_orders: Number of cancelled orders
+        total_spent: Sum of the price of the orders that are not cancelled
+        updated_at: Last time the summary changed
+    """
+
+    user_id: ObjectId = Field(..., primary_field=True)
+    orders: int = Field(default=0, description="Number of orders")
+    cancelled_orders: int = Field(default=0, description="Number of cancelled orders")
+    total_spent: float = Field(
+        default=0.0, description="Sum of non-cancelled order prices"
+    )
+    updated_at: datetime = Field(
+        default_factory=datetime.utcnow, description="Last update timestamp"
+    )
+
+    model_config = {"collection": "user_order_stats"}
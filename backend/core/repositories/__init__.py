@@ -0,0 +1,90 @@
+"""
+Repositories Package
+
+Storage backends of the CRUD layer, selected by the REPOSITORY_BACKEND
+setting:
+
+- mongo (default): MongoDB through the shared ODMantic engine
+- memory: dictionaries of the current process, for running, load testing
+  and profiling the API without any service (core.repositories.memory)
+
+The get_*_repository functions return the repository of the configured
+backend; CRUD classes call them when they are instantiated.
+"""
+
+from commons.settings import settings
+from core.database.database import get_engine
+from core.repositories.base import (
+    CounterRepository,
+    IdempotencyRepository,
+    OrderAnalyticsRepository,
+    OrderArchiveRepository,
+    OrderRepository,
+    UserOrderStatsRepository,
+    UserRepository,
+)
+from core.repositories.memory import (
+    MemoryCounterRepository,
+    MemoryIdempotencyRepository,
+    MemoryOrderAnalyticsRepository,
+    MemoryOrderArchiveRepository,
+    MemoryOrderRepository,
+    MemoryUserOrderStatsRepository,
+    MemoryUserRepository,
+    memory_store,
+)
+from core.repositories.mongo import (
+    MongoCounterRepository,
+    MongoIdempotencyRepository,
+    MongoOrderAnalyticsRepository,
+    MongoOrderArchiveRepository,
+    MongoOrderRepository,
+    MongoUserOrderStatsRepository,
+    MongoUserRepository,
+)
+
+
+def uses_memory_backend() -> bool:
+    return settings.repository_backend == "memory"
+
+
+def get_user_repository() -> UserRepository:
+    if uses_memory_backend():
+        return MemoryUserRepository(memory_store)
+    return MongoUserRepository(get_engine())
+
+
+def get_order_repository() -> OrderRepository:
+    if uses_memory_backend():
+        return MemoryOrderRepository(memory_store)
+    return MongoOrderRepository(get_engine())
+
+
+def get_order_analytics_repository() -> OrderAnalyticsRepository:
+    if uses_memory_backend():
+        return MemoryOrderAnalyticsRepository(memory_store)
+    return MongoOrderAnalyticsRepository(get_engine())
+
+
+def get_order_archive_repository() -> OrderArchiveRepository:
+    if uses_memory_backend():
+        return MemoryOrderArchiveRepository(memory_store)
+    return MongoOrderArchiveRepository(get_engine())
+
+
+def get_counter_repository() -> CounterRepository:
+    if uses_memory_backend():
+        return MemoryCounterRepository(memory_store)
+    return MongoCounterRepository(get_engine())
+
+
+def get_user_order_stats_repository() -> UserOrderStatsRepository:
+    if uses_memory_backend():
+        return MemoryUserOrderStatsRepository(memory_store)
+    return MongoUserOrderStatsRepository(get_engine())
+
+
+def get_idempotency_repository() -> IdempotencyRepository:
+    if uses_memory_backend():
+        return MemoryIdempotencyRepository(memory_store)
+    return MongoIdempotencyRepository(get_engine())
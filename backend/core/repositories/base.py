@@ -0,0 +1,385 @@
+"""
+Repository Base Module
+
+Storage interface of the CRUD layer. The CRUD classes keep the caching,
+single-flight, order summary and event logic and delegate every read and
+write to a repository of the configured backend (see core.repositories).
+
+Documents are exchanged in their stored BSON shape: "_id" holds the
+ObjectId, enums hold their value and datetimes are naive UTC with
+millisecond precision. Returned documents may be shared between callers
+and must not be mutated. A fields list limits a read to "_id" and those
+fields.
+"""
+
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import AsyncIterator, Optional
+
+from odmantic import ObjectId
+
+from core.models.order_model import Order
+from core.models.user_model import User
+from core.utils.serializers import build_projection
+
+# Fields read by the order queries (every Order field)
+ORDER_PROJECTION = {
+    "user_id": 1,
+    "item_name": 1,
+    "price": 1,
+    "order_number": 1,
+    "item_list": 1,
+    "Address": 1,
+    "status": 1,
+    "item_created_at": 1,
+    "item_updated_at": 1,
+}
+
+# Fields of a summary in user_order_stats
+STATS_FIELDS = ("orders", "cancelled_orders", "total_spent")
+
+
+def order_projection(fields: Optional[list]) -> dict:
+    """
+    Return the projection of an order read (every field when fields is None).
+    """
+    return build_projection(fields) if fields else ORDER_PROJECTION
+
+
+class UserRepository(ABC):
+    """
+    Storage of the users; email is unique.
+    """
+
+    @abstractmethod
+    async def insert(self, user: User) -> User:
+        """
+        Insert a new user.
+
+        Raises:
+            odmantic.exceptions.DuplicateKeyError: the email is already used
+        """
+
+    @abstractmethod
+    async def find_by_id(
+        self, user_id: ObjectId, fields: Optional[list] = None
+    ) -> Optional[dict]: ...
+
+    @abstractmethod
+    async def find_by_email(self, email: str) -> Optional[dict]: ...
+
+    @abstractmethod
+    async def update(self, user_id: ObjectId, values: dict) -> bool:
+        """
+        $set values on a user.
+
+        Returns:
+            bool: False if no user was modified
+        """
+
+    @abstractmethod
+    async def update_by_email(self, email: str, values: dict) -> bool: ...
+
+    @abstractmethod
+    async def delete(self, user_id: ObjectId) -> Optional[dict]:
+        """
+        Delete a user and return its email, or None if not found.
+        """
+
+
+class OrderRepository(ABC):
+    """
+    Storage of the orders and of the archived orders; order_number is unique.
+    """
+
+    @abstractmethod
+    async def insert(self, order: Order) -> Order: ...
+
+    @abstractmethod
+    async def insert_many(self, orders: list) -> dict:
+        """
+        Insert several orders; a failing order does not stop the others.
+
+        Returns:
+            dict: {position in orders: error message} for the orders that
+            were not inserted
+        """
+
+    @abstractmethod
+    async def update(
+        self, order_id: ObjectId, values: dict, expected_status: Optional[str] = None
+    ) -> Optional[dict]:
+        """
+        $set values on an order, only if it is in expected_status when given.
+
+        Returns:
+            dict: user_id, price and status of the order before the update,
+            or None if not found (or not in expected_status)
+        """
+
+    @abstractmethod
+    async def update_statuses(
+        self, expected: dict, status: str, updated_at: datetime
+    ) -> set:
+        """
+        Move orders to status, each only if it is still in its expected status.
+
+        Args:
+            expected: {order id: status the order was validated against}
+            status: New status
+            updated_at: New item_updated_at (millisecond precision)
+
+        Returns:
+            set: IDs of the orders that were updated
+        """
+
+    @abstractmethod
+    async def find_by_id(
+        self,
+        order_id: ObjectId,
+        fields: Optional[list] = None,
+        include_archived: bool = True,
+    ) -> Optional[dict]: ...
+
+    @abstractmethod
+    async def find_many(
+        self,
+        ids: list,
+        fields: Optional[list] = None,
+        user_id: Optional[ObjectId] = None,
+        include_archived: bool = False,
+    ) -> dict:
+        """
+        Return {id: document} for the orders found, only those of user_id
+        when it is given.
+        """
+
+    @abstractmethod
+    async def find_by_user(
+        self,
+        user_id: ObjectId,
+        fields: Optional[list] = None,
+        include_archived: bool = True,
+    ) -> list:
+        """
+        Return every order of a user, newest first.
+        """
+
+    @abstractmethod
+    async def find_id_by_number(self, order_number: int) -> Optional[ObjectId]: ...
+
+    @abstractmethod
+    async def max_order_number(self) -> int:
+        """
+        Return the highest order_number in use, archived orders included
+        (0 without orders).
+        """
+
+    @abstractmethod
+    async def list_page(
+        self, skip: int, limit: int, fields: Optional[list] = None
+    ) -> tuple:
+        """
+        Return (page of the orders newest first, total number of orders).
+        """
+
+    @abstractmethod
+    async def list_by_user(
+        self,
+        user_id: ObjectId,
+        filters: dict,
+        after: Optional[tuple],
+        limit: int,
+        fields: Optional[list] = None,
+        include_archived: bool = True,
+    ) -> list:
+        """
+        Return one keyset page of the orders of a user, newest first.
+
+        Args:
+            filters: statuses, created_from, created_to, min_price, max_price
+            after: (item_created_at, _id) of the last order of the previous page
+        """
+
+    @abstractmethod
+    async def search_text(
+        self,
+        user_id: ObjectId,
+        text: str,
+        skip: int,
+        limit: int,
+        fields: Optional[list] = None,
+    ) -> list:
+        """
+        Full-text search over item_name and item_list, most relevant first;
+        each document carries its relevance "score".
+        """
+
+    @abstractmethod
+    async def search_prefix(
+        self,
+        user_id: ObjectId,
+        prefix: str,
+        skip: int,
+        limit: int,
+        fields: Optional[list] = None,
+    ) -> list:
+        """
+        Case-insensitive item_name prefix search, ordered by item name.
+        """
+
+    @abstractmethod
+    def iterate(
+        self,
+        user_id: Optional[ObjectId],
+        after: Optional[ObjectId],
+        batch_size: int,
+        include_archived: bool = False,
+    ) -> AsyncIterator[dict]:
+        """
+        Iterate over the orders in _id order, starting after the given _id;
+        archived orders are merged in when include_archived is True.
+        """
+
+    @abstractmethod
+    async def delete(self, order_id: ObjectId) -> Optional[dict]:
+        """
+        Delete an order, archived or not.
+
+        Returns:
+            dict: user_id, price and status of the deleted order, or None
+        """
+
+
+class OrderAnalyticsRepository(ABC):
+    """
+    Order statistics of a user, archived orders included.
+
+    created_from / created_to limit the orders counted to an inclusive
+    item_created_at range. Cancelled orders are counted but add nothing to
+    total_spent and revenue.
+    """
+
+    @abstractmethod
+    async def totals(
+        self,
+        user_id: ObjectId,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+    ) -> dict:
+        """
+        Returns:
+            dict: orders, cancelled_orders, total_spent, first_order_at,
+            last_order_at
+        """
+
+    @abstractmethod
+    async def status_breakdown(
+        self,
+        user_id: ObjectId,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+    ) -> list:
+        """
+        Return one {status, orders, total_price} row per status, by status.
+        """
+
+    @abstractmethod
+    async def daily_revenue(
+        self,
+        user_id: ObjectId,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        timezone: str = "UTC",
+    ) -> list:
+        """
+        Return one {date, orders, revenue, statuses} row per day of
+        item_created_at in timezone, oldest first.
+        """
+
+
+class OrderArchiveRepository(ABC):
+    """
+    Moves orders from the orders to the archive.
+    """
+
+    @abstractmethod
+    async def archive(self, cutoff: datetime, batch_size: int) -> int:
+        """
+        Move the orders in a final status not updated since cutoff.
+
+        Returns:
+            int: Number of orders moved
+        """
+
+
+class CounterRepository(ABC):
+    """
+    Named monotonic counters.
+    """
+
+    @abstractmethod
+    async def reserve(self, name: str, count: int) -> int:
+        """
+        Atomically add count to a counter and return the first reserved number.
+        """
+
+    @abstractmethod
+    async def raise_to(self, name: str, value: int): ...
+
+
+class UserOrderStatsRepository(ABC):
+    """
+    Per-user order summaries.
+    """
+
+    @abstractmethod
+    async def increment(self, user_id: ObjectId, increments: dict):
+        """
+        $inc the summary of a user, creating it if missing.
+        """
+
+    @abstractmethod
+    async def find(self, user_id: ObjectId) -> Optional[dict]: ...
+
+    @abstractmethod
+    async def rebuild(self, user_id: Optional[ObjectId], batch_size: int) -> int:
+        """
+        Recompute summaries from the orders. Summaries incremented by an
+        order write while the rebuild runs are left unchanged.
+
+        Returns:
+            int: Number of summaries written
+        """
+
+
+class IdempotencyRepository(ABC):
+    """
+    Stored responses of the requests sent with an Idempotency-Key.
+    """
+
+    @abstractmethod
+    async def insert(self, record: dict) -> bool:
+        """
+        Insert a record; False if the key already exists.
+        """
+
+    @abstractmethod
+    async def take_over(
+        self, key: str, fingerprint: str, stale_before: datetime, now: datetime
+    ) -> bool:
+        """
+        Re-lock a record still processing since before stale_before.
+        """
+
+    @abstractmethod
+    async def find(self, key: str) -> Optional[dict]: ...
+
+    @abstractmethod
+    async def complete(self, key: str, status_code: int, body: bytes): ...
+
+    @abstractmethod
+    async def release(self, key: str):
+        """
+        Delete a record that is still processing.
+        """
@@ -0,0 +1,693 @@
+"""
+In-Memory Repositories Module
+
+Repositories backed by plain dictionaries of the current process
+(REPOSITORY_BACKEND=memory), so the whole API can run, be load tested and
+be profiled without MongoDB.
+
+- Documents go through a BSON round-trip when written, exactly like with
+  MongoDB: enums become their value, datetimes are truncated to
+  milliseconds, and a value MongoDB could not store raises the same error.
+- Users are indexed by _id and email, orders and archived orders by _id
+  and user_id, and both by order_number; email and order_number are unique.
+- Writes replace the stored document instead of mutating it, so documents
+  already returned to callers never change under them.
+- Each operation runs without awaiting, which makes it atomic on the event
+  loop the same way a single MongoDB write is atomic.
+
+Differences with MongoDB: the text search has no stemming or stop words, and
+order numbers of archived orders stay reserved in the order_number index.
+"""
+
+import asyncio
+import heapq
+import itertools
+import re
+from datetime import datetime, timezone as dt_timezone
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+import bson
+from odmantic import ObjectId
+from odmantic.exceptions import DuplicateKeyError
+from pymongo.errors import DuplicateKeyError as DriverDuplicateKeyError
+
+from core.models.idempotency_model import PROCESSING, COMPLETED
+from core.models.order_model import Order, OrderStatus, ARCHIVABLE_STATUSES
+from core.models.user_model import User
+from core.repositories.base import (
+    CounterRepository,
+    IdempotencyRepository,
+    OrderAnalyticsRepository,
+    OrderArchiveRepository,
+    OrderRepository,
+    UserOrderStatsRepository,
+    UserRepository,
+    ORDER_PROJECTION,
+    STATS_FIELDS,
+    order_projection,
+)
+from core.utils.serializers import build_projection
+
+# Weights of the user_item_text index declared on Order
+TEXT_SEARCH_WEIGHTS = {"item_name": 3, "item_list": 1}
+
+SUMMARY_FIELDS = ("user_id", "price", "status")
+
+
+def _to_document(value: dict) -> dict:
+    # Same encoding as a MongoDB write
+    return bson.decode(bson.encode(value))
+
+
+def _project(document: dict, projection: dict) -> dict:
+    projected = {"_id": document["_id"]}
+    for field in projection:
+        if field in document:
+            projected[field] = document[field]
+    return projected
+
+
+def _duplicate_key(collection: str, index: str, key: dict) -> DriverDuplicateKeyError:
+    return DriverDuplicateKeyError(
+        f"E11000 duplicate key error collection: {collection} "
+        f"index: {index} dup key: {key}",
+        11000,
+    )
+
+
+def _newest_first(document: dict) -> tuple:
+    return document["item_created_at"], document["_id"]
+
+
+def _words(text: str) -> list:
+    return re.findall(r"\w+", text.lower())
+
+
+def _cancelled(document: dict) -> bool:
+    return document["status"] == OrderStatus.CANCELLED.value
+
+
+def _revenue(document: dict) -> float:
+    # Cancelled orders are not counted as spent / revenue
+    return 0.0 if _cancelled(document) else document["price"]
+
+
+def _remove(orders: dict, by_user: dict, order_id: ObjectId) -> dict:
+    # Remove an order from a collection and its user_id index
+    document = orders.pop(order_id)
+    user_orders = by_user[document["user_id"]]
+    del user_orders[order_id]
+    if not user_orders:
+        del by_user[document["user_id"]]
+    return document
+
+
+class InMemoryStore:
+    """
+    Collections of the in-memory backend, shared by its repositories.
+    """
+
+    def __init__(self):
+        self.counters = {}
+        self.reset()
+
+    def reset(self):
+        """
+        Drop every document.
+
+        Counters are kept: the order number blocks already reserved by this
+        process stay unique.
+        """
+        self.users = {}
+        self.users_by_email = {}
+        self.orders = {}
+        self.orders_by_user = {}
+        self.orders_by_number = {}
+        self.orders_archive = {}
+        self.archive_by_user = {}
+        self.user_order_stats = {}
+        self.idempotency_keys = {}
+
+    def user_orders(self, user_id: ObjectId, include_archived: bool = False) -> list:
+        """
+        Return the orders of a user, and its archived orders if asked.
+        """
+        orders = [self.orders[id] for id in self.orders_by_user.get(user_id, ())]
+        if include_archived:
+            # An order being archived is in both collections for a moment
+            # with MongoDB: the copy in orders is kept, like its merges do
+            archive = self.orders_archive
+            orders += [
+                archive[id]
+                for id in self.archive_by_user.get(user_id, ())
+                if id not in self.orders
+            ]
+        return orders
+
+    def stats(self) -> dict:
+        return {
+            "users": len(self.users),
+            "orders": len(self.orders),
+            "orders_archive": len(self.orders_archive),
+            "counters": len(self.counters),
+            "user_order_stats": len(self.user_order_stats),
+            "idempotency_keys": len(self.idempotency_keys),
+        }
+
+
+memory_store = InMemoryStore()
+
+
+class MemoryUserRepository(UserRepository):
+    def __init__(self, store: InMemoryStore):
+        self.store = store
+
+    async def insert(self, user: User) -> User:
+        document = _to_document(user.model_dump_doc())
+        if document["email"] in self.store.users_by_email:
+            raise DuplicateKeyError(
+                user, _duplicate_key("users", "email_1", {"email": document["email"]})
+            )
+        self.store.users[document["_id"]] = document
+        self.store.users_by_email[document["email"]] = document["_id"]
+        return user
+
+    async def find_by_id(
+        self, user_id: ObjectId, fields: Optional[list] = None
+    ) -> Optional[dict]:
+        document = self.store.users.get(user_id)
+        if document is None or not fields:
+            return document
+        return _project(document, build_projection(fields))
+
+    async def find_by_email(self, email: str) -> Optional[dict]:
+        user_id = self.store.users_by_email.get(email)
+        return self.store.users.get(user_id) if user_id is not None else None
+
+    def _update(self, document: Optional[dict], values: dict) -> bool:
+        if document is None:
+            return False
+        updated = {**document, **_to_document(values)}
+        if updated == document:
+            return False
+        email, previous_email = updated["email"], document["email"]
+        if email != previous_email:
+            if email in self.store.users_by_email:
+                raise _duplicate_key("users", "email_1", {"email": email})
+            del self.store.users_by_email[previous_email]
+            self.store.users_by_email[email] = updated["_id"]
+        self.store.users[updated["_id"]] = updated
+        return True
+
+    async def update(self, user_id: ObjectId, values: dict) -> bool:
+        return self._update(self.store.users.get(user_id), values)
+
+    async def update_by_email(self, email: str, values: dict) -> bool:
+        return self._update(await self.find_by_email(email), values)
+
+    async def delete(self, user_id: ObjectId) -> Optional[dict]:
+        document = self.store.users.pop(user_id, None)
+        if document is None:
+            return None
+        del self.store.users_by_email[document["email"]]
+        return {"_id": user_id, "email": document["email"]}
+
+
+class MemoryOrderRepository(OrderRepository):
+    def __init__(self, store: InMemoryStore):
+        self.store = store
+
+    def _add(self, order: Order):
+        document = _to_document(order.model_dump_doc())
+        number = document["order_number"]
+        if number in self.store.orders_by_number:
+            raise _duplicate_key("orders", "order_number_1", {"order_number": number})
+        if document["_id"] in self.store.orders:
+            raise _duplicate_key("orders", "_id_", {"_id": document["_id"]})
+        self.store.orders[document["_id"]] = document
+        self.store.orders_by_user.setdefault(document["user_id"], {})[
+            document["_id"]
+        ] = None
+        self.store.orders_by_number[number] = document["_id"]
+
+    async def insert(self, order: Order) -> Order:
+        try:
+            self._add(order)
+        except DriverDuplicateKeyError as error:
+            raise DuplicateKeyError(order, error)
+        return order
+
+    async def insert_many(self, orders: list) -> dict:
+        failed = {}
+        for position, order in enumerate(orders):
+            try:
+                self._add(order)
+            except Exception as error:
+                failed[position] = str(error)
+        return failed
+
+    async def update(
+        self, order_id: ObjectId, values: dict, expected_status: Optional[str] = None
+    ) -> Optional[dict]:
+        document = self.store.orders.get(order_id)
+        if document is None or expected_status not in (None, document["status"]):
+            return None
+        self.store.orders[order_id] = {**document, **_to_document(values)}
+        return _project(document, SUMMARY_FIELDS)
+
+    async def update_statuses(
+        self, expected: dict, status: str, updated_at: datetime
+    ) -> set:
+        values = _to_document({"status": status, "item_updated_at": updated_at})
+        applied = set()
+        for order_id, previous in expected.items():
+            document = self.store.orders.get(order_id)
+            if document is not None and document["status"] == previous:
+                self.store.orders[order_id] = {**document, **values}
+                applied.add(order_id)
+        return applied
+
+    async def find_by_id(
+        self,
+        order_id: ObjectId,
+        fields: Optional[list] = None,
+        include_archived: bool = True,
+    ) -> Optional[dict]:
+        document = self.store.orders.get(order_id)
+        if document is None and include_archived:
+            document = self.store.orders_archive.get(order_id)
+        return _project(document, order_projection(fields)) if document else None
+
+    async def find_many(
+        self,
+        ids: list,
+        fields: Optional[list] = None,
+        user_id: Optional[ObjectId] = None,
+        include_archived: bool = False,
+    ) -> dict:
+        projection = order_projection(fields)
+        found = {}
+        for id in ids:
+            document = self.store.orders.get(id)
+            if document is None and include_archived:
+                document = self.store.orders_archive.get(id)
+            if document is not None and user_id in (None, document["user_id"]):
+                found[id] = _project(document, projection)
+        return found
+
+    async def find_by_user(
+        self,
+        user_id: ObjectId,
+        fields: Optional[list] = None,
+        include_archived: bool = True,
+    ) -> list:
+        projection = order_projection([*fields, "item_created_at"] if fields else None)
+        documents = sorted(
+            self.store.user_orders(user_id, include_archived),
+            key=_newest_first,
+            reverse=True,
+        )
+        return [_project(document, projection) for document in documents]
+
+    async def find_id_by_number(self, order_number: int) -> Optional[ObjectId]:
+        return self.store.orders_by_number.get(order_number)
+
+    async def max_order_number(self) -> int:
+        # orders_by_number also indexes the archived orders
+        return max(self.store.orders_by_number, default=0)
+
+    async def list_page(
+        self, skip: int, limit: int, fields: Optional[list] = None
+    ) -> tuple:
+        projection = order_projection(fields)
+        documents = heapq.nlargest(
+            skip + limit, self.store.orders.values(), key=_newest_first
+        )
+        page = [_project(document, projection) for document in documents[skip:]]
+        return page, len(self.store.orders)
+
+    async def list_by_user(
+        self,
+        user_id: ObjectId,
+        filters: dict,
+        after: Optional[tuple],
+        limit: int,
+        fields: Optional[list] = None,
+        include_archived: bool = True,
+    ) -> list:
+        statuses = filters.get("statuses")
+        statuses = {OrderStatus(value).value for value in statuses or ()}
+        created_from, created_to = filters.get("created_from"), filters.get(
+            "created_to"
+        )
+        min_price, max_price = filters.get("min_price"), filters.get("max_price")
+
+        def matches(document: dict) -> bool:
+            return (
+                (not statuses or document["status"] in statuses)
+                and (
+                    created_from is None or document["item_created_at"] >= created_from
+                )
+                and (created_to is None or document["item_created_at"] <= created_to)
+                and (min_price is None or document["price"] >= min_price)
+                and (max_price is None or document["price"] <= max_price)
+                # Keyset: strictly after (created_at, id) in descending order
+                and (after is None or _newest_first(document) < after)
+            )
+
+        projection = order_projection([*fields, "item_created_at"] if fields else None)
+        documents = heapq.nlargest(
+            limit,
+            filter(matches, self.store.user_orders(user_id, include_archived)),
+            key=_newest_first,
+        )
+        return [_project(document, projection) for document in documents]
+
+    async def search_text(
+        self,
+        user_id: ObjectId,
+        text: str,
+        skip: int,
+        limit: int,
+        fields: Optional[list] = None,
+    ) -> list:
+        # $text syntax: "phrases" must all be present, -words must not be,
+        # and at least one word or phrase must match
+        phrases = [phrase.lower() for phrase in re.findall(r'"([^"]*)"', text)]
+        rest = re.sub(r'"[^"]*"', " ", text).split()
+        excluded = {
+            word for term in rest if term.startswith("-") for word in _words(term)
+        }
+        terms = {
+            word for term in rest if not term.startswith("-") for word in _words(term)
+        }
+        terms.update(word for phrase in phrases for word in _words(phrase))
+
+        results = []
+        for document in self.store.user_orders(user_id):
+            contents = {
+                "item_name": document["item_name"],
+                "item_list": " ".join(str(item) for item in document["item_list"]),
+            }
+            words = {field: _words(value) for field, value in contents.items()}
+            everything = " ".join(contents.values()).lower()
+            if any(phrase not in everything for phrase in phrases):
+                continue
+            if excluded.intersection(_words(everything)):
+                continue
+            score = float(
+                sum(
+                    TEXT_SEARCH_WEIGHTS[field]
+                    * sum(1 for word in field_words if word in terms)
+                    for field, field_words in words.items()
+                )
+            )
+            if score:
+                results.append((score, document))
+
+        results.sort(key=lambda result: (result[0], result[1]["_id"]), reverse=True)
+        projection = order_projection(fields)
+        return [
+            {**_project(document, projection), "score": score}
+            for score, document in results[skip : skip + limit]
+        ]
+
+    async def search_prefix(
+        self,
+        user_id: ObjectId,
+        prefix: str,
+        skip: int,
+        limit: int,
+        fields: Optional[list] = None,
+    ) -> list:
+        prefix = prefix.lower()
+        documents = sorted(
+            (
+                document
+                for document in self.store.user_orders(user_id)
+                if document["item_name_lower"].startswith(prefix)
+            ),
+            key=lambda document: (document["item_name_lower"], document["_id"]),
+        )
+        projection = order_projection(fields)
+        return [_project(document, projection) for document in documents[skip:][:limit]]
+
+    async def iterate(
+        self,
+        user_id: Optional[ObjectId],
+        after: Optional[ObjectId],
+        batch_size: int,
+        include_archived: bool = False,
+    ):
+        sources = [(self.store.orders, self.store.orders_by_user)]
+        if include_archived:
+            sources.append((self.store.orders_archive, self.store.archive_by_user))
+        ids = []
+        for orders, by_user in sources:
+            ids += orders if user_id is None else by_user.get(user_id, ())
+        ids = sorted({id for id in ids if after is None or id > after})
+        for position, id in enumerate(ids, 1):
+            document = self.store.orders.get(id)
+            if document is None and include_archived:
+                document = self.store.orders_archive.get(id)
+            if document is not None:
+                yield _project(document, ORDER_PROJECTION)
+            if position % batch_size == 0:
+                # Let other requests run between two batches
+                await asyncio.sleep(0)
+
+    async def delete(self, order_id: ObjectId) -> Optional[dict]:
+        if order_id in self.store.orders:
+            document = _remove(self.store.orders, self.store.orders_by_user, order_id)
+        elif order_id in self.store.orders_archive:
+            # Archived orders are read-only but can still be deleted
+            document = _remove(
+                self.store.orders_archive, self.store.archive_by_user, order_id
+            )
+        else:
+            return None
+        del self.store.orders_by_number[document["order_number"]]
+        return _project(document, SUMMARY_FIELDS)
+
+
+class MemoryOrderAnalyticsRepository(OrderAnalyticsRepository):
+    def __init__(self, store: InMemoryStore):
+        self.store = store
+
+    def _orders(
+        self,
+        user_id: ObjectId,
+        created_from: Optional[datetime],
+        created_to: Optional[datetime],
+    ) -> list:
+        return [
+            document
+            for document in self.store.user_orders(user_id, include_archived=True)
+            if (created_from is None or document["item_created_at"] >= created_from)
+            and (created_to is None or document["item_created_at"] <= created_to)
+        ]
+
+    async def totals(
+        self,
+        user_id: ObjectId,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+    ) -> dict:
+        documents = self._orders(user_id, created_from, created_to)
+        created = [document["item_created_at"] for document in documents]
+        return {
+            "orders": len(documents),
+            "cancelled_orders": sum(
+                1 for document in documents if _cancelled(document)
+            ),
+            "total_spent": sum(map(_revenue, documents), 0.0),
+            "first_order_at": min(created, default=None),
+            "last_order_at": max(created, default=None),
+        }
+
+    async def status_breakdown(
+        self,
+        user_id: ObjectId,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+    ) -> list:
+        rows = {}
+        for document in self._orders(user_id, created_from, created_to):
+            row = rows.setdefault(
+                document["status"],
+                {"status": document["status"], "orders": 0, "total_price": 0.0},
+            )
+            row["orders"] += 1
+            row["total_price"] += document["price"]
+        return [rows[status] for status in sorted(rows)]
+
+    async def daily_revenue(
+        self,
+        user_id: ObjectId,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        timezone: str = "UTC",
+    ) -> list:
+        zone = ZoneInfo(timezone)
+        rows = {}
+        for document in self._orders(user_id, created_from, created_to):
+            created_at = document["item_created_at"].replace(tzinfo=dt_timezone.utc)
+            date = created_at.astimezone(zone).strftime("%Y-%m-%d")
+            row = rows.setdefault(
+                date, {"date": date, "orders": 0, "revenue": 0.0, "statuses": {}}
+            )
+            row["orders"] += 1
+            row["revenue"] += _revenue(document)
+            statuses = row["statuses"]
+            statuses[document["status"]] = statuses.get(document["status"], 0) + 1
+        return [rows[date] for date in sorted(rows)]
+
+
+class MemoryOrderArchiveRepository(OrderArchiveRepository):
+    def __init__(self, store: InMemoryStore):
+        self.store = store
+
+    def _archivable(self, document: Optional[dict], cutoff: datetime) -> bool:
+        return (
+            document is not None
+            and document["status"] in ARCHIVABLE_STATUSES
+            and document["item_updated_at"] < cutoff
+        )
+
+    async def archive(self, cutoff: datetime, batch_size: int) -> int:
+        candidates = sorted(
+            (
+                document
+                for document in self.store.orders.values()
+                if self._archivable(document, cutoff)
+            ),
+            key=lambda document: document["item_updated_at"],
+        )
+        moved = 0
+        for position, candidate in enumerate(candidates, 1):
+            # Checked again: the order may have changed since the last batch
+            order_id = candidate["_id"]
+            if self._archivable(self.store.orders.get(order_id), cutoff):
+                document = _remove(
+                    self.store.orders, self.store.orders_by_user, order_id
+                )
+                self.store.orders_archive[order_id] = document
+                self.store.archive_by_user.setdefault(document["user_id"], {})[
+                    order_id
+                ] = None
+                moved += 1
+            if position % batch_size == 0:
+                # Let other requests run between two batches
+                await asyncio.sleep(0)
+        return moved
+
+
+class MemoryCounterRepository(CounterRepository):
+    def __init__(self, store: InMemoryStore):
+        self.store = store
+
+    async def reserve(self, name: str, count: int) -> int:
+        value = self.store.counters.get(name, 0) + count
+        self.store.counters[name] = value
+        return value - count + 1
+
+    async def raise_to(self, name: str, value: int):
+        self.store.counters[name] = max(self.store.counters.get(name, 0), value)
+
+
+class MemoryUserOrderStatsRepository(UserOrderStatsRepository):
+    def __init__(self, store: InMemoryStore):
+        self.store = store
+
+    async def increment(self, user_id: ObjectId, increments: dict):
+        summary = dict(self.store.user_order_stats.get(user_id, {"_id": user_id}))
+        for field, value in increments.items():
+            summary[field] = summary.get(field, 0) + value
+        summary["updated_at"] = datetime.utcnow()
+        self.store.user_order_stats[user_id] = _to_document(summary)
+
+    async def find(self, user_id: ObjectId) -> Optional[dict]:
+        summary = self.store.user_order_stats.get(user_id)
+        return _project(summary, STATS_FIELDS) if summary else None
+
+    async def rebuild(self, user_id: Optional[ObjectId], batch_size: int) -> int:
+        rows = {}
+        documents = itertools.chain(
+            self.store.orders.values(), self.store.orders_archive.values()
+        )
+        for document in documents:
+            owner = document["user_id"]
+            if user_id is not None and owner != user_id:
+                continue
+            row = rows.setdefault(
+                owner,
+                {"_id": owner, "orders": 0, "cancelled_orders": 0, "total_spent": 0.0},
+            )
+            row["orders"] += 1
+            row["cancelled_orders"] += _cancelled(document)
+            row["total_spent"] += _revenue(document)
+
+        # Summaries of users that no longer have orders are removed
+        stale = [user_id] if user_id is not None else list(self.store.user_order_stats)
+        for owner in stale:
+            if owner not in rows:
+                self.store.user_order_stats.pop(owner, None)
+        for owner, row in rows.items():
+            row["updated_at"] = datetime.utcnow()
+            self.store.user_order_stats[owner] = _to_document(row)
+        return len(rows)
+
+
+class MemoryIdempotencyRepository(IdempotencyRepository):
+    def __init__(self, store: InMemoryStore):
+        self.store = store
+
+    def _get(self, key: str) -> Optional[dict]:
+        record = self.store.idempotency_keys.get(key)
+        if record is not None and record["expires_at"] <= datetime.utcnow():
+            # Removed by the TTL index in MongoDB
+            del self.store.idempotency_keys[key]
+            return None
+        return record
+
+    async def insert(self, record: dict) -> bool:
+        if self._get(record["_id"]) is not None:
+            return False
+        self.store.idempotency_keys[record["_id"]] = _to_document(record)
+        return True
+
+    async def take_over(
+        self, key: str, fingerprint: str, stale_before: datetime, now: datetime
+    ) -> bool:
+        record = self._get(key)
+        if (
+            record is None
+            or record["fingerprint"] != fingerprint
+            or record["state"] != PROCESSING
+            or record["locked_at"] >= stale_before
+        ):
+            return False
+        self.store.idempotency_keys[key] = {
+            **record,
+            **_to_document({"locked_at": now}),
+        }
+        return True
+
+    async def find(self, key: str) -> Optional[dict]:
+        return self._get(key)
+
+    async def complete(self, key: str, status_code: int, body: bytes):
+        record = self._get(key)
+        if record is not None:
+            self.store.idempotency_keys[key] = {
+                **record,
+                **_to_document(
+                    {"state": COMPLETED, "status_code": status_code, "body": body}
+                ),
+            }
+
+    async def release(self, key: str):
+        record = self._get(key)
+        if record is not None and record["state"] == PROCESSING:
+            del self.store.idempotency_keys[key]
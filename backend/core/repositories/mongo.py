@@ -0,0 +1,811 @@
+"""
+MongoDB Repositories Module
+
+Repositories backed by the shared ODMantic engine (core.database). Orders
+moved by the archival job are read from, deleted in, and counted by the
+analytics from the orders_archive collection as well.
+"""
+
+import asyncio
+import heapq
+import itertools
+import re
+from datetime import datetime
+from typing import Optional
+
+from odmantic import AIOEngine, ObjectId
+from pymongo import ReplaceOne, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError
+from pymongo.errors import DuplicateKeyError as DriverDuplicateKeyError
+
+from core import logger
+from core.models.counter_model import Counter
+from core.models.idempotency_model import IdempotencyRecord, PROCESSING, COMPLETED
+from core.models.order_model import (
+    Order,
+    OrderStatus,
+    ORDERS_ARCHIVE_COLLECTION,
+    ARCHIVABLE_STATUSES,
+)
+from core.models.user_model import User
+from core.models.user_order_stats_model import UserOrderStats
+from core.repositories.base import (
+    CounterRepository,
+    IdempotencyRepository,
+    OrderAnalyticsRepository,
+    OrderArchiveRepository,
+    OrderRepository,
+    UserOrderStatsRepository,
+    UserRepository,
+    ORDER_PROJECTION,
+    STATS_FIELDS,
+    order_projection,
+)
+from core.utils.serializers import build_projection
+
+logging = logger(__name__)
+
+# Keyset order of per-user listings, served by the indexes declared on Order
+USER_ORDERS_SORT = [("item_created_at", -1), ("_id", -1)]
+
+# Order search: relevance order of the user_item_text index, and the
+# alphabetical order of the user_item_name_prefix index
+TEXT_SEARCH_SCORE = {"$meta": "textScore"}
+TEXT_SEARCH_SORT = [("score", TEXT_SEARCH_SCORE), ("_id", -1)]
+PREFIX_SEARCH_SORT = [("item_name_lower", 1), ("_id", 1)]
+PREFIX_SEARCH_INDEX = "user_item_name_prefix"
+
+# Fields an order write needs to maintain the summary of its owner
+SUMMARY_PROJECTION = {"user_id": 1, "price": 1, "status": 1}
+
+# Every field read by the analytics pipelines (user_id, status,
+# item_created_at, price) is part of this index, so the aggregations run as
+# covered index scans without fetching the order documents
+ANALYTICS_INDEX = "user_status_created_price"
+
+# Cancelled orders are not counted as spent / revenue
+CANCELLED = {"$eq": ["$status", OrderStatus.CANCELLED.value]}
+REVENUE_PRICE = {"$cond": [CANCELLED, 0.0, "$price"]}
+
+
+def build_user_orders_query(
+    user_id: str,
+    statuses: list | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    min_price: float | None = None,
+    max_price: float | None = None,
+    after: tuple | None = None,
+) -> dict:
+    """
+    Build the filter of a per-user order listing.
+
+    Args:
+        user_id: Owner of the orders
+        statuses: Only return orders in one of these statuses
+        created_from / created_to: Inclusive item_created_at range
+        min_price / max_price: Inclusive price range
+        after: (item_created_at, _id) of the last order of the previous page
+    """
+    query = {"user_id": ObjectId(user_id)}
+    if statuses:
+        values = [OrderStatus(value).value for value in statuses]
+        query["status"] = values[0] if len(values) == 1 else {"$in": values}
+    if after is not None:
+        # Keyset: strictly after (created_at, id) in descending order. The
+        # upper bound stays a plain index range; the tie on created_at is
+        # resolved by $nor instead of an $or that would split the plan.
+        created_at, id = after
+        created_to = created_at if created_to is None else min(created_to, created_at)
+        query["$nor"] = [{"item_created_at": created_at, "_id": {"$gte": id}}]
+    created = {}
+    if created_from is not None:
+        created["$gte"] = created_from
+    if created_to is not None:
+        created["$lte"] = created_to
+    if created:
+        query["item_created_at"] = created
+    price = {}
+    if min_price is not None:
+        price["$gte"] = min_price
+    if max_price is not None:
+        price["$lte"] = max_price
+    if price:
+        query["price"] = price
+    return query
+
+
+def _may_be_archived(query: dict) -> bool:
+    # Only orders in a final status are archived: a status filter without
+    # them never needs the archive
+    status = query.get("status")
+    if status is None:
+        return True
+    values = status["$in"] if isinstance(status, dict) else [status]
+    return any(value in ARCHIVABLE_STATUSES for value in values)
+
+
+def _unique(documents):
+    # Drop the second copy of an order being archived (copied to the archive,
+    # not yet deleted from orders): in a merge by _id the copies are adjacent
+    previous = None
+    for document in documents:
+        if document["_id"] != previous:
+            yield document
+        previous = document["_id"]
+
+
+def _merge_newest_first(*pages: list, limit: int | None = None) -> list:
+    # Merge lists already sorted by USER_ORDERS_SORT
+    merged = heapq.merge(
+        *pages,
+        key=lambda document: (document["item_created_at"], document["_id"]),
+        reverse=True,
+    )
+    return list(itertools.islice(_unique(merged), limit))
+
+
+async def _merge_by_id(*cursors):
+    # Merge cursors sorted by _id, each order once (see _unique)
+    heads = []
+    for position, cursor in enumerate(cursors):
+        document = await anext(cursor, None)
+        if document is not None:
+            heads.append((document["_id"], position, document))
+    heapq.heapify(heads)
+    previous = None
+    while heads:
+        id, position, document = heapq.heappop(heads)
+        if id != previous:
+            yield document
+            previous = id
+        following = await anext(cursors[position], None)
+        if following is not None:
+            heapq.heappush(heads, (following["_id"], position, following))
+
+
+class MongoUserRepository(UserRepository):
+    def __init__(self, engine: AIOEngine):
+        self.engine = engine
+
+    def _collection(self):
+        return self.engine.get_collection(User)
+
+    async def insert(self, user: User) -> User:
+        return await self.engine.save(user)
+
+    async def find_by_id(
+        self, user_id: ObjectId, fields: Optional[list] = None
+    ) -> Optional[dict]:
+        projection = build_projection(fields) if fields else None
+        return await self._collection().find_one({"_id": user_id}, projection)
+
+    async def find_by_email(self, email: str) -> Optional[dict]:
+        return await self._collection().find_one({"email": email})
+
+    async def update(self, user_id: ObjectId, values: dict) -> bool:
+        result = await self._collection().update_one({"_id": user_id}, {"$set": values})
+        return result.modified_count > 0
+
+    async def update_by_email(self, email: str, values: dict) -> bool:
+        result = await self._collection().update_one({"email": email}, {"$set": values})
+        return result.modified_count > 0
+
+    async def delete(self, user_id: ObjectId) -> Optional[dict]:
+        return await self._collection().find_one_and_delete(
+            {"_id": user_id}, projection={"email": 1}
+        )
+
+
+class MongoOrderRepository(OrderRepository):
+    def __init__(self, engine: AIOEngine):
+        self.engine = engine
+
+    def _collection(self):
+        return self.engine.get_collection(Order)
+
+    def _archive(self):
+        return self.engine.database[ORDERS_ARCHIVE_COLLECTION]
+
+    async def insert(self, order: Order) -> Order:
+        return await self.engine.save(order)
+
+    async def insert_many(self, orders: list) -> dict:
+        try:
+            # ordered=False: one failing document does not stop the others
+            await self._collection().insert_many(
+                [order.model_dump_doc() for order in orders], ordered=False
+            )
+            return {}
+        except BulkWriteError as error:
+            return {
+                write_error["index"]: write_error.get("errmsg", "Write failed")
+                for write_error in error.details.get("writeErrors", [])
+            }
+
+    async def update(
+        self, order_id: ObjectId, values: dict, expected_status: Optional[str] = None
+    ) -> Optional[dict]:
+        query = {"_id": order_id}
+        if expected_status is not None:
+            query["status"] = expected_status
+        # The previous price/status give the change of the order summary
+        return await self._collection().find_one_and_update(
+            query,
+            {"$set": values},
+            projection=SUMMARY_PROJECTION,
+            return_document=ReturnDocument.BEFORE,
+        )
+
+    async def update_statuses(
+        self, expected: dict, status: str, updated_at: datetime
+    ) -> set:
+        if not expected:
+            return set()
+        collection = self._collection()
+        operations = [
+            UpdateOne(
+                {"_id": order_id, "status": previous},
+                {"$set": {"status": status, "item_updated_at": updated_at}},
+            )
+            for order_id, previous in expected.items()
+        ]
+        result = await collection.bulk_write(operations, ordered=False)
+        if result.matched_count == len(operations):
+            return set(expected)
+        # Find which guarded updates did not match
+        return {
+            document["_id"]
+            async for document in collection.find(
+                {
+                    "_id": {"$in": list(expected)},
+                    "status": status,
+                    "item_updated_at": updated_at,
+                },
+                {"_id": 1},
+            )
+        }
+
+    async def find_by_id(
+        self,
+        order_id: ObjectId,
+        fields: Optional[list] = None,
+        include_archived: bool = True,
+    ) -> Optional[dict]:
+        projection = order_projection(fields)
+        document = await self._collection().find_one({"_id": order_id}, projection)
+        if document is None and include_archived:
+            # The archival job copies before deleting, so a moved order is
+            # always found in one of the two collections
+            document = await self._archive().find_one({"_id": order_id}, projection)
+        return document
+
+    async def find_many(
+        self,
+        ids: list,
+        fields: Optional[list] = None,
+        user_id: Optional[ObjectId] = None,
+        include_archived: bool = False,
+    ) -> dict:
+        projection = order_projection(fields)
+        query = {"_id": {"$in": ids}}
+        if user_id is not None:
+            query["user_id"] = user_id
+        cursor = self._collection().find(query, projection)
+        found = {document["_id"]: document async for document in cursor}
+        missing = [id for id in ids if id not in found]
+        if missing and include_archived:
+            cursor = self._archive().find(
+                {**query, "_id": {"$in": missing}}, projection
+            )
+            found.update({document["_id"]: document async for document in cursor})
+        return found
+
+    async def find_by_user(
+        self,
+        user_id: ObjectId,
+        fields: Optional[list] = None,
+        include_archived: bool = True,
+    ) -> list:
+        # item_created_at is needed to merge the archived orders in
+        projection = order_projection([*fields, "item_created_at"] if fields else None)
+
+        async def find(source):
+            cursor = source.find({"user_id": user_id}, projection)
+            return await cursor.sort(USER_ORDERS_SORT).to_list(length=None)
+
+        if not include_archived:
+            return await find(self._collection())
+        hot, archived = await asyncio.gather(
+            find(self._collection()), find(self._archive())
+        )
+        return _merge_newest_first(hot, archived)
+
+    async def find_id_by_number(self, order_number: int) -> Optional[ObjectId]:
+        query = {"order_number": order_number}
+        document = await self._collection().find_one(query, {"_id": 1})
+        if document is None:
+            document = await self._archive().find_one(query, {"_id": 1})
+        return document["_id"] if document else None
+
+    async def max_order_number(self) -> int:
+        # Orders created before server-side allocation carry client-supplied
+        # numbers, and the highest one may already be archived
+        latest = await asyncio.gather(
+            *(
+                collection.find_one(
+                    {}, {"order_number": 1}, sort=[("order_number", -1)]
+                )
+                for collection in (self._collection(), self._archive())
+            )
+        )
+        return max(
+            (document["order_number"] for document in latest if document), default=0
+        )
+
+    async def list_page(
+        self, skip: int, limit: int, fields: Optional[list] = None
+    ) -> tuple:
+        collection = self._collection()
+        cursor = (
+            collection.find({}, order_projection(fields))
+            .sort("item_created_at", -1)
+            .skip(skip)
+            .limit(limit)
+        )
+        orders = await cursor.to_list(length=limit)
+        total = await collection.count_documents({})
+        return orders, total
+
+    async def list_by_user(
+        self,
+        user_id: ObjectId,
+        filters: dict,
+        after: Optional[tuple],
+        limit: int,
+        fields: Optional[list] = None,
+        include_archived: bool = True,
+    ) -> list:
+        query = build_user_orders_query(user_id, after=after, **filters)
+        # item_created_at is always read to build the next cursor
+        projection = order_projection([*fields, "item_created_at"] if fields else None)
+
+        async def page(source):
+            cursor = source.find(query, projection).sort(USER_ORDERS_SORT)
+            return await cursor.limit(limit).to_list(length=limit)
+
+        if not include_archived or not _may_be_archived(query):
+            return await page(self._collection())
+        # The same query and keyset run on both collections
+        hot, archived = await asyncio.gather(
+            page(self._collection()), page(self._archive())
+        )
+        return _merge_newest_first(hot, archived, limit=limit)
+
+    async def search_text(
+        self,
+        user_id: ObjectId,
+        text: str,
+        skip: int,
+        limit: int,
+        fields: Optional[list] = None,
+    ) -> list:
+        projection = {**order_projection(fields), "score": TEXT_SEARCH_SCORE}
+        cursor = (
+            self._collection()
+            .find({"user_id": user_id, "$text": {"$search": text}}, projection)
+            .sort(TEXT_SEARCH_SORT)
+            .skip(skip)
+            .limit(limit)
+        )
+        return await cursor.to_list(length=limit)
+
+    async def search_prefix(
+        self,
+        user_id: ObjectId,
+        prefix: str,
+        skip: int,
+        limit: int,
+        fields: Optional[list] = None,
+    ) -> list:
+        query = {
+            "user_id": user_id,
+            # Anchored and case-sensitive on the lower-cased copy, so the
+            # regex is turned into an index range
+            "item_name_lower": {"$regex": f"^{re.escape(prefix.lower())}"},
+        }
+        cursor = (
+            self._collection()
+            .find(query, order_projection(fields))
+            .sort(PREFIX_SEARCH_SORT)
+            .hint(PREFIX_SEARCH_INDEX)
+            .skip(skip)
+            .limit(limit)
+        )
+        return await cursor.to_list(length=limit)
+
+    async def iterate(
+        self,
+        user_id: Optional[ObjectId],
+        after: Optional[ObjectId],
+        batch_size: int,
+        include_archived: bool = False,
+    ):
+        query = {}
+        if user_id is not None:
+            query["user_id"] = user_id
+        if after is not None:
+            query["_id"] = {"$gt": after}
+        sources = [self._collection()]
+        if include_archived:
+            sources.append(self._archive())
+        cursors = [
+            source.find(query, ORDER_PROJECTION).sort("_id", 1).batch_size(batch_size)
+            for source in sources
+        ]
+        try:
+            if len(cursors) == 1:
+                async for document in cursors[0]:
+                    yield document
+            else:
+                async for document in _merge_by_id(*cursors):
+                    yield document
+        finally:
+            for cursor in cursors:
+                await cursor.close()
+
+    async def delete(self, order_id: ObjectId) -> Optional[dict]:
+        deleted = await self._collection().find_one_and_delete(
+            {"_id": order_id}, projection=SUMMARY_PROJECTION
+        )
+        if deleted is None:
+            # Archived orders are read-only but can still be deleted
+            deleted = await self._archive().find_one_and_delete(
+                {"_id": order_id}, projection=SUMMARY_PROJECTION
+            )
+        return deleted
+
+
+class MongoOrderAnalyticsRepository(OrderAnalyticsRepository):
+    """
+    Each pipeline starts with a $match on user_id (and the optional
+    item_created_at range), adds the matching archived orders with
+    $unionWith and only returns the aggregated rows.
+    """
+
+    def __init__(self, engine: AIOEngine):
+        self.engine = engine
+
+    @staticmethod
+    def _match(
+        user_id: ObjectId,
+        created_from: Optional[datetime],
+        created_to: Optional[datetime],
+    ) -> dict:
+        match = {"user_id": user_id}
+        created = {}
+        if created_from is not None:
+            created["$gte"] = created_from
+        if created_to is not None:
+            created["$lte"] = created_to
+        if created:
+            match["item_created_at"] = created
+        return {"$match": match}
+
+    async def _aggregate(self, pipeline: list) -> list:
+        match = pipeline[0]
+        pipeline = [
+            match,
+            {"$unionWith": {"coll": ORDERS_ARCHIVE_COLLECTION, "pipeline": [match]}},
+            *pipeline[1:],
+        ]
+        collection = self.engine.get_collection(Order)
+        cursor = collection.aggregate(pipeline, hint=ANALYTICS_INDEX)
+        return await cursor.to_list(length=None)
+
+    async def totals(
+        self,
+        user_id: ObjectId,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+    ) -> dict:
+        rows = await self._aggregate(
+            [
+                self._match(user_id, created_from, created_to),
+                {
+                    "$group": {
+                        "_id": None,
+                        "orders": {"$sum": 1},
+                        "cancelled_orders": {"$sum": {"$cond": [CANCELLED, 1, 0]}},
+                        "total_spent": {"$sum": REVENUE_PRICE},
+                        "first_order_at": {"$min": "$item_created_at"},
+                        "last_order_at": {"$max": "$item_created_at"},
+                    }
+                },
+            ]
+        )
+        if not rows:
+            return {
+                "orders": 0,
+                "cancelled_orders": 0,
+                "total_spent": 0.0,
+                "first_order_at": None,
+                "last_order_at": None,
+            }
+        rows[0].pop("_id")
+        return rows[0]
+
+    async def status_breakdown(
+        self,
+        user_id: ObjectId,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+    ) -> list:
+        return await self._aggregate(
+            [
+                self._match(user_id, created_from, created_to),
+                {
+                    "$group": {
+                        "_id": "$status",
+                        "orders": {"$sum": 1},
+                        "total_price": {"$sum": "$price"},
+                    }
+                },
+                {"$sort": {"_id": 1}},
+                {
+                    "$project": {
+                        "_id": 0,
+                        "status": "$_id",
+                        "orders": 1,
+                        "total_price": 1,
+                    }
+                },
+            ]
+        )
+
+    async def daily_revenue(
+        self,
+        user_id: ObjectId,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        timezone: str = "UTC",
+    ) -> list:
+        day = {
+            "$dateToString": {
+                "format": "%Y-%m-%d",
+                "date": "$item_created_at",
+                "timezone": timezone,
+            }
+        }
+        return await self._aggregate(
+            [
+                self._match(user_id, created_from, created_to),
+                {
+                    "$group": {
+                        "_id": {"date": day, "status": "$status"},
+                        "orders": {"$sum": 1},
+                        "revenue": {"$sum": REVENUE_PRICE},
+                    }
+                },
+                {
+                    "$group": {
+                        "_id": "$_id.date",
+                        "orders": {"$sum": "$orders"},
+                        "revenue": {"$sum": "$revenue"},
+                        "statuses": {"$push": {"k": "$_id.status", "v": "$orders"}},
+                    }
+                },
+                {"$sort": {"_id": 1}},
+                {
+                    "$project": {
+                        "_id": 0,
+                        "date": "$_id",
+                        "orders": 1,
+                        "revenue": 1,
+                        "statuses": {"$arrayToObject": "$statuses"},
+                    }
+                },
+            ]
+        )
+
+
+class MongoOrderArchiveRepository(OrderArchiveRepository):
+    """
+    Each batch is copied to the archive first (idempotent upserts), then
+    deleted from orders with the same filter. Reads falling back to the
+    archive therefore always find a moved order, and an interrupted run is
+    simply resumed by the next one.
+    """
+
+    def __init__(self, engine: AIOEngine):
+        self.engine = engine
+
+    async def archive(self, cutoff: datetime, batch_size: int) -> int:
+        orders = self.engine.get_collection(Order)
+        archive = self.engine.database[ORDERS_ARCHIVE_COLLECTION]
+        query = {
+            "status": {"$in": list(ARCHIVABLE_STATUSES)},
+            "item_updated_at": {"$lt": cutoff},
+        }
+
+        moved = 0
+        while True:
+            cursor = orders.find(query).sort("item_updated_at", 1)
+            batch = await cursor.limit(batch_size).to_list(length=batch_size)
+            if not batch:
+                break
+            ids = [document["_id"] for document in batch]
+            await archive.bulk_write(
+                [
+                    ReplaceOne({"_id": document["_id"]}, document, upsert=True)
+                    for document in batch
+                ],
+                ordered=False,
+            )
+            # The filter is repeated: an order updated since it was read
+            # no longer matches and stays in orders
+            await orders.delete_many({"_id": {"$in": ids}, **query})
+            kept = [
+                document["_id"]
+                async for document in orders.find({"_id": {"$in": ids}}, {"_id": 1})
+            ]
+            if kept:
+                await archive.delete_many({"_id": {"$in": kept}})
+            moved += len(ids) - len(kept)
+            logging.info(f"Archived {moved} orders so far")
+        return moved
+
+
+class MongoCounterRepository(CounterRepository):
+    def __init__(self, engine: AIOEngine):
+        self.engine = engine
+
+    async def reserve(self, name: str, count: int) -> int:
+        counter = await self.engine.get_collection(Counter).find_one_and_update(
+            {"_id": name},
+            {"$inc": {"value": count}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        return counter["value"] - count + 1
+
+    async def raise_to(self, name: str, value: int):
+        await self.engine.get_collection(Counter).update_one(
+            {"_id": name}, {"$max": {"value": value}}, upsert=True
+        )
+
+
+class MongoUserOrderStatsRepository(UserOrderStatsRepository):
+    def __init__(self, engine: AIOEngine):
+        self.engine = engine
+
+    async def increment(self, user_id: ObjectId, increments: dict):
+        await self.engine.get_collection(UserOrderStats).update_one(
+            {"_id": user_id},
+            {"$inc": increments, "$set": {"updated_at": datetime.utcnow()}},
+            upsert=True,
+        )
+
+    async def find(self, user_id: ObjectId) -> Optional[dict]:
+        return await self.engine.get_collection(UserOrderStats).find_one(
+            {"_id": user_id}, {field: 1 for field in STATS_FIELDS}
+        )
+
+    async def rebuild(self, user_id: Optional[ObjectId], batch_size: int) -> int:
+        started_at = datetime.utcnow()
+        match = [{"$match": {"user_id": user_id}}] if user_id else []
+        cancelled = {"$eq": ["$status", OrderStatus.CANCELLED.value]}
+        pipeline = [
+            *match,
+            {"$unionWith": {"coll": ORDERS_ARCHIVE_COLLECTION, "pipeline": match}},
+            {
+                "$group": {
+                    "_id": "$user_id",
+                    "orders": {"$sum": 1},
+                    "cancelled_orders": {"$sum": {"$cond": [cancelled, 1, 0]}},
+                    "total_spent": {"$sum": {"$cond": [cancelled, 0.0, "$price"]}},
+                    "last_order_update": {"$max": "$item_updated_at"},
+                }
+            },
+        ]
+
+        stats = self.engine.get_collection(UserOrderStats)
+        orders = self.engine.get_collection(Order)
+        written = skipped = 0
+        batch, recent = [], []
+        async for row in orders.aggregate(pipeline, allowDiskUse=True):
+            # The $inc of an order written since the rebuild started may
+            # land after the replacement and count the order twice
+            last_order_update = row.pop("last_order_update")
+            if last_order_update and last_order_update >= started_at:
+                recent.append(row["_id"])
+                skipped += 1
+                continue
+            row["updated_at"] = datetime.utcnow()
+            # A summary incremented since the rebuild started may count an
+            # order the aggregation did not see: it is left as it is (the
+            # upsert fails on its _id) and fixed by the next rebuild
+            batch.append(
+                ReplaceOne(
+                    {"_id": row["_id"], "updated_at": {"$lt": started_at}},
+                    row,
+                    upsert=True,
+                )
+            )
+            if len(batch) >= batch_size:
+                replaced = await self._replace(stats, batch)
+                written += replaced
+                skipped += len(batch) - replaced
+                batch = []
+        if batch:
+            replaced = await self._replace(stats, batch)
+            written += replaced
+            skipped += len(batch) - replaced
+
+        # Summaries not touched since the rebuild started belong to users
+        # that no longer have orders (or whose $inc is still on its way)
+        stale = {"updated_at": {"$lt": started_at}, "_id": {"$nin": recent}}
+        if user_id is not None:
+            stale["_id"]["$eq"] = user_id
+        result = await stats.delete_many(stale)
+        logging.info(
+            f"Rebuilt {written} order summaries, removed {result.deleted_count}, "
+            f"skipped {skipped} updated during the rebuild"
+        )
+        return written
+
+    @staticmethod
+    async def _replace(stats, batch: list) -> int:
+        """
+        Run the replacements of a rebuild batch; return how many were
+        written (the others target a summary updated during the rebuild).
+        """
+        try:
+            await stats.bulk_write(batch, ordered=False)
+            return len(batch)
+        except BulkWriteError as error:
+            write_errors = error.details.get("writeErrors", [])
+            if any(write_error["code"] != 11000 for write_error in write_errors):
+                raise error
+            return len(batch) - len(write_errors)
+
+
+class MongoIdempotencyRepository(IdempotencyRepository):
+    def __init__(self, engine: AIOEngine):
+        self.engine = engine
+
+    def _collection(self):
+        return self.engine.get_collection(IdempotencyRecord)
+
+    async def insert(self, record: dict) -> bool:
+        try:
+            await self._collection().insert_one(record)
+            return True
+        except DriverDuplicateKeyError:
+            return False
+
+    async def take_over(
+        self, key: str, fingerprint: str, stale_before: datetime, now: datetime
+    ) -> bool:
+        taken = await self._collection().find_one_and_update(
+            {
+                "_id": key,
+                "fingerprint": fingerprint,
+                "state": PROCESSING,
+                "locked_at": {"$lt": stale_before},
+            },
+            {"$set": {"locked_at": now}},
+        )
+        return taken is not None
+
+    async def find(self, key: str) -> Optional[dict]:
+        return await self._collection().find_one({"_id": key})
+
+    async def complete(self, key: str, status_code: int, body: bytes):
+        await self._collection().update_one(
+            {"_id": key},
+            {"$set": {"state": COMPLETED, "status_code": status_code, "body": body}},
+        )
+
+    async def release(self, key: str):
+        await self._collection().delete_one({"_id": key, "state": PROCESSING})
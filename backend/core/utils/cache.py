@@ -0,0 +1,254 @@
+"""
+Cache Utility Module
+
+This module provides the cache backends used by the CRUD layer:
+
+- InMemoryCache: per-process LRU cache with a TTL and a bounded size
+- RedisCache: shared cache for multi-worker deployments (needs the optional
+  `redis` package); values are stored BSON-encoded
+- NullCache: stores nothing (CACHE_BACKEND=none); every read is a miss
+
+An in-process cache is only invalidated by the writes of its own process:
+server.py switches to NullCache when it starts several workers without a
+shared backend, since the other workers would keep serving stale entries.
+
+Use get_cache(namespace, ...) to get the configured backend (CACHE_BACKEND
+setting). get_or_load provides read-through access with stampede
+protection: concurrent misses on the same key in a process share a single
+load (core.utils.single_flight). A load still running when its key is
+deleted does not store its result, so a write followed by delete() is never
+undone by a read that started before it. This is tracked per process: with
+RedisCache, a load running in another worker can still store a value read
+before the write until the entry expires.
+"""
+
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional
+
+from commons.settings import settings
+from core import logger
+from core.utils.single_flight import get_single_flight
+
+logging = logger(__name__)
+
+
+class CacheBackend(ABC):
+    """
+    Base class for cache backends.
+
+    Attributes:
+        namespace: Prefix of every key stored by this cache
+        ttl: Default time-to-live of an entry, in seconds
+        shared: True when every process sees the same entries, so a delete
+            in one worker invalidates the entry for all of them
+    """
+
+    shared = False
+
+    def __init__(self, namespace: str, ttl: float):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._loads = get_single_flight(f"cache:{namespace}")
+        # key -> token of the running load allowed to store its result
+        self._loading = {}
+
+    def key(self, *parts) -> str:
+        return ":".join([self.namespace, *(str(part) for part in parts)])
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Any]: ...
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None): ...
+
+    async def delete(self, *keys: str):
+        """
+        Remove keys; loads of these keys already running will not store
+        their result.
+        """
+        for key in keys:
+            self._loading.pop(key, None)
+            self._loads.forget(key)
+        await self._delete(*keys)
+
+    @abstractmethod
+    async def _delete(self, *keys: str): ...
+
+    async def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: Optional[float] = None,
+    ) -> Optional[Any]:
+        """
+        Return the cached value for key, loading and caching it on a miss.
+
+        None results are not cached.
+        """
+        value = await self.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+        self.misses += 1
+
+        # Stampede protection: concurrent misses share one load
+        return await self._loads.do(key, lambda: self._load(key, loader, ttl))
+
+    async def _load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: Optional[float],
+    ) -> Optional[Any]:
+        token = object()
+        self._loading[key] = token
+        try:
+            value = await loader()
+        finally:
+            # Deleted while loading: the value may predate the write
+            current = self._loading.get(key) is token
+            if current:
+                del self._loading[key]
+        if value is not None and current:
+            await self.set(key, value, ttl)
+        return value
+
+    def stats(self) -> dict:
+        return {
+            "backend": type(self).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+class InMemoryCache(CacheBackend):
+    """
+    Per-process LRU cache with a TTL.
+
+    Attributes:
+        max_entries: Maximum number of entries before the least recently
+            used entry is evicted
+    """
+
+    def __init__(self, namespace: str, ttl: float, max_entries: int = 1024):
+        super().__init__(namespace, ttl)
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+
+    async def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        expires_at = time.monotonic() + (ttl if ttl is not None else self.ttl)
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def _delete(self, *keys: str):
+        for key in keys:
+            self._entries.pop(key, None)
+
+    def stats(self) -> dict:
+        return {**super().stats(), "entries": len(self._entries)}
+
+
+class RedisCache(CacheBackend):
+    """
+    Cache shared by every worker, backed by Redis.
+
+    Values must be BSON-encodable dictionaries.
+    """
+
+    shared = True
+
+    def __init__(self, namespace: str, ttl: float, url: str):
+        super().__init__(namespace, ttl)
+        try:
+            import redis.asyncio as redis
+        except ImportError as error:
+            raise RuntimeError(
+                "CACHE_BACKEND=redis requires the redis package (pip install redis)"
+            ) from error
+        import bson
+
+        self._bson = bson
+        self._client = redis.from_url(url)
+
+    async def get(self, key: str) -> Optional[Any]:
+        raw = await self._client.get(key)
+        return self._bson.decode(raw) if raw is not None else None
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        ttl = ttl if ttl is not None else self.ttl
+        await self._client.set(key, self._bson.encode(value), px=int(ttl * 1000))
+
+    async def _delete(self, *keys: str):
+        if keys:
+            await self._client.delete(*keys)
+
+
+class NullCache(CacheBackend):
+    """
+    Cache that stores nothing: every get_or_load runs the loader (concurrent
+    loads of a key are still coalesced).
+    """
+
+    # Nothing is stored, so no worker can serve a stale entry
+    shared = True
+
+    async def get(self, key: str) -> Optional[Any]:
+        return None
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        pass
+
+    async def _delete(self, *keys: str):
+        pass
+
+
+CACHE_BACKENDS = {"memory": InMemoryCache, "redis": RedisCache, "none": NullCache}
+
+_caches = {}
+
+
+def cache_backend_shared(backend: str) -> bool:
+    """
+    Return whether a CACHE_BACKEND value is safe with several worker processes.
+    """
+    return CACHE_BACKENDS.get(backend, InMemoryCache).shared
+
+
+def get_cache(namespace: str, ttl: float, max_entries: int = 1024) -> CacheBackend:
+    """
+    Return the cache for a namespace, creating it with the configured backend.
+    """
+    if namespace not in _caches:
+        if settings.cache_backend == "redis":
+            cache = RedisCache(namespace, ttl, settings.redis_url)
+        elif settings.cache_backend == "none":
+            cache = NullCache(namespace, ttl)
+        else:
+            cache = InMemoryCache(namespace, ttl, max_entries)
+        logging.info(f"Using {type(cache).__name__} for the {namespace} cache")
+        _caches[namespace] = cache
+    return _caches[namespace]
+
+
+def cache_stats() -> dict:
+    """
+    Return hit/miss statistics for every cache.
+    """
+    return {namespace: cache.stats() for namespace, cache in _caches.items()}
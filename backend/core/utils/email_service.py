@@ -1,7 +1,7 @@
 import aiosmtplib
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
-import os
+from commons.settings import settings
 from core import logger
 
 logging = logger(__name__)
@@ -11,6 +11,9 @@ async def send_email(subject, to_email, text, html):
     """
     Asynchronously send an email using Gmail SMTP.
 
+    The SMTP server defaults to Gmail and can be overridden with the
+    SMTP_HOST, SMTP_PORT and SMTP_START_TLS settings.
+
     Args:
         subject: Email subject
         to_email: Recipient email address
@@ -25,8 +28,8 @@ async def send_email(subject, to_email, text, html):
     """
     try:
         logging.info(f"executing send_email helper function")
-        gmail_app_password = os.environ.get("gmail_app_password")
-        sent_from = os.environ.get("gmail_user")
+        gmail_app_password = settings.gmail_app_password
+        sent_from = settings.gmail_user
 
         logging.info(f"Using sender: {sent_from}")
         if not gmail_app_password:
@@ -49,15 +52,14 @@ async def send_email(subject, to_email, text, html):
         # Send the email asynchronously
         await aiosmtplib.send(
             message,
-            hostname="smtp.gmail.com",
-            port=587,
+            hostname=settings.smtp_host,
+            port=settings.smtp_port,
             username=sent_from,
             password=gmail_app_password,
-            start_tls=True,
+            start_tls=settings.smtp_start_tls,
         )
 
         logging.info(f"Email Sent to {sent_to}")
-        print("Email sent!")
         return True
     except Exception as error:
         logging.error(f"Error in send_email function: {error}")
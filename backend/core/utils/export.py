@@ -0,0 +1,89 @@
+"""
+Order Export Utility Module
+
+Turns an async iterator of raw order documents into NDJSON or CSV bytes,
+for the streaming export endpoint and the export CLI.
+
+Rows are grouped into chunks of about CHUNK_SIZE bytes, so memory stays
+constant and each chunk is written with a single send. Every row starts
+with the order id: an interrupted export resumes with after=<last id>.
+"""
+
+import csv
+import io
+from typing import AsyncIterator
+
+import orjson
+
+from core.utils.serializers import serialize_order_document
+
+EXPORT_FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+CHUNK_SIZE = 64 * 1024
+
+ADDRESS_COLUMNS = ["street_address", "city", "state", "postal_code", "country"]
+CSV_COLUMNS = [
+    "id",
+    "order_number",
+    "user_id",
+    "item_name",
+    "price",
+    "status",
+    "item_list",
+    *(f"address_{column}" for column in ADDRESS_COLUMNS),
+    "item_created_at",
+    "item_updated_at",
+]
+
+
+def _csv_row(order: dict) -> list:
+    address = order.get("Address") or {}
+    return [
+        order["id"],
+        order["order_number"],
+        order["user_id"],
+        order["item_name"],
+        order["price"],
+        order["status"],
+        "|".join(order["item_list"]),
+        *(address.get(column, "") for column in ADDRESS_COLUMNS),
+        order["item_created_at"].isoformat(),
+        order["item_updated_at"].isoformat(),
+    ]
+
+
+async def stream_orders(
+    documents: AsyncIterator[dict], format: str, header: bool = True
+):
+    """
+    Yield the export of documents as byte chunks.
+
+    Args:
+        documents: Raw order documents (see OrderCRUD.iter_raw)
+        format: "ndjson" or "csv"
+        header: Start the CSV output with a header row (off when appending
+            to a resumed export)
+    """
+    if format == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if header:
+            writer.writerow(CSV_COLUMNS)
+        async for document in documents:
+            writer.writerow(_csv_row(serialize_order_document(document)))
+            if buffer.tell() >= CHUNK_SIZE:
+                yield buffer.getvalue().encode()
+                buffer.seek(0)
+                buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode()
+        return
+
+    chunk = bytearray()
+    async for document in documents:
+        chunk += orjson.dumps(serialize_order_document(document))
+        chunk += b"\n"
+        if len(chunk) >= CHUNK_SIZE:
+            yield bytes(chunk)
+            chunk.clear()
+    if chunk:
+        yield bytes(chunk)
@@ -0,0 +1,180 @@
+"""
+Idempotency Utility Module
+
+Lets clients retry a POST safely with an Idempotency-Key header: the first
+request with a key runs and its response is stored (see
+core.cruds.idempotency_crud); retries with the same key and body get the
+stored response back without running the write again.
+
+- Duplicates arriving while the first request still runs wait for it:
+  in the same process they join its single-flight call, in other
+  processes they poll the stored record (up to IDEMPOTENCY_WAIT_SECONDS,
+  then 409).
+- Reusing a key with a different body is rejected with 422.
+- Keys are scoped per client: by user id on authenticated endpoints, and
+  by a keyed hash of the email on signup (identity_scope), so clients
+  picking the same key never see each other's requests.
+- Responses with a status below 500 (including 4xx errors) are stored;
+  after a 5xx or an unexpected error the key is released so a retry runs
+  the request again.
+- Credentials in a response (the access_token of a signup) are never
+  stored: the endpoint passes them as private_fields, which are removed
+  before storing and issued again when the response is replayed.
+"""
+
+import asyncio
+import hashlib
+import hmac
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+import orjson
+from fastapi import HTTPException, Response
+
+from core import logger
+from core.cruds.idempotency_crud import IdempotencyCRUD, COMPLETED
+from core.utils.single_flight import get_single_flight
+from commons.settings import settings
+
+logging = logger(__name__)
+
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+_requests = get_single_flight("idempotency")
+
+
+def _fingerprint(payload: dict) -> str:
+    # Keyed, so a stored fingerprint of a signup body reveals nothing about
+    # the password it contains
+    body = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+    return hmac.new(
+        (settings.jwt_secret or "").encode(), body, hashlib.sha256
+    ).hexdigest()
+
+
+def identity_scope(scope: str, identity: str) -> str:
+    """
+    Scope for an unauthenticated endpoint, per client identity (e.g. the
+    signup email). The identity is only stored as a keyed hash.
+    """
+    return f"{scope}:{_fingerprint({'identity': identity})}"
+
+
+def _without(body: bytes, fields) -> bytes:
+    # Stored copy of a JSON response body without the private fields
+    document = orjson.loads(body)
+    if not isinstance(document, dict) or not any(field in document for field in fields):
+        return body
+    return orjson.dumps(
+        {name: value for name, value in document.items() if name not in fields}
+    )
+
+
+def _restore(body: bytes, private_fields: dict) -> bytes:
+    # Issue the private fields of a replayed successful response again
+    document = orjson.loads(body)
+    for name, issue in private_fields.items():
+        document[name] = issue(document)
+    return orjson.dumps(document)
+
+
+def _response(status_code: int, body: bytes, replayed: bool) -> Response:
+    headers = {REPLAYED_HEADER: "true"} if replayed else None
+    return Response(
+        content=body,
+        status_code=status_code,
+        media_type="application/json",
+        headers=headers,
+    )
+
+
+async def _execute(
+    key: str,
+    fingerprint: str,
+    handler: Callable[[], Awaitable[Response]],
+    private_fields: tuple,
+) -> tuple:
+    crud = IdempotencyCRUD()
+    deadline = time.monotonic() + settings.idempotency_wait_seconds
+    delay = 0.05
+    while True:
+        claimed, record = await crud.claim(key, fingerprint)
+        if claimed:
+            break
+        if record is None:
+            # Released by a failed request: claim it again
+            continue
+        if record["fingerprint"] != fingerprint:
+            raise HTTPException(
+                status_code=422,
+                detail="Idempotency-Key was already used with a different request",
+            )
+        if record["state"] == COMPLETED:
+            return record["status_code"], record["body"], True
+        if time.monotonic() >= deadline:
+            raise HTTPException(
+                status_code=409,
+                detail="A request with this Idempotency-Key is still in progress",
+            )
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, 1.0)
+
+    try:
+        response = await handler()
+    except HTTPException as error:
+        if error.status_code < 500:
+            body = orjson.dumps({"detail": error.detail})
+            await crud.complete(key, error.status_code, body)
+        else:
+            await crud.release(key)
+        raise
+    except Exception:
+        await crud.release(key)
+        raise
+
+    if response.status_code < 500:
+        stored = _without(response.body, private_fields)
+        await crud.complete(key, response.status_code, stored)
+    else:
+        await crud.release(key)
+    return response.status_code, response.body, False
+
+
+async def run_idempotent(
+    scope: str,
+    idempotency_key: Optional[str],
+    payload: dict,
+    handler: Callable[[], Awaitable[Response]],
+    private_fields: Optional[dict[str, Callable[[dict], Any]]] = None,
+) -> Response:
+    """
+    Run handler at most once per (scope, idempotency_key).
+
+    Args:
+        scope: Namespace of the key, e.g. "orders:<user id>" so that keys of
+            different users or endpoints never collide
+        idempotency_key: Value of the Idempotency-Key header; handler simply
+            runs when it is None
+        payload: Request body, compared between retries
+        handler: Runs the request and returns its JSON response
+        private_fields: {field: function} for the response fields that must
+            not be stored; a replayed 2xx response gets each field back as
+            function(stored response body)
+
+    Returns:
+        Response: The handler's response, or the stored one for a retry
+        (marked with an Idempotent-Replayed: true header)
+    """
+    if idempotency_key is None:
+        return await handler()
+
+    key = f"{scope}:{idempotency_key}"
+    fingerprint = _fingerprint(payload)
+    private_fields = private_fields or {}
+    status_code, body, replayed = await _requests.do(
+        (key, fingerprint),
+        lambda: _execute(key, fingerprint, handler, tuple(private_fields)),
+    )
+    if replayed and private_fields and 200 <= status_code < 300:
+        body = _restore(body, private_fields)
+    return _response(status_code, body, replayed)
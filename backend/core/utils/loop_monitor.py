@@ -0,0 +1,190 @@
+"""
+Event Loop Monitor Utility Module
+
+This module measures event-loop lag and detects callbacks that block the loop.
+
+- A probe coroutine sleeps for a fixed interval on the loop and records how
+  late it wakes up (the loop lag).
+- A watchdog thread checks the probe's heartbeat. When the loop has not
+  ticked for longer than the blocking threshold, it captures the stack of
+  the loop thread and the route of the task that is currently running.
+  The stack is only written to the log: the events returned by stats()
+  (served by the unauthenticated /health/metrics) leave it out.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+import traceback
+import weakref
+from collections import deque
+from typing import Optional
+
+from commons.settings import settings
+from core import logger
+
+logging = logger(__name__)
+
+
+class LoopMonitor:
+    """
+    Background monitor for event-loop lag and blocking callbacks.
+
+    Attributes:
+        interval: Seconds between two lag probes
+        block_threshold: Seconds without a loop tick before a callback is
+            reported as blocking
+        max_events: Number of blocking events kept in memory
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.1,
+        block_threshold: float = 0.25,
+        max_events: int = 20,
+    ):
+        self.interval = interval
+        self.block_threshold = block_threshold
+        self.blocking_events = deque(maxlen=max_events)
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._probe_task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self._heartbeat = time.monotonic()
+        self._routes = weakref.WeakKeyDictionary()
+
+        self._lag_last = 0.0
+        self._lag_max = 0.0
+        self._lag_total = 0.0
+        self._samples = 0
+        self._blocked_count = 0
+
+    def start(self):
+        """
+        Start the lag probe on the running loop and the watchdog thread.
+        """
+        if self._probe_task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stopped.clear()
+        self._probe_task = self._loop.create_task(self._probe())
+        self._watchdog = threading.Thread(
+            target=self._watch, name="loop-monitor-watchdog", daemon=True
+        )
+        self._watchdog.start()
+        logging.info(
+            f"Loop monitor started (interval={self.interval}s, "
+            f"block_threshold={self.block_threshold}s)"
+        )
+
+    async def stop(self):
+        """
+        Stop the lag probe and the watchdog thread.
+        """
+        self._stopped.set()
+        if self._probe_task is not None:
+            self._probe_task.cancel()
+            try:
+                await self._probe_task
+            except asyncio.CancelledError:
+                pass
+            self._probe_task = None
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=self.block_threshold * 2)
+            self._watchdog = None
+        logging.info("Loop monitor stopped")
+
+    def track_route(self, route: str):
+        """
+        Remember the route served by the current task, so blocking events
+        can be attributed to it.
+        """
+        task = asyncio.current_task()
+        if task is not None:
+            self._routes[task] = route
+
+    def stats(self) -> dict:
+        """
+        Return the current loop lag metrics and the latest blocking events.
+        """
+        return {
+            "running": self._probe_task is not None,
+            "lag_last_ms": round(self._lag_last * 1000, 3),
+            "lag_max_ms": round(self._lag_max * 1000, 3),
+            "lag_avg_ms": round(
+                (self._lag_total / self._samples) * 1000 if self._samples else 0.0, 3
+            ),
+            "samples": self._samples,
+            "blocked_count": self._blocked_count,
+            "block_threshold_ms": round(self.block_threshold * 1000, 3),
+            "blocking_events": list(self.blocking_events),
+        }
+
+    async def _probe(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - started - self.interval)
+            self._heartbeat = time.monotonic()
+            self._lag_last = lag
+            self._lag_max = max(self._lag_max, lag)
+            self._lag_total += lag
+            self._samples += 1
+
+    def _watch(self):
+        reported_heartbeat = None
+        while not self._stopped.wait(self.block_threshold / 2):
+            heartbeat = self._heartbeat
+            blocked_for = time.monotonic() - heartbeat - self.interval
+            if blocked_for < self.block_threshold or heartbeat == reported_heartbeat:
+                continue
+            # Report each stall once, while the blocking callback is still running
+            reported_heartbeat = heartbeat
+            self._report_blocking(blocked_for)
+
+    def _report_blocking(self, blocked_for: float):
+        frame = sys._current_frames().get(self._loop_thread_id)
+        stack = "".join(traceback.format_stack(frame)) if frame else ""
+        task = asyncio.current_task(self._loop)
+        route = self._routes.get(task, "unknown") if task is not None else "unknown"
+
+        self._blocked_count += 1
+        self.blocking_events.append(
+            {
+                "detected_at": time.time(),
+                "blocked_ms": round(blocked_for * 1000, 3),
+                "route": route,
+                "task": task.get_name() if task is not None else None,
+            }
+        )
+        logging.warning(
+            f"Event loop blocked for {blocked_for * 1000:.1f}ms on route {route}\n{stack}"
+        )
+
+
+class RouteTrackingMiddleware:
+    """
+    ASGI middleware that tags each request task with its route for the
+    loop monitor.
+    """
+
+    def __init__(self, app, monitor: LoopMonitor):
+        self.app = app
+        self.monitor = monitor
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            self.monitor.track_route(f"{scope['method']} {scope['path']}")
+        await self.app(scope, receive, send)
+
+
+loop_monitor = LoopMonitor(
+    interval=settings.loop_monitor_interval,
+    block_threshold=settings.loop_block_threshold,
+)
@@ -0,0 +1,319 @@
+"""
+Order Events Utility Module
+
+Fans order status changes out to the Server-Sent Events streams of
+GET /v1/users/me/orders/stream.
+
+- OrderEventBroker is an in-process pub/sub keyed by user id. Every open
+  stream owns a bounded queue: a client too slow to keep up does not make
+  the queue grow, its pending events are replaced by a single "resync"
+  event telling it to re-fetch its orders.
+- The number of open streams per worker is capped (SSE_MAX_CONNECTIONS).
+- Events come from the order writes of this process (OrderCRUD calls
+  notify), or, when MongoDB runs as a replica set, from a change stream on
+  the orders collection, so that every worker sees the changes made by the
+  others (ORDER_EVENTS_SOURCE=auto|memory|change_stream).
+
+The memory source is single-process: under server.py with several workers,
+a change made by one worker only reaches the streams open on that worker
+(a warning is logged at startup). Multi-worker deployments need a replica
+set for change_stream.
+
+Event contract: order_status events carry {id, status, previous_status,
+item_updated_at}. previous_status is only known to the memory source; the
+change_stream source sends null, as it reads the document after the change
+(no pre-images). resync events tell the client to re-fetch its orders.
+"""
+
+import asyncio
+from typing import Optional
+
+import orjson
+
+from commons.settings import settings
+from core import logger
+from core.database.database import get_engine
+from core.models.order_model import Order
+
+logging = logger(__name__)
+
+# Put in a queue whose events were dropped, and to end the streams on shutdown
+RESYNC = object()
+CLOSE = object()
+
+
+class Subscription:
+    """
+    Bounded event queue of one open stream.
+    """
+
+    def __init__(self, user_id: str, max_size: int):
+        self.user_id = user_id
+        self.queue = asyncio.Queue(maxsize=max_size)
+        self.dropped = 0
+
+    def push(self, event) -> bool:
+        """
+        Queue event; on overflow replace the pending events by RESYNC.
+
+        Returns:
+            bool: False if events were dropped
+        """
+        try:
+            self.queue.put_nowait(event)
+            return True
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+                self.dropped += 1
+            self.queue.put_nowait(RESYNC)
+            return False
+
+
+class OrderEventBroker:
+    """
+    In-process pub/sub of order events, keyed by user id.
+
+    Attributes:
+        max_connections: Open streams allowed in this process
+        queue_size: Events buffered per stream before it is resynced
+        worker_processes: Worker processes serving the API (set by server.py)
+    """
+
+    def __init__(self, max_connections: int, queue_size: int):
+        self.max_connections = max_connections
+        self.queue_size = queue_size
+        self.worker_processes = 1
+        self.source = "memory"
+        self.published = 0
+        self.resyncs = 0
+        self.rejected = 0
+        self._subscriptions = {}
+        self._connections = 0
+
+    def admit(self) -> bool:
+        """
+        Check that a stream slot is free before a stream response is
+        started (the slot itself is taken by subscribe, when the stream
+        starts); counts a rejection otherwise.
+        """
+        if self._connections >= self.max_connections:
+            self.rejected += 1
+            return False
+        return True
+
+    def subscribe(self, user_id: str) -> Optional[Subscription]:
+        """
+        Open a subscription to the events of user_id.
+
+        Returns:
+            Subscription, or None when max_connections are already open
+        """
+        if self._connections >= self.max_connections:
+            self.rejected += 1
+            return None
+        subscription = Subscription(user_id, self.queue_size)
+        self._subscriptions.setdefault(user_id, set()).add(subscription)
+        self._connections += 1
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        subscriptions = self._subscriptions.get(subscription.user_id)
+        if subscriptions is None or subscription not in subscriptions:
+            return
+        subscriptions.discard(subscription)
+        if not subscriptions:
+            del self._subscriptions[subscription.user_id]
+        self._connections -= 1
+
+    def publish(self, user_id: str, event: dict):
+        """
+        Deliver event to every open stream of user_id.
+        """
+        self.published += 1
+        for subscription in self._subscriptions.get(user_id, ()):
+            if not subscription.push(event):
+                self.resyncs += 1
+
+    def notify(self, user_id: str, event: dict):
+        """
+        Publish an event produced by a write of this process.
+
+        Ignored when a change stream is the source: it delivers the same
+        change to every worker, this one included.
+        """
+        if self.source == "memory":
+            self.publish(user_id, event)
+
+    def close_all(self):
+        """
+        End every open stream (application shutdown).
+        """
+        for subscriptions in self._subscriptions.values():
+            for subscription in subscriptions:
+                while not subscription.queue.empty():
+                    subscription.queue.get_nowait()
+                subscription.queue.put_nowait(CLOSE)
+
+    def stats(self) -> dict:
+        return {
+            "source": self.source,
+            "connections": self._connections,
+            "max_connections": self.max_connections,
+            "users": len(self._subscriptions),
+            "published": self.published,
+            "resyncs": self.resyncs,
+            "rejected": self.rejected,
+        }
+
+
+order_events = OrderEventBroker(
+    max_connections=settings.sse_max_connections,
+    queue_size=settings.sse_queue_size,
+)
+
+
+def status_event(order_id, status, previous_status, updated_at) -> dict:
+    """
+    Build the payload of an order_status event.
+    """
+    return {
+        "id": str(order_id),
+        "status": getattr(status, "value", status),
+        "previous_status": getattr(previous_status, "value", previous_status),
+        "item_updated_at": updated_at,
+    }
+
+
+def _sse(event: str, data) -> bytes:
+    return b"event: %s\ndata: %s\n\n" % (event.encode(), orjson.dumps(data))
+
+
+async def sse_stream(user_id: str):
+    """
+    Subscribe to the events of user_id and yield them in the
+    text/event-stream format.
+
+    The subscription is only taken once the body is iterated, so a client
+    gone before the stream started does not hold a slot. A comment line is
+    sent every SSE_HEARTBEAT_SECONDS without events, so proxies keep the
+    connection open and a gone client is noticed. The subscription is
+    released when the client disconnects.
+    """
+    subscription = order_events.subscribe(user_id)
+    if subscription is None:
+        # The slots filled up since admit(): the client retries later
+        yield b"retry: 5000\n\n"
+        return
+    try:
+        yield b"retry: 5000\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(
+                    subscription.queue.get(), settings.sse_heartbeat_seconds
+                )
+            except asyncio.TimeoutError:
+                yield b": keepalive\n\n"
+                continue
+            if event is CLOSE:
+                return
+            if event is RESYNC:
+                yield _sse("resync", {})
+            else:
+                yield _sse("order_status", event)
+    finally:
+        order_events.unsubscribe(subscription)
+
+
+# Change stream source
+
+_watch_task: Optional[asyncio.Task] = None
+
+CHANGE_STREAM_PIPELINE = [
+    {
+        "$match": {
+            "operationType": "update",
+            "updateDescription.updatedFields.status": {"$exists": True},
+        }
+    },
+    {
+        "$project": {
+            "documentKey": 1,
+            "fullDocument.user_id": 1,
+            "fullDocument.status": 1,
+            "fullDocument.item_updated_at": 1,
+        }
+    },
+]
+
+
+async def _watch_orders(collection):
+    resume_token = None
+    while True:
+        try:
+            async with collection.watch(
+                CHANGE_STREAM_PIPELINE,
+                full_document="updateLookup",
+                resume_after=resume_token,
+            ) as stream:
+                async for change in stream:
+                    resume_token = stream.resume_token
+                    document = change.get("fullDocument")
+                    if not document:
+                        # Deleted before the lookup
+                        continue
+                    order_events.publish(
+                        str(document["user_id"]),
+                        status_event(
+                            change["documentKey"]["_id"],
+                            document["status"],
+                            # Not known without pre-images (see the contract)
+                            None,
+                            document["item_updated_at"],
+                        ),
+                    )
+        except asyncio.CancelledError:
+            raise
+        except Exception as error:
+            logging.error(f"Error in the orders change stream: {str(error)}")
+            await asyncio.sleep(5)
+
+
+async def start_order_events():
+    """
+    Pick the event source and start the change stream watcher if used.
+    """
+    global _watch_task
+    source = settings.order_events_source
+    engine = get_engine()
+    if engine is None:
+        return
+    if source == "auto":
+        try:
+            hello = await engine.client.admin.command("hello")
+            source = "change_stream" if "setName" in hello else "memory"
+        except Exception as error:
+            logging.error(f"Could not detect the MongoDB topology: {str(error)}")
+            source = "memory"
+    order_events.source = source
+    if source == "memory" and order_events.worker_processes > 1:
+        logging.warning(
+            f"Order events source is memory with {order_events.worker_processes} "
+            "workers: streams only receive the changes made by their own worker. "
+            "Run MongoDB as a replica set to use change_stream."
+        )
+    if source == "change_stream" and _watch_task is None:
+        _watch_task = asyncio.create_task(_watch_orders(engine.get_collection(Order)))
+    logging.info(f"Order events source: {source}")
+
+
+async def stop_order_events():
+    global _watch_task
+    order_events.close_all()
+    if _watch_task is not None:
+        _watch_task.cancel()
+        try:
+            await _watch_task
+        except asyncio.CancelledError:
+            pass
+        _watch_task = None
@@ -0,0 +1,80 @@
+"""
+Background Jobs Module
+
+Periodic jobs run by APScheduler inside the API process:
+
+- rebuild_user_order_stats: recomputes the user_order_stats summaries from
+  the orders (reconciliation of the incremental $inc updates)
+- archive_orders: moves old completed/cancelled orders to orders_archive
+
+The scheduler is off unless SCHEDULER_ENABLED is set. Enable it on a single
+process only: with server.py every worker runs the app lifespan, so run the
+matching scripts/ entry points from cron there instead.
+"""
+
+from commons.settings import settings
+from core import logger
+from core.cruds.user_order_stats_crud import UserOrderStatsCRUD
+from core.cruds.order_archive_crud import OrderArchiveCRUD
+
+logging = logger(__name__)
+
+_scheduler = None
+
+
+async def rebuild_user_order_stats():
+    try:
+        logging.info("Running the user_order_stats reconciliation job")
+        await UserOrderStatsCRUD().rebuild()
+    except Exception as error:
+        logging.error(f"Error in rebuild_user_order_stats job: {str(error)}")
+
+
+async def archive_orders():
+    try:
+        logging.info("Running the order archival job")
+        moved = await OrderArchiveCRUD().archive_orders(
+            settings.order_archive_after_days, settings.order_archive_batch_size
+        )
+        logging.info(f"Order archival job moved {moved} orders")
+    except Exception as error:
+        logging.error(f"Error in archive_orders job: {str(error)}")
+
+
+def start_scheduler():
+    """
+    Start the background jobs when SCHEDULER_ENABLED is set.
+    """
+    global _scheduler
+    if not settings.scheduler_enabled or _scheduler is not None:
+        return
+    # Imported here: only processes running the jobs pay for APScheduler
+    from apscheduler.schedulers.asyncio import AsyncIOScheduler
+
+    _scheduler = AsyncIOScheduler(timezone="UTC")
+    _scheduler.add_job(
+        rebuild_user_order_stats,
+        "interval",
+        hours=settings.order_stats_rebuild_hours,
+        id="rebuild_user_order_stats",
+        max_instances=1,
+        coalesce=True,
+    )
+    _scheduler.add_job(
+        archive_orders,
+        "interval",
+        hours=settings.order_archive_interval_hours,
+        id="archive_orders",
+        max_instances=1,
+        coalesce=True,
+    )
+    _scheduler.start()
+    logging.info("Background scheduler started")
+
+
+def stop_scheduler():
+    global _scheduler
+    if _scheduler is not None:
+        _scheduler.shutdown(wait=False)
+        _scheduler = None
+        logging.info("Background scheduler stopped")
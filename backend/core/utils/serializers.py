@@ -0,0 +1,211 @@
+"""
+Response Serialization Utility Module
+
+This module converts ODMantic documents into response dictionaries in a
+single pass and renders them with orjson.
+
+Routers return these dictionaries wrapped in FastAPI's ORJSONResponse
+(re-exported here), so FastAPI does not re-validate them against the
+response_model (the response_model is kept for the OpenAPI documentation
+only).
+
+Read-only list endpoints skip ODMantic hydration altogether and map raw BSON
+documents from Motor with serialize_order_document.
+
+Read endpoints also accept a sparse fieldset (fields=a,b,c): parse_fields
+validates it against the response schema, build_projection turns it into a
+Mongo projection and serialize_partial_document maps the projected document.
+
+entity_tag, http_date and etag_matches support conditional GET requests.
+
+encode_cursor and decode_cursor build the opaque keyset pagination cursors.
+"""
+
+import base64
+import binascii
+import warnings
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Optional
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from fastapi import HTTPException, status
+from fastapi.exceptions import FastAPIDeprecationWarning
+from fastapi.responses import ORJSONResponse
+
+from core.models.order_model import Order
+from core.models.user_model import User
+from core.apis.schemas.responses.order_responses import OrderResponse
+from core.apis.schemas.responses.user_response import UserResponse
+
+# Fields that can be requested through a sparse fieldset
+ORDER_FIELDS = tuple(OrderResponse.model_fields)
+USER_FIELDS = tuple(UserResponse.model_fields)
+
+
+# FastAPI deprecates ORJSONResponse in favour of serializing the
+# response_model, which is exactly the validation these routes skip
+warnings.filterwarnings(
+    "ignore",
+    message="ORJSONResponse is deprecated",
+    category=FastAPIDeprecationWarning,
+)
+
+
+def serialize_user(user: User) -> dict:
+    """
+    Convert a User document into a UserResponse-shaped dictionary.
+
+    Sensitive fields (hashed_password, otp, otp_expiry) are never included.
+    """
+    return {
+        "id": str(user.id),
+        "first_name": user.first_name,
+        "last_name": user.last_name,
+        "email": user.email,
+        "mobile_number": user.mobile_number,
+        "address": user.address.model_dump() if user.address else None,
+        "status": user.status,
+        "created_at": user.created_at,
+        "updated_at": user.updated_at,
+    }
+
+
+def serialize_order(order: Order) -> dict:
+    """
+    Convert an Order document into an OrderResponse-shaped dictionary.
+    """
+    return {
+        "id": str(order.id),
+        "user_id": str(order.user_id),
+        "item_name": order.item_name,
+        "price": order.price,
+        "order_number": order.order_number,
+        "item_list": order.item_list,
+        "Address": order.Address.model_dump(),
+        "status": order.status,
+        "item_created_at": order.item_created_at,
+        "item_updated_at": order.item_updated_at,
+    }
+
+
+def serialize_order_document(document: dict) -> dict:
+    """
+    Convert a raw BSON order document into an OrderResponse-shaped dictionary.
+
+    The document is expected to come from a query using ORDER_PROJECTION.
+    """
+    return {
+        "id": str(document["_id"]),
+        "user_id": str(document["user_id"]),
+        "item_name": document["item_name"],
+        "price": document["price"],
+        "order_number": document["order_number"],
+        "item_list": document["item_list"],
+        "Address": document["Address"],
+        "status": document["status"],
+        "item_created_at": document["item_created_at"],
+        "item_updated_at": document["item_updated_at"],
+    }
+
+
+def parse_fields(fields: Optional[str], allowed: tuple) -> Optional[list]:
+    """
+    Parse a comma-separated sparse fieldset.
+
+    Args:
+        fields: Raw value of the fields query parameter
+        allowed: Field names exposed by the response schema
+
+    Returns:
+        List of requested fields, or None when all fields are requested
+
+    Raises:
+        HTTPException: 400 if a requested field is not part of the schema
+    """
+    if not fields:
+        return None
+    requested = list(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+    unknown = [field for field in requested if field not in allowed]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown)}",
+        )
+    return requested or None
+
+
+def build_projection(fields: list) -> dict:
+    """
+    Build a Mongo projection for a sparse fieldset. The _id is always returned.
+    """
+    projection = {"_id": 1}
+    projection.update({field: 1 for field in fields if field != "id"})
+    return projection
+
+
+def serialize_partial_document(document: dict, fields: list) -> dict:
+    """
+    Convert a projected BSON document into a sparse response dictionary.
+    """
+    data = {"id": str(document["_id"])}
+    for field in fields:
+        if field == "id" or field not in document:
+            continue
+        value = document[field]
+        data[field] = str(value) if field == "user_id" else value
+    return data
+
+
+def entity_tag(id: str, updated_at: datetime) -> str:
+    """
+    Build a strong ETag from a document id and its last update timestamp.
+    """
+    updated_at = updated_at.replace(tzinfo=timezone.utc)
+    return f'"{id}-{int(updated_at.timestamp() * 1000)}"'
+
+
+def http_date(value: datetime) -> str:
+    """
+    Format a naive UTC datetime as an HTTP date (Last-Modified header).
+    """
+    return format_datetime(value.replace(tzinfo=timezone.utc), usegmt=True)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header against an ETag (weak comparison).
+    """
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in [tag.removeprefix("W/") for tag in candidates]
+
+
+def encode_cursor(created_at: datetime, id: ObjectId) -> str:
+    """
+    Build an opaque keyset cursor pointing after an order of a listing.
+    """
+    raw = f"{created_at.isoformat()}|{id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """
+    Decode a cursor built by encode_cursor.
+
+    Returns:
+        tuple: (item_created_at, _id) of the last order of the previous page
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, id = raw.split("|")
+        return datetime.fromisoformat(created_at), ObjectId(id)
+    except (binascii.Error, UnicodeDecodeError, ValueError, InvalidId):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
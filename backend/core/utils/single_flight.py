@@ -0,0 +1,107 @@
+"""
+Single-Flight Utility Module
+
+Coalesces identical concurrent reads: while a call for a key is in flight,
+later callers with the same key await its result instead of running their
+own query. Results are not kept once the call completes (see
+core.utils.cache for caching).
+
+The shared call runs in its own task, so a caller that is cancelled (for
+example when its client disconnects) does not cancel the query for the
+other callers.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable
+
+from core import logger
+
+logging = logger(__name__)
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent calls sharing a key.
+
+    Attributes:
+        name: Name reported in the metrics
+        calls: Number of do() calls
+        executions: Number of calls that actually ran the function
+        coalesced: Number of calls that awaited an in-flight execution
+        errors: Number of executions that raised
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+        self.errors = 0
+        self._in_flight = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Return the result of fn(), sharing one execution between concurrent
+        callers with the same key.
+
+        The result object is shared by every caller: callers must not
+        mutate it.
+        """
+        self.calls += 1
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.executions += 1
+            task = asyncio.ensure_future(fn())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        return await asyncio.shield(task)
+
+    def forget(self, key: Hashable):
+        """
+        Stop sharing the in-flight call for key: later callers start a new
+        execution (used when the data it reads was just changed).
+        """
+        self._in_flight.pop(key, None)
+
+    def forget_if(self, predicate: Callable[[Hashable], bool]):
+        """
+        forget() every in-flight key for which predicate(key) is true.
+        """
+        for key in [key for key in self._in_flight if predicate(key)]:
+            del self._in_flight[key]
+
+    def _finish(self, key: Hashable, task: asyncio.Future):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled() and task.exception() is not None:
+            self.errors += 1
+
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+            "in_flight": len(self._in_flight),
+        }
+
+
+_groups = {}
+
+
+def get_single_flight(name: str) -> SingleFlight:
+    """
+    Return the single-flight group for a name, creating it on first use.
+    """
+    if name not in _groups:
+        _groups[name] = SingleFlight(name)
+    return _groups[name]
+
+
+def single_flight_stats() -> dict:
+    """
+    Return the coalescing metrics of every single-flight group.
+    """
+    return {name: group.stats() for name, group in _groups.items()}
@@ -0,0 +1,41 @@
+"""
+Move old completed and cancelled orders to the orders_archive collection.
+
+Orders in a final status not updated for --older-than-days are copied to
+orders_archive and deleted from orders, --batch-size at a time. Reads keep
+finding them through the archive fallback. Safe to interrupt and rerun.
+
+Usage:
+    python scripts/archive_orders.py [--older-than-days 90] [--batch-size 1000]
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import argparse
+import asyncio
+from commons.settings import settings
+from core.database.database import connect_to_mongo, close_mongo_connection
+from core.cruds.order_archive_crud import OrderArchiveCRUD
+
+
+async def archive(older_than_days: float, batch_size: int):
+    await connect_to_mongo()
+    try:
+        moved = await OrderArchiveCRUD().archive_orders(older_than_days, batch_size)
+        print(f"Archived {moved} orders")
+    finally:
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Archive old final orders")
+    parser.add_argument(
+        "--older-than-days", type=float, default=settings.order_archive_after_days
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=settings.order_archive_batch_size
+    )
+    args = parser.parse_args()
+    asyncio.run(archive(args.older_than_days, args.batch_size))
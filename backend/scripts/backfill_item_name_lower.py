@@ -0,0 +1,43 @@
+"""
+Fill Order.item_name_lower on orders created before the order search.
+
+The prefix search (GET /v1/users/me/orders/search?mode=prefix) only matches
+orders that have item_name_lower; new and updated orders set it
+automatically. Safe to rerun: only orders without the field are updated.
+
+Usage:
+    python scripts/backfill_item_name_lower.py
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import asyncio
+from core.database.database import (
+    connect_to_mongo,
+    close_mongo_connection,
+    get_engine,
+)
+from core.models.order_model import Order
+
+
+async def backfill() -> int:
+    await connect_to_mongo()
+    try:
+        result = (
+            await get_engine()
+            .get_collection(Order)
+            .update_many(
+                {"item_name_lower": {"$exists": False}},
+                [{"$set": {"item_name_lower": {"$toLower": "$item_name"}}}],
+            )
+        )
+        print(f"Updated {result.modified_count} orders")
+        return 0
+    finally:
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(backfill()))
@@ -0,0 +1,157 @@
+"""
+Compare sequential and concurrent login/signup flows against MongoDB.
+
+For each round the benchmark runs:
+
+- login sequential:  get_by_email -> verify_password -> get_user_orders
+  (the previous UserController.login_user order of work)
+- login concurrent:  UserController.login_user (orders query runs while
+  bcrypt verifies the password in a worker thread)
+- signup sequential: get_by_email -> encrypt_password -> create ->
+  get_user_orders (the previous UserController.create_user)
+- signup concurrent: UserController.create_user (a single insert checked by
+  the unique email index, the always-empty orders query is skipped)
+
+Uses MONGODB_URI / DATABASE_NAME; the benchmark users and orders are
+deleted at the end.
+
+Usage:
+    python scripts/bench_auth_flows.py [--rounds 20] [--orders 50]
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import argparse
+import asyncio
+import statistics
+import time
+from odmantic import ObjectId
+from commons.auth import encrypt_password, verify_password
+from core.database.database import (
+    connect_to_mongo,
+    close_mongo_connection,
+    get_engine,
+)
+from core.controllers.user_controller import UserController
+from core.cruds.order_crud import order_numbers
+from core.models.order_model import Order
+from core.models.user_model import User
+from core.models.user_order_stats_model import UserOrderStats
+
+PASSWORD = "benchmark-password"
+ADDRESS = {
+    "street_address": "456 Test Blvd",
+    "city": "Pune",
+    "state": "Maharashtra",
+    "postal_code": "411001",
+    "country": "India",
+}
+
+
+def signup_request(email: str) -> dict:
+    return {
+        "first_name": "Bench",
+        "last_name": "User",
+        "email": email,
+        "mobile_number": "1234567890",
+        "password": PASSWORD,
+        "address": dict(ADDRESS),
+    }
+
+
+async def login_sequential(controller: UserController, email: str):
+    user = await controller.UserCRUD.get_by_email(email)
+    assert verify_password(PASSWORD, user.hashed_password)
+    return await controller.OrderController.get_user_orders(str(user.id))
+
+
+async def signup_sequential(controller: UserController, email: str):
+    request = signup_request(email)
+    assert await controller.UserCRUD.get_by_email(email) is None
+    request["hashed_password"] = encrypt_password(request.pop("password"))
+    request["status"] = "ACTIVE"
+    user = await controller.UserCRUD.create(request)
+    return await controller.OrderController.get_user_orders(str(user.id))
+
+
+async def timed(coroutine) -> float:
+    start = time.perf_counter()
+    await coroutine
+    return (time.perf_counter() - start) * 1000
+
+
+def report(name: str, sequential: list, concurrent: list):
+    before = statistics.median(sequential)
+    after = statistics.median(concurrent)
+    print(
+        f"{name:<8} sequential p50 {before:8.1f} ms   concurrent p50 "
+        f"{after:8.1f} ms   saved {before - after:7.1f} ms "
+        f"({(1 - after / before) * 100:5.1f}%)"
+    )
+
+
+async def run_benchmark(rounds: int, orders: int):
+    await connect_to_mongo()
+    engine = get_engine()
+    controller = UserController()
+    run_id = ObjectId()
+    login_email = f"bench-login-{run_id}@example.com"
+    emails = [login_email]
+
+    try:
+        created = await controller.create_user(signup_request(login_email))
+        user_id = ObjectId(created["user"]["id"])
+        numbers = await order_numbers.allocate(orders)
+        await engine.get_collection(Order).insert_many(
+            [
+                Order(
+                    user_id=user_id,
+                    item_name=f"Item {i}",
+                    price=100.0 + i,
+                    order_number=number,
+                    item_list=["Smartphone", "Charger"],
+                    Address=ADDRESS,
+                ).model_dump_doc()
+                for i, number in enumerate(numbers)
+            ]
+        )
+
+        login = {"email": login_email, "password": PASSWORD}
+        login_before, login_after = [], []
+        signup_before, signup_after = [], []
+        for i in range(rounds):
+            login_before.append(await timed(login_sequential(controller, login_email)))
+            login_after.append(await timed(controller.login_user(dict(login))))
+
+            email = f"bench-signup-{run_id}-{i}-a@example.com"
+            emails.append(email)
+            signup_before.append(await timed(signup_sequential(controller, email)))
+            email = f"bench-signup-{run_id}-{i}-b@example.com"
+            emails.append(email)
+            signup_after.append(
+                await timed(controller.create_user(signup_request(email)))
+            )
+
+        print(f"{rounds} rounds, login user with {orders} orders")
+        report("login", login_before, login_after)
+        report("signup", signup_before, signup_after)
+    finally:
+        users = engine.get_collection(User)
+        ids = [
+            document["_id"]
+            async for document in users.find({"email": {"$in": emails}}, {"_id": 1})
+        ]
+        await engine.get_collection(Order).delete_many({"user_id": {"$in": ids}})
+        await engine.get_collection(UserOrderStats).delete_many({"_id": {"$in": ids}})
+        await users.delete_many({"_id": {"$in": ids}})
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--orders", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(run_benchmark(args.rounds, args.orders))
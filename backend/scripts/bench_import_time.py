@@ -0,0 +1,210 @@
+"""
+Import-time benchmark for the API application module.
+
+Runs `python -X importtime -c "import core.apis.api"` in fresh interpreters,
+reports the median cumulative import time and the slowest modules, and
+exits with status 1 when:
+
+- the median exceeds the budget (--budget-ms), or
+- --baseline is given and the median grew by more than --threshold over
+  the stored one, or
+- a module that must be loaded lazily is imported at startup.
+
+The default budget is derived from the tree before the startup work
+(commit 9de2cb1), not from the current one: BASELINE_MEDIAN_MS is its
+median on the reference machine, measured over 25 runs interleaved with
+this tree (which measured ~630 ms after PyJWT and passlib were made lazy).
+NOISE_MARGIN covers the run-to-run variance of a 5-run median; a change
+that makes startup slower than before the startup work by more than that
+fails. On another machine, or for a tighter check, store a baseline there
+with --save-baseline before a change and compare with --baseline after
+it; the modules new since the baseline and those whose self time grew the
+most are then listed.
+
+Usage:
+    python scripts/bench_import_time.py [--runs 5] [--budget-ms 770]
+        [--save-baseline import_baseline.json] [--baseline import_baseline.json]
+        [--threshold 0.25]
+"""
+
+import sys
+import os
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+import argparse
+import json
+import statistics
+import subprocess
+
+TARGET_MODULE = "core.apis.api"
+
+# Median import time of the tree before the startup work (commit 9de2cb1)
+# on the reference machine, and the run-to-run noise allowed over it
+BASELINE_MEDIAN_MS = 670.0
+NOISE_MARGIN = 0.15
+DEFAULT_BUDGET_MS = BASELINE_MEDIAN_MS * (1 + NOISE_MARGIN)
+
+# Modules only needed by specific requests (password hashing, JWTs, OTP
+# emails) or by processes running the background jobs
+LAZY_MODULES = [
+    "passlib",
+    "jwt",
+    "aiosmtplib",
+    "email.mime",
+    "core.utils.email_service",
+    "apscheduler",
+]
+
+
+def measure_once():
+    """
+    Import the target module in a fresh interpreter.
+
+    Returns:
+        tuple: (cumulative microseconds, {module: self microseconds})
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {TARGET_MODULE}"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = {}
+    cumulative = None
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        name = name.strip()
+        modules[name] = int(self_us)
+        if name == TARGET_MODULE:
+            cumulative = int(cumulative_us)
+    return cumulative, modules
+
+
+def compare(baseline: dict, modules: dict, top: int) -> list:
+    """
+    Return the lines describing the changes of a run against baseline: the
+    modules imported since the baseline, then the largest self time growths.
+    """
+    before = baseline["modules"]
+    lines = [
+        f"  new      {modules[name] / 1000:8.1f} ms  {name}"
+        for name in sorted(set(modules) - set(before))
+    ]
+    growths = sorted(
+        (
+            (modules[name] - before[name], name)
+            for name in modules
+            if name in before and modules[name] > before[name]
+        ),
+        reverse=True,
+    )[:top]
+    lines += [f"  grew     {delta / 1000:+8.1f} ms  {name}" for delta, name in growths]
+    return lines
+
+
+def run_benchmark(
+    runs: int,
+    budget_ms: float,
+    top: int,
+    baseline_path: str = None,
+    save_baseline_path: str = None,
+    threshold: float = 0.25,
+) -> int:
+    totals = []
+    modules = {}
+    for _ in range(runs):
+        cumulative, modules = measure_once()
+        totals.append(cumulative / 1000)
+
+    median = statistics.median(totals)
+    print(f"import {TARGET_MODULE}: median {median:.1f} ms over {runs} runs")
+    print(f"runs: {', '.join(f'{value:.1f}' for value in totals)} ms")
+
+    print(f"\nslowest {top} modules (self time, last run):")
+    for name, self_us in sorted(modules.items(), key=lambda x: x[1], reverse=True)[
+        :top
+    ]:
+        print(f"  {self_us / 1000:8.1f} ms  {name}")
+
+    failed = False
+    eager = [
+        name
+        for name in modules
+        if any(name == lazy or name.startswith(f"{lazy}.") for lazy in LAZY_MODULES)
+    ]
+    if eager:
+        failed = True
+        print(f"\nFAIL: lazily loaded modules imported at startup: {sorted(eager)}")
+
+    if median > budget_ms:
+        failed = True
+        print(f"\nFAIL: median {median:.1f} ms exceeds budget {budget_ms:.1f} ms")
+
+    if baseline_path:
+        with open(baseline_path) as file:
+            baseline = json.load(file)
+        limit = baseline["median_ms"] * (1 + threshold)
+        print(
+            f"\nbaseline {baseline_path}: median {baseline['median_ms']:.1f} ms, "
+            f"limit {limit:.1f} ms (+{threshold:.0%})"
+        )
+        for line in compare(baseline, modules, top):
+            print(line)
+        if median > limit:
+            failed = True
+            print(
+                f"\nFAIL: median {median:.1f} ms is "
+                f"{(median / baseline['median_ms'] - 1) * 100:+.0f}% over the baseline"
+            )
+
+    if save_baseline_path:
+        with open(save_baseline_path, "w") as file:
+            json.dump(
+                {
+                    "module": TARGET_MODULE,
+                    "runs": totals,
+                    "median_ms": median,
+                    "modules": modules,
+                },
+                file,
+                indent=2,
+            )
+        print(f"\nBaseline saved to {save_baseline_path}")
+
+    if not failed:
+        print(f"\nOK: within budget of {budget_ms:.1f} ms")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=DEFAULT_BUDGET_MS,
+        help="Absolute limit of the median",
+    )
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--baseline", help="Baseline JSON to compare with")
+    parser.add_argument("--save-baseline", help="Write the results to this file")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="Allowed relative growth of the median over the baseline",
+    )
+    args = parser.parse_args()
+    sys.exit(
+        run_benchmark(
+            args.runs,
+            args.budget_ms,
+            args.top,
+            args.baseline,
+            args.save_baseline,
+            args.threshold,
+        )
+    )
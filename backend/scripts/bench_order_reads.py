@@ -0,0 +1,80 @@
+"""
+Compare the hydrated and raw read paths used by the order list endpoints.
+
+Both paths receive the same BSON documents from Motor, so the benchmark
+feeds them the documents ODMantic itself would store and measures only the
+CPU work that differs:
+
+- hydrated: Order.model_validate_doc (what engine.find does) + serialize_order
+- raw:      serialize_order_document on the projected document
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import timeit
+from odmantic import ObjectId
+from core.models.order_model import Order
+from core.models.user_model import UserAddress
+from core.repositories.base import ORDER_PROJECTION
+from core.utils.serializers import serialize_order, serialize_order_document
+
+PAGE_SIZES = [10, 100, 1000]
+ROUNDS = 50
+
+
+def build_documents(count: int):
+    user_id = ObjectId()
+    address = UserAddress(
+        street_address="456 Test Blvd",
+        city="Pune",
+        state="Maharashtra",
+        postal_code="411001",
+        country="India",
+    )
+    documents = []
+    for i in range(count):
+        order = Order(
+            user_id=user_id,
+            item_name=f"Item {i}",
+            price=100.0 + i,
+            order_number=i,
+            item_list=["Smartphone", "Charger", "Earpods"],
+            Address=address,
+        )
+        document = order.model_dump_doc()
+        documents.append(
+            {
+                key: document[key]
+                for key in ["_id", *ORDER_PROJECTION]
+                if key in document
+            }
+        )
+    return documents
+
+
+def hydrated_path(documents):
+    return [serialize_order(Order.model_validate_doc(doc)) for doc in documents]
+
+
+def raw_path(documents):
+    return [serialize_order_document(doc) for doc in documents]
+
+
+def run_benchmark():
+    print(f"{'orders/page':>12} {'hydrated ms':>12} {'raw ms':>10} {'speedup':>8}")
+    for size in PAGE_SIZES:
+        documents = build_documents(size)
+        assert hydrated_path(documents) == raw_path(documents)
+
+        hydrated = timeit.timeit(lambda: hydrated_path(documents), number=ROUNDS)
+        raw = timeit.timeit(lambda: raw_path(documents), number=ROUNDS)
+        print(
+            f"{size:>12} {hydrated / ROUNDS * 1000:>12.3f} "
+            f"{raw / ROUNDS * 1000:>10.3f} {hydrated / raw:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    run_benchmark()
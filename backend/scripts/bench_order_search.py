@@ -0,0 +1,161 @@
+"""
+Measure the latency of the order search (GET /v1/users/me/orders/search)
+at growing collection sizes.
+
+Creates a scratch database (<DATABASE_NAME>_search_bench) on MONGODB_URI,
+builds the declared Order indexes and grows the orders collection to each
+--sizes value (orders spread over --users users). At every size it times,
+for one user:
+
+- text:     OrderCRUD.search_text_raw (user_item_text index, by relevance)
+- prefix:   OrderCRUD.search_prefix_raw (user_item_name_prefix index)
+- scan:     get_by_user_id_raw + filtering in Python (the previous
+            client-side way of searching)
+
+and prints p50/p95 in milliseconds. The scratch database is dropped at the
+end.
+
+Usage:
+    python scripts/bench_order_search.py [--sizes 10000 1000000]
+        [--users 100] [--queries 50]
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from motor.motor_asyncio import AsyncIOMotorClient
+from odmantic import AIOEngine, ObjectId
+from commons.settings import settings
+from core.cruds.order_crud import OrderCRUD
+from core.database.database import db_instance
+from core.models.order_model import Order, OrderStatus
+
+INSERT_BATCH = 10000
+PAGE_SIZE = 20
+BRANDS = ["Apple", "Samsung", "Sony", "Lenovo", "Philips", "Bosch", "Nike", "Canon"]
+PRODUCTS = [
+    "Smartphone",
+    "Charger",
+    "Headphones",
+    "Laptop",
+    "Keyboard",
+    "Monitor",
+    "Camera",
+    "Running Shoes",
+    "Coffee Maker",
+    "Backpack",
+]
+ADDRESS = {
+    "street_address": "456 Test Blvd",
+    "city": "Pune",
+    "state": "Maharashtra",
+    "postal_code": "411001",
+    "country": "India",
+}
+
+
+def make_order(user_id: ObjectId, number: int, rng: random.Random) -> dict:
+    product = rng.choice(PRODUCTS)
+    return Order(
+        user_id=user_id,
+        item_name=f"{rng.choice(BRANDS)} {product} {number % 97}",
+        price=float(rng.randint(1, 2000)),
+        order_number=number,
+        item_list=[product, *rng.sample(PRODUCTS, 2)],
+        Address=ADDRESS,
+        status=rng.choice(list(OrderStatus)),
+    ).model_dump_doc()
+
+
+async def timed(coroutine) -> float:
+    start = time.perf_counter()
+    await coroutine
+    return (time.perf_counter() - start) * 1000
+
+
+async def client_side_search(crud: OrderCRUD, user_id: str, text: str) -> list:
+    words = text.lower().split()
+    orders = await crud.get_by_user_id_raw(user_id)
+    matches = [
+        order
+        for order in orders
+        if any(
+            word in " ".join([order["item_name"], *order["item_list"]]).lower()
+            for word in words
+        )
+    ]
+    return matches[:PAGE_SIZE]
+
+
+def report(name: str, timings: list):
+    quantiles = statistics.quantiles(timings, n=20)
+    print(
+        f"  {name:<8} p50 {statistics.median(timings):8.2f} ms   "
+        f"p95 {quantiles[18]:8.2f} ms"
+    )
+
+
+async def run_benchmark(sizes: list, users: int, queries: int):
+    client = AsyncIOMotorClient(settings.mongodb_uri)
+    database = f"{settings.database_name}_search_bench"
+    # OrderCRUD reads the shared engine: point it at the scratch database
+    db_instance.client = client
+    db_instance.engine = AIOEngine(client=client, database=database)
+    rng = random.Random(42)
+    try:
+        await db_instance.engine.configure_database([Order])
+        collection = db_instance.engine.get_collection(Order)
+        crud = OrderCRUD()
+        user_ids = [ObjectId() for _ in range(users)]
+        user_id = str(user_ids[0])
+
+        inserted = 0
+        for size in sorted(sizes):
+            while inserted < size:
+                batch = min(INSERT_BATCH, size - inserted)
+                await collection.insert_many(
+                    [
+                        make_order(user_ids[n % users], n, rng)
+                        for n in range(inserted, inserted + batch)
+                    ],
+                    ordered=False,
+                )
+                inserted += batch
+
+            texts = [
+                f"{rng.choice(BRANDS)} {rng.choice(PRODUCTS)}" for _ in range(queries)
+            ]
+            prefixes = [rng.choice(BRANDS)[: rng.randint(2, 4)] for _ in range(queries)]
+            text, prefix, scan = [], [], []
+            for q, p in zip(texts, prefixes):
+                text.append(await timed(crud.search_text_raw(user_id, q, 0, PAGE_SIZE)))
+                prefix.append(
+                    await timed(crud.search_prefix_raw(user_id, p, 0, PAGE_SIZE))
+                )
+                scan.append(await timed(client_side_search(crud, user_id, q)))
+
+            print(
+                f"{size} orders ({size // users} for the searched user), "
+                f"{queries} queries"
+            )
+            report("text", text)
+            report("prefix", prefix)
+            report("scan", scan)
+    finally:
+        await client.drop_database(database)
+        client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the order search")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 1000000])
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--queries", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(run_benchmark(args.sizes, args.users, args.queries))
@@ -0,0 +1,77 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import json
+import timeit
+from odmantic import ObjectId
+from core.models.order_model import Order
+from core.models.user_model import UserAddress
+from core.apis.schemas.responses.order_responses import OrderListResponse
+from core.utils.serializers import ORJSONResponse, serialize_order
+
+ORDER_COUNT = 100
+ROUNDS = 200
+
+
+def build_orders(count: int):
+    user_id = ObjectId()
+    address = UserAddress(
+        street_address="456 Test Blvd",
+        city="Pune",
+        state="Maharashtra",
+        postal_code="411001",
+        country="India",
+    )
+    return [
+        Order(
+            user_id=user_id,
+            item_name=f"Item {i}",
+            price=100.0 + i,
+            order_number=i,
+            item_list=["Smartphone", "Charger", "Earpods"],
+            Address=address,
+        )
+        for i in range(count)
+    ]
+
+
+def legacy_path(orders):
+    # model_dump + id patching in the controller
+    order_list = []
+    for item in orders:
+        data = item.model_dump()
+        data["id"] = str(item.id)
+        data["user_id"] = str(item.user_id)
+        order_list.append(data)
+    result = {"orders": order_list, "total": len(order_list)}
+    # re-validation in the router
+    response = OrderListResponse(**result)
+    # response_model validation + serialization in FastAPI
+    validated = OrderListResponse.model_validate(response.model_dump())
+    return json.dumps(validated.model_dump(mode="json")).encode("utf-8")
+
+
+def fast_path(orders):
+    result = {
+        "orders": [serialize_order(item) for item in orders],
+        "total": len(orders),
+    }
+    return ORJSONResponse(result).body
+
+
+def run_benchmark():
+    orders = build_orders(ORDER_COUNT)
+    assert json.loads(legacy_path(orders)) == json.loads(fast_path(orders))
+
+    legacy = timeit.timeit(lambda: legacy_path(orders), number=ROUNDS) / ROUNDS
+    fast = timeit.timeit(lambda: fast_path(orders), number=ROUNDS) / ROUNDS
+
+    print(f"GET /v1/orders serialization with {ORDER_COUNT} orders")
+    print(f"legacy path: {legacy * 1000:.3f} ms/request")
+    print(f"fast path:   {fast * 1000:.3f} ms/request")
+    print(f"speedup:     {legacy / fast:.1f}x")
+
+
+if __name__ == "__main__":
+    run_benchmark()
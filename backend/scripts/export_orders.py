@@ -0,0 +1,63 @@
+"""
+Export orders as NDJSON or CSV with constant memory.
+
+Streams every order (or the orders of one user) from a Motor cursor, in _id
+order, to a file or stdout. Archived orders (orders_archive) are merged in
+unless --exclude-archived is given. Each row starts with the order id: rerun
+with --after <last exported id> to resume an interrupted export; the output
+file is then appended to (without a second CSV header).
+
+Usage:
+    python scripts/export_orders.py [--format ndjson|csv] [--output FILE]
+        [--user-id ID] [--after ID] [--batch-size 1000] [--exclude-archived]
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import argparse
+import asyncio
+from odmantic import ObjectId
+from commons.settings import settings
+from core.database.database import connect_to_mongo, close_mongo_connection
+from core.cruds.order_crud import OrderCRUD
+from core.utils.export import EXPORT_FORMATS, stream_orders
+
+
+async def export(args) -> int:
+    await connect_to_mongo()
+    output = open(args.output, "ab" if args.after else "wb") if args.output else None
+    stream = output or sys.stdout.buffer
+    try:
+        documents = OrderCRUD().iter_raw(
+            user_id=args.user_id,
+            after=ObjectId(args.after) if args.after else None,
+            batch_size=args.batch_size,
+            include_archived=not args.exclude_archived,
+        )
+        # A resumed export is appended to: no second CSV header
+        chunks = stream_orders(documents, args.format, header=not args.after)
+        async for chunk in chunks:
+            stream.write(chunk)
+        stream.flush()
+        return 0
+    finally:
+        if output:
+            output.close()
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export orders as NDJSON or CSV")
+    parser.add_argument("--format", choices=sorted(EXPORT_FORMATS), default="ndjson")
+    parser.add_argument("--output", help="Output file (default: stdout)")
+    parser.add_argument("--user-id", help="Only export the orders of this user")
+    parser.add_argument("--after", help="Resume after this order id")
+    parser.add_argument("--batch-size", type=int, default=settings.export_batch_size)
+    parser.add_argument(
+        "--exclude-archived",
+        action="store_true",
+        help="Only export the orders still in the orders collection",
+    )
+    sys.exit(asyncio.run(export(parser.parse_args())))
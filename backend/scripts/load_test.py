@@ -0,0 +1,642 @@
+"""
+Load test of the API with concurrent virtual users (asyncio + httpx).
+
+The application is driven in-process, either directly through
+httpx.ASGITransport (--target asgi) or over a local socket served by
+uvicorn (--target socket, includes the HTTP stack). Each virtual user runs
+scenarios picked at random with the --mix weights:
+
+- signup:           POST /v1/users
+- login:            POST /v1/user_login
+- order_crud:       POST /v1/orders, then GET, PATCH and DELETE
+                    /v1/orders/{id}
+- listing:          GET /v1/users/me/orders, first and second page
+- forgot_password:  POST /v1/users/forgot_password; the OTP emails go to
+                    a local SMTP sink started by the script, never to a
+                    real SMTP server
+
+Before the run, --accounts users are signed up with --orders orders each
+(the login, order and listing scenarios use them). The repositories use
+the in-memory backend by default, so no service is needed; with
+--backend mongo the data is written to MONGODB_URI / DATABASE_NAME (use a
+scratch database: the generated users and orders are not deleted).
+
+Prints the throughput and p50/p95/p99 latencies of every endpoint.
+--save-baseline stores them as JSON; --baseline compares the run with a
+stored one and exits with status 1 when an endpoint's p50 or p95 grew, or
+its throughput dropped, by more than --threshold. The exit status is also
+1 (so the script can gate CI) when:
+
+- more than --max-error-rate of the requests failed (default: any error)
+- an endpoint's p95 exceeds --max-p95-ms
+- the SMTP sink received fewer OTP emails than forgot_password succeeded
+
+Usage:
+    python scripts/load_test.py [--target asgi|socket] [--backend memory|mongo]
+        [--users 20] [--duration 10] [--warmup 2] [--accounts 20]
+        [--orders 50] [--mix signup=1,login=2,order_crud=4,listing=4,forgot_password=1]
+        [--save-baseline baseline.json] [--baseline baseline.json]
+        [--threshold 0.25] [--max-error-rate 0] [--max-p95-ms 500]
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import argparse
+import asyncio
+import json
+import math
+import platform
+import random
+import socket
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timezone
+
+import httpx
+
+PASSWORD = "load-test-password"
+PAGE_SIZE = 20
+ORDER_BATCH_SIZE = 500
+DEFAULT_MIX = "signup=1,login=2,order_crud=4,listing=4,forgot_password=1"
+ADDRESS = {
+    "street_address": "456 Test Blvd",
+    "city": "Pune",
+    "state": "Maharashtra",
+    "postal_code": "411001",
+    "country": "India",
+}
+ITEMS = ["Smartphone", "Charger", "Headphones", "Laptop", "Keyboard", "Monitor"]
+
+# Regressions are only reported for endpoints with enough samples to have
+# stable percentiles
+MIN_SAMPLES = 20
+
+
+def signup_request(email: str) -> dict:
+    return {
+        "first_name": "Load",
+        "last_name": "Test",
+        "email": email,
+        "mobile_number": "1234567890",
+        "password": PASSWORD,
+        "address": dict(ADDRESS),
+    }
+
+
+def order_request(user_id: str, rng: random.Random) -> dict:
+    return {
+        "user_id": user_id,
+        "item_name": f"{rng.choice(ITEMS)} {rng.randint(1, 999)}",
+        "price": float(rng.randint(1, 2000)),
+        "item_list": rng.sample(ITEMS, 2),
+        "Address": dict(ADDRESS),
+    }
+
+
+class SMTPSink:
+    """
+    Minimal SMTP server that accepts and discards every message.
+
+    Supports what aiosmtplib needs to send a message: EHLO, AUTH PLAIN,
+    MAIL, RCPT, DATA and QUIT (no STARTTLS).
+    """
+
+    def __init__(self):
+        self.messages = 0
+        self._server = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        self._server = await asyncio.start_server(self._handle, host, port)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        async def reply(*lines: str):
+            writer.write("".join(f"{line}\r\n" for line in lines).encode())
+            await writer.drain()
+
+        try:
+            await reply("220 load-test SMTP sink")
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                command = line.decode(errors="replace").strip().split(" ")
+                verb = command[0].upper()
+                if verb == "EHLO":
+                    await reply("250-load-test", "250-AUTH PLAIN", "250 8BITMIME")
+                elif verb == "AUTH":
+                    if len(command) < 3:
+                        # Credentials sent after an empty challenge
+                        await reply("334 ")
+                        await reader.readline()
+                    await reply("235 Authentication successful")
+                elif verb == "DATA":
+                    await reply("354 End data with <CR><LF>.<CR><LF>")
+                    while (await reader.readline()) not in (b".\r\n", b""):
+                        pass
+                    self.messages += 1
+                    await reply("250 OK")
+                elif verb == "QUIT":
+                    await reply("221 Bye")
+                    break
+                else:
+                    await reply("250 OK")
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+class Account:
+    """
+    A signed-up user shared by the virtual users.
+    """
+
+    def __init__(self, email: str, user_id: str, token: str):
+        self.email = email
+        self.user_id = user_id
+        self.headers = {"Authorization": f"Bearer {token}"}
+
+
+class Recorder:
+    """
+    Latencies (ms) and failures per endpoint.
+    """
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.failures = []
+        self.recording = False
+
+    def add(self, endpoint: str, latency: float, error: str | None):
+        if not self.recording:
+            return
+        self.latencies[endpoint].append(latency)
+        if error is not None:
+            self.errors[endpoint] += 1
+            if len(self.failures) < 5:
+                self.failures.append(f"{endpoint}: {error}")
+
+
+class VirtualUser:
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        recorder: Recorder,
+        accounts: list,
+        rng: random.Random,
+    ):
+        self.client = client
+        self.recorder = recorder
+        self.accounts = accounts
+        self.rng = rng
+
+    def account(self) -> Account:
+        return self.rng.choice(self.accounts)
+
+    async def call(
+        self, endpoint: str, method: str, url: str, expected: int, **kwargs
+    ) -> httpx.Response | None:
+        """
+        Send a request and record its latency under endpoint.
+
+        Returns:
+            The response, or None when its status is not the expected one
+        """
+        error = None
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+            if response.status_code != expected:
+                error = f"{response.status_code} {response.text[:200]}"
+        except httpx.HTTPError as exception:
+            response, error = None, repr(exception)
+        self.recorder.add(endpoint, (time.perf_counter() - start) * 1000, error)
+        return response if error is None else None
+
+
+async def signup(user: VirtualUser):
+    email = f"load-{uuid.uuid4().hex}@example.com"
+    await user.call(
+        "POST /v1/users", "POST", "/v1/users", 201, json=signup_request(email)
+    )
+
+
+async def login(user: VirtualUser):
+    account = user.account()
+    await user.call(
+        "POST /v1/user_login",
+        "POST",
+        "/v1/user_login",
+        201,
+        json={"email": account.email, "password": PASSWORD},
+    )
+
+
+async def order_crud(user: VirtualUser):
+    account = user.account()
+    response = await user.call(
+        "POST /v1/orders",
+        "POST",
+        "/v1/orders",
+        201,
+        json=order_request(account.user_id, user.rng),
+        headers=account.headers,
+    )
+    if response is None:
+        return
+    url = f"/v1/orders/{response.json()['order']['id']}"
+    await user.call("GET /v1/orders/{id}", "GET", url, 200, headers=account.headers)
+    await user.call(
+        "PATCH /v1/orders/{id}",
+        "PATCH",
+        url,
+        200,
+        json={"status": "PENDING", "price": float(user.rng.randint(1, 2000))},
+        headers=account.headers,
+    )
+    await user.call(
+        "DELETE /v1/orders/{id}", "DELETE", url, 200, headers=account.headers
+    )
+
+
+async def listing(user: VirtualUser):
+    account = user.account()
+    response = await user.call(
+        "GET /v1/users/me/orders",
+        "GET",
+        "/v1/users/me/orders",
+        200,
+        params={"limit": PAGE_SIZE},
+        headers=account.headers,
+    )
+    cursor = response.json()["next_cursor"] if response is not None else None
+    if cursor:
+        await user.call(
+            "GET /v1/users/me/orders?cursor",
+            "GET",
+            "/v1/users/me/orders",
+            200,
+            params={"limit": PAGE_SIZE, "cursor": cursor},
+            headers=account.headers,
+        )
+
+
+async def forgot_password(user: VirtualUser):
+    await user.call(
+        "POST /v1/users/forgot_password",
+        "POST",
+        "/v1/users/forgot_password",
+        201,
+        json={"email": user.account().email},
+    )
+
+
+SCENARIOS = {
+    "signup": signup,
+    "login": login,
+    "order_crud": order_crud,
+    "listing": listing,
+    "forgot_password": forgot_password,
+}
+
+
+def parse_mix(mix: str) -> dict:
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise argparse.ArgumentTypeError(
+                f"Unknown scenario {name!r}, expected one of {', '.join(SCENARIOS)}"
+            )
+        weights[name] = float(weight or 1)
+    return weights
+
+
+async def create_accounts(
+    client: httpx.AsyncClient, count: int, orders: int, rng: random.Random
+) -> list:
+    async def create(index: int) -> Account:
+        email = f"load-account-{uuid.uuid4().hex}@example.com"
+        response = await client.post("/v1/users", json=signup_request(email))
+        response.raise_for_status()
+        body = response.json()
+        account = Account(email, body["user"]["id"], body["access_token"])
+        for start in range(0, orders, ORDER_BATCH_SIZE):
+            batch = [
+                order_request(account.user_id, rng)
+                for _ in range(min(ORDER_BATCH_SIZE, orders - start))
+            ]
+            response = await client.post(
+                "/v1/orders/batch", json={"orders": batch}, headers=account.headers
+            )
+            response.raise_for_status()
+        return account
+
+    return await asyncio.gather(*(create(index) for index in range(count)))
+
+
+def percentile(values: list, q: float) -> float:
+    # Nearest-rank percentile of sorted values
+    return values[max(0, math.ceil(q / 100 * len(values)) - 1)]
+
+
+def summarize(recorder: Recorder, elapsed: float) -> dict:
+    endpoints = {}
+    for endpoint, latencies in sorted(recorder.latencies.items()):
+        latencies = sorted(latencies)
+        endpoints[endpoint] = {
+            "requests": len(latencies),
+            "errors": recorder.errors[endpoint],
+            "throughput": round(len(latencies) / elapsed, 2),
+            "p50": round(percentile(latencies, 50), 3),
+            "p95": round(percentile(latencies, 95), 3),
+            "p99": round(percentile(latencies, 99), 3),
+        }
+    requests = sum(stats["requests"] for stats in endpoints.values())
+    errors = sum(stats["errors"] for stats in endpoints.values())
+    return {
+        "overall": {
+            "requests": requests,
+            "errors": errors,
+            "throughput": round(requests / elapsed, 2),
+            "elapsed_seconds": round(elapsed, 3),
+        },
+        "endpoints": endpoints,
+    }
+
+
+def report(results: dict):
+    print(
+        f"{'endpoint':<34} {'requests':>8} {'errors':>6} {'req/s':>9} "
+        f"{'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"
+    )
+    for endpoint, stats in results["endpoints"].items():
+        print(
+            f"{endpoint:<34} {stats['requests']:>8} {stats['errors']:>6} "
+            f"{stats['throughput']:>9.1f} {stats['p50']:>9.2f} "
+            f"{stats['p95']:>9.2f} {stats['p99']:>9.2f}"
+        )
+    overall = results["overall"]
+    print(
+        f"{'total':<34} {overall['requests']:>8} {overall['errors']:>6} "
+        f"{overall['throughput']:>9.1f}"
+    )
+
+
+def compare(baseline: dict, results: dict, threshold: float) -> list:
+    """
+    Return the regressions of results against baseline.
+    """
+    regressions = []
+    for endpoint, stats in results["endpoints"].items():
+        before = baseline["endpoints"].get(endpoint)
+        if before is None or min(before["requests"], stats["requests"]) < MIN_SAMPLES:
+            continue
+        for metric in ("p50", "p95"):
+            if stats[metric] > before[metric] * (1 + threshold):
+                regressions.append(
+                    f"{endpoint} {metric} {before[metric]:.2f} ms -> "
+                    f"{stats[metric]:.2f} ms "
+                    f"(+{(stats[metric] / before[metric] - 1) * 100:.0f}%)"
+                )
+        if stats["throughput"] < before["throughput"] * (1 - threshold):
+            regressions.append(
+                f"{endpoint} throughput {before['throughput']:.1f} -> "
+                f"{stats['throughput']:.1f} req/s "
+                f"({(stats['throughput'] / before['throughput'] - 1) * 100:.0f}%)"
+            )
+    return regressions
+
+
+def latency_breaches(results: dict, max_p95_ms: float) -> list:
+    """
+    Return the endpoints of results whose p95 exceeds max_p95_ms.
+    """
+    return [
+        f"{endpoint} p95 {stats['p95']:.2f} ms > {max_p95_ms:g} ms"
+        for endpoint, stats in results["endpoints"].items()
+        if stats["requests"] >= MIN_SAMPLES and stats["p95"] > max_p95_ms
+    ]
+
+
+async def run_users(
+    client: httpx.AsyncClient,
+    recorder: Recorder,
+    accounts: list,
+    mix: dict,
+    users: int,
+    warmup: float,
+    duration: float,
+    seed: int,
+) -> float:
+    """
+    Run the virtual users; return the measured duration in seconds.
+    """
+    names, weights = list(mix), list(mix.values())
+    deadline = time.monotonic() + warmup + duration
+
+    async def virtual_user(index: int):
+        user = VirtualUser(client, recorder, accounts, random.Random(seed + index))
+        while time.monotonic() < deadline:
+            scenario = user.rng.choices(names, weights)[0]
+            await SCENARIOS[scenario](user)
+
+    tasks = [asyncio.create_task(virtual_user(index)) for index in range(users)]
+    await asyncio.sleep(warmup)
+    recorder.recording = True
+    start = time.monotonic()
+    await asyncio.gather(*tasks)
+    return time.monotonic() - start
+
+
+async def serve_on_socket(app):
+    """
+    Serve app with uvicorn on a free local port; return (server, task, url).
+    """
+    import uvicorn
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(app, log_level="warning"))
+    task = asyncio.create_task(server.serve(sockets=[sock]))
+    while not server.started:
+        if task.done():
+            task.result()
+        await asyncio.sleep(0.05)
+    return server, task, f"http://127.0.0.1:{port}"
+
+
+async def run_load_test(args) -> int:
+    # Imported after REPOSITORY_BACKEND is set
+    from commons.settings import settings
+    from core.apis.api import app
+
+    sink = SMTPSink()
+    smtp_port = await sink.start()
+    settings.smtp_host = "127.0.0.1"
+    settings.smtp_port = smtp_port
+    settings.smtp_start_tls = False
+    settings.gmail_user = "load-test@example.com"
+    settings.gmail_app_password = "load-test"
+
+    mix = parse_mix(args.mix)
+    rng = random.Random(args.seed)
+    recorder = Recorder()
+    timeout = httpx.Timeout(60.0)
+    limits = httpx.Limits(max_connections=args.users + args.accounts)
+    server = server_task = None
+    try:
+        if args.target == "socket":
+            server, server_task, base_url = await serve_on_socket(app)
+            client = httpx.AsyncClient(
+                base_url=base_url, timeout=timeout, limits=limits
+            )
+            lifespan = None
+        else:
+            # ASGITransport does not run the lifespan: enter it here
+            lifespan = app.router.lifespan_context(app)
+            await lifespan.__aenter__()
+            client = httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=app),
+                base_url="http://load-test",
+                timeout=timeout,
+            )
+
+        async with client:
+            print(
+                f"Creating {args.accounts} accounts with {args.orders} orders each "
+                f"({args.backend} backend)"
+            )
+            accounts = await create_accounts(client, args.accounts, args.orders, rng)
+            print(
+                f"Running {args.users} virtual users for {args.duration:g} s "
+                f"after a {args.warmup:g} s warmup ({args.target} target)"
+            )
+            elapsed = await run_users(
+                client,
+                recorder,
+                accounts,
+                mix,
+                args.users,
+                args.warmup,
+                args.duration,
+                args.seed,
+            )
+
+        if lifespan is not None:
+            await lifespan.__aexit__(None, None, None)
+    finally:
+        if server is not None:
+            server.should_exit = True
+            await server_task
+        await sink.stop()
+
+    results = summarize(recorder, elapsed)
+    results["meta"] = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "target": args.target,
+        "backend": args.backend,
+        "users": args.users,
+        "duration": args.duration,
+        "accounts": args.accounts,
+        "orders": args.orders,
+        "mix": mix,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+    }
+    report(results)
+    print(f"{sink.messages} OTP emails received by the SMTP sink")
+    for failure in recorder.failures:
+        print(f"  failed: {failure}")
+
+    failed = False
+    overall = results["overall"]
+    error_rate = overall["errors"] / max(overall["requests"], 1)
+    if error_rate > args.max_error_rate:
+        print(f"FAIL: {error_rate:.2%} of the requests failed")
+        failed = True
+
+    if args.max_p95_ms:
+        for breach in latency_breaches(results, args.max_p95_ms):
+            print(f"FAIL: {breach}")
+            failed = True
+
+    forgot = results["endpoints"].get("POST /v1/users/forgot_password")
+    if forgot and sink.messages < forgot["requests"] - forgot["errors"]:
+        print(
+            f"FAIL: {forgot['requests'] - forgot['errors']} forgot_password "
+            f"requests succeeded but {sink.messages} OTP emails were received"
+        )
+        failed = True
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        regressions = compare(baseline, results, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}")
+        if regressions:
+            failed = True
+        else:
+            print(f"No regression above {args.threshold:.0%} against {args.baseline}")
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as file:
+            json.dump(results, file, indent=2)
+        print(f"Baseline saved to {args.save_baseline}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--target", choices=["asgi", "socket"], default="asgi")
+    parser.add_argument("--backend", choices=["memory", "mongo"], default="memory")
+    parser.add_argument("--users", type=int, default=20, help="Virtual users")
+    parser.add_argument("--duration", type=float, default=10, help="Seconds measured")
+    parser.add_argument("--warmup", type=float, default=2, help="Seconds not measured")
+    parser.add_argument("--accounts", type=int, default=20)
+    parser.add_argument("--orders", type=int, default=50, help="Orders per account")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Scenario weights")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--baseline", help="Baseline JSON to compare with")
+    parser.add_argument("--save-baseline", help="Write the results to this file")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="Allowed relative regression of p50/p95/throughput",
+    )
+    parser.add_argument(
+        "--max-error-rate",
+        type=float,
+        default=0.0,
+        help="Allowed fraction of failed requests",
+    )
+    parser.add_argument(
+        "--max-p95-ms",
+        type=float,
+        help="Fail when an endpoint's p95 latency exceeds this many ms",
+    )
+    args = parser.parse_args()
+    try:
+        parse_mix(args.mix)
+    except argparse.ArgumentTypeError as error:
+        parser.error(str(error))
+
+    os.environ["REPOSITORY_BACKEND"] = args.backend
+    # JWTs only need to be consistent within the run
+    os.environ.setdefault("secret", "load-test-secret-" + "0" * 32)
+    os.environ.setdefault("algorithm", "HS256")
+    sys.exit(asyncio.run(run_load_test(args)))
@@ -0,0 +1,35 @@
+"""
+Rebuild the user_order_stats summaries from the orders collection.
+
+Reconciles the per-user order summaries maintained incrementally by the
+order writes. Run it after a data fix or periodically from cron (the API
+can also run it when SCHEDULER_ENABLED is set).
+
+Usage:
+    python scripts/rebuild_user_order_stats.py [--user-id ID]
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import argparse
+import asyncio
+from core.database.database import connect_to_mongo, close_mongo_connection
+from core.cruds.user_order_stats_crud import UserOrderStatsCRUD
+
+
+async def rebuild(user_id: str | None):
+    await connect_to_mongo()
+    try:
+        written = await UserOrderStatsCRUD().rebuild(user_id)
+        print(f"Rebuilt {written} order summaries")
+    finally:
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild the user order summaries")
+    parser.add_argument("--user-id", help="Only rebuild the summary of this user")
+    args = parser.parse_args()
+    asyncio.run(rebuild(args.user_id))
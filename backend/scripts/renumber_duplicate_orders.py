@@ -0,0 +1,67 @@
+"""
+Give a unique order_number to orders that share one.
+
+order_number used to be supplied by clients, so existing data can contain
+duplicates, which prevent the unique order_number index from being built.
+For every duplicated number the oldest order keeps it; the other orders get
+new numbers from the order_number counter. The indexes are then created.
+
+Usage:
+    python scripts/renumber_duplicate_orders.py [--dry-run]
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import argparse
+import asyncio
+from pymongo import UpdateOne
+from core.database.database import (
+    connect_to_mongo,
+    close_mongo_connection,
+    ensure_indexes,
+    get_engine,
+)
+from core.cruds.order_crud import order_numbers
+from core.models.order_model import Order
+
+
+async def renumber(dry_run: bool) -> int:
+    await connect_to_mongo()
+    try:
+        collection = get_engine().get_collection(Order)
+        duplicates = await collection.aggregate(
+            [
+                {"$sort": {"_id": 1}},
+                {"$group": {"_id": "$order_number", "ids": {"$push": "$_id"}}},
+                {"$match": {"ids.1": {"$exists": True}}},
+            ],
+            allowDiskUse=True,
+        ).to_list(length=None)
+        # The first (oldest) order of each group keeps its number
+        ids = [id for group in duplicates for id in group["ids"][1:]]
+        print(f"{len(duplicates)} duplicated numbers, {len(ids)} orders to renumber")
+        if dry_run or not ids:
+            return 0
+
+        numbers = await order_numbers.allocate(len(ids))
+        await collection.bulk_write(
+            [
+                UpdateOne({"_id": id}, {"$set": {"order_number": number}})
+                for id, number in zip(ids, numbers)
+            ],
+            ordered=False,
+        )
+        await ensure_indexes()
+        print(f"Renumbered {len(ids)} orders")
+        return 0
+    finally:
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Renumber duplicate order numbers")
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(renumber(args.dry_run)))
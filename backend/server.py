@@ -0,0 +1,207 @@
+"""
+Production Server Entry Point
+
+Pre-fork multi-worker launcher for Linux:
+
+- The application is imported once in the master process and the listening
+  socket is bound there; workers are forked afterwards and share both
+  (copy-on-write), so the import cost and module memory are paid once.
+- Each worker runs its own uvicorn server (uvloop + httptools when they are
+  installed) with its own event loop and MongoDB client, created by the
+  app lifespan after the fork.
+- SIGTERM/SIGINT on the master is forwarded to every worker. Workers stop
+  accepting connections, drain in-flight requests for up to
+  GRACEFUL_TIMEOUT seconds and run the lifespan shutdown, which closes the
+  Motor client via close_mongo_connection.
+- Workers that exit unexpectedly are restarted, and workers stop on their
+  own if the master dies.
+- Each worker only invalidates its own in-process caches: with more than one
+  worker the caches are disabled unless CACHE_BACKEND=redis. Order stream
+  events need a MongoDB replica set to reach the streams of every worker.
+
+Usage:
+    python server.py [--host 0.0.0.0] [--port 8000] [--workers 4]
+
+For local development keep using `python main.py` (single process, reload).
+"""
+
+import argparse
+import gc
+import importlib.util
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+
+import uvicorn
+
+from commons.settings import settings
+from core import logger
+from core.utils.cache import cache_backend_shared
+
+logging = logger(__name__)
+
+
+def _pick_implementation(module: str, fallback: str) -> str:
+    if importlib.util.find_spec(module) is not None:
+        return module
+    logging.warning(f"{module} is not installed, falling back to {fallback}")
+    return fallback
+
+
+def bind_socket(host: str, port: int) -> socket.socket:
+    """
+    Bind the listening socket in the master so every worker accepts on it.
+    """
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+class Master:
+    """
+    Forks and supervises the worker processes.
+    """
+
+    def __init__(self, app, sock: socket.socket, workers: int, graceful_timeout: int):
+        self.app = app
+        self.sock = sock
+        self.workers = workers
+        self.graceful_timeout = graceful_timeout
+        self.children = set()
+        self.shutting_down = False
+        self.master_pid = os.getpid()
+        self.loop = _pick_implementation("uvloop", "asyncio")
+        self.http = _pick_implementation("httptools", "h11")
+
+    def spawn_worker(self):
+        pid = os.fork()
+        if pid:
+            self.children.add(pid)
+            return
+
+        # Worker process
+        for sig in (signal.SIGTERM, signal.SIGINT, signal.SIGCHLD):
+            signal.signal(sig, signal.SIG_DFL)
+        config = uvicorn.Config(
+            self.app,
+            loop=self.loop,
+            http=self.http,
+            lifespan="on",
+            timeout_graceful_shutdown=self.graceful_timeout,
+            log_config=None,
+        )
+        server = uvicorn.Server(config)
+        threading.Thread(
+            target=self._exit_with_master, args=(server,), daemon=True
+        ).start()
+        try:
+            server.run(sockets=[self.sock])
+        finally:
+            os._exit(0)
+
+    def _exit_with_master(self, server: uvicorn.Server):
+        # Stop gracefully if the master dies without signalling the worker
+        while os.getppid() == self.master_pid:
+            time.sleep(1)
+        server.should_exit = True
+
+    def handle_stop(self, signum, frame):
+        if self.shutting_down:
+            return
+        self.shutting_down = True
+        logging.info(f"Received signal {signum}, stopping {len(self.children)} workers")
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                self.children.discard(pid)
+
+    def run(self):
+        signal.signal(signal.SIGTERM, self.handle_stop)
+        signal.signal(signal.SIGINT, self.handle_stop)
+
+        # Move everything imported so far out of the GC generations so
+        # collections in the workers do not dirty the shared pages.
+        gc.freeze()
+        for _ in range(self.workers):
+            self.spawn_worker()
+        logging.info(
+            f"Started {self.workers} workers (loop={self.loop}, http={self.http}) "
+            f"on {self.sock.getsockname()}"
+        )
+
+        deadline = None
+        while self.children:
+            if self.shutting_down and deadline is None:
+                deadline = time.monotonic() + self.graceful_timeout + 5
+            if deadline is not None and time.monotonic() > deadline:
+                logging.warning("Graceful timeout exceeded, killing remaining workers")
+                for pid in list(self.children):
+                    try:
+                        os.kill(pid, signal.SIGKILL)
+                    except ProcessLookupError:
+                        pass
+
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                time.sleep(0.2)
+                continue
+
+            self.children.discard(pid)
+            if not self.shutting_down:
+                logging.warning(
+                    f"Worker {pid} exited with status {status}, starting a new one"
+                )
+                time.sleep(1)
+                self.spawn_worker()
+
+        self.sock.close()
+        logging.info("All workers stopped")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the API in production mode")
+    parser.add_argument("--host", default=settings.server_host)
+    parser.add_argument("--port", type=int, default=settings.server_port)
+    parser.add_argument("--workers", type=int, default=settings.server_workers)
+    parser.add_argument(
+        "--graceful-timeout", type=int, default=settings.graceful_timeout
+    )
+    args = parser.parse_args()
+
+    if not hasattr(os, "fork"):
+        sys.exit("server.py needs os.fork (Linux); use main.py on this platform")
+
+    workers = max(1, args.workers)
+    if workers > 1 and not cache_backend_shared(settings.cache_backend):
+        # A write only invalidates the cache of the worker that handled it
+        logging.warning(
+            f"CACHE_BACKEND={settings.cache_backend} is per process and cannot be "
+            f"invalidated across {workers} workers: caching is disabled. "
+            "Set CACHE_BACKEND=redis to cache with several workers."
+        )
+        settings.cache_backend = "none"
+
+    # Pre-fork import: loaded once here and shared by every worker
+    from core.apis.api import app
+    from core.utils.order_events import order_events
+
+    # Checked by each worker when it picks the order events source
+    order_events.worker_processes = workers
+
+    sock = bind_socket(args.host, args.port)
+    Master(app, sock, workers, args.graceful_timeout).run()
+
+
+if __name__ == "__main__":
+    main()
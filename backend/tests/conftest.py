@@ -0,0 +1,130 @@
+"""
+Fixtures of the API tests.
+
+The API runs in-process on the in-memory repositories
+(REPOSITORY_BACKEND=memory), so these tests need no MongoDB server. Every
+test signs up its own users: the store is shared by the whole session.
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+# Read by commons.settings when it is first imported
+os.environ["REPOSITORY_BACKEND"] = "memory"
+os.environ.setdefault("secret", "test-secret-" + "0" * 32)
+os.environ.setdefault("algorithm", "HS256")
+import uuid
+import pytest
+from fastapi.testclient import TestClient
+
+PASSWORD = "password123"
+ADDRESS = {
+    "street_address": "456 Test Blvd",
+    "city": "Pune",
+    "state": "Maharashtra",
+    "postal_code": "411001",
+    "country": "India",
+}
+
+
+def pytest_configure(config):
+    # pytest resets the warning filters, including the one installed by
+    # core.utils.serializers
+    config.addinivalue_line("filterwarnings", "ignore:ORJSONResponse is deprecated")
+
+
+@pytest.fixture(scope="session")
+def client():
+    """
+    TestClient of the app, with its lifespan running for the whole session.
+    """
+    from core.apis.api import app
+
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def signup_body():
+    """
+    Return a function building a signup request with a new email.
+    """
+
+    def build(**values) -> dict:
+        body = {
+            "first_name": "Test",
+            "last_name": "User",
+            "email": f"{uuid.uuid4().hex}@example.com",
+            "mobile_number": "1234567890",
+            "password": PASSWORD,
+            "address": ADDRESS,
+        }
+        body.update(values)
+        return body
+
+    return build
+
+
+@pytest.fixture
+def signup(client, signup_body):
+    """
+    Return a function signing up a new user.
+
+    Returns:
+        tuple: (user id, Authorization headers) of the new user
+    """
+
+    def create() -> tuple:
+        response = client.post("/v1/users", json=signup_body())
+        assert response.status_code == 201, response.text
+        body = response.json()
+        return body["user"]["id"], {"Authorization": f"Bearer {body['access_token']}"}
+
+    return create
+
+
+@pytest.fixture
+def user(signup):
+    return signup()
+
+
+@pytest.fixture
+def order_body():
+    """
+    Return a function building an order creation request.
+    """
+
+    def build(user_id: str, **values) -> dict:
+        body = {
+            "user_id": user_id,
+            "item_name": "Phone",
+            "price": 10.0,
+            "item_list": ["Smartphone", "Charger"],
+            "Address": ADDRESS,
+            "status": "BOOKED",
+        }
+        body.update(values)
+        return body
+
+    return build
+
+
+@pytest.fixture
+def create_order(client, user, order_body):
+    """
+    Return a function creating an order of the user fixture.
+
+    Returns:
+        dict: The created order
+    """
+    user_id, headers = user
+
+    def create(**values) -> dict:
+        response = client.post(
+            "/v1/orders", json=order_body(user_id, **values), headers=headers
+        )
+        assert response.status_code == 201, response.text
+        return response.json()["order"]
+
+    return create
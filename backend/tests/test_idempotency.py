@@ -0,0 +1,98 @@
+"""
+Idempotency-Key handling of POST /v1/orders and POST /v1/users.
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import pytest
+from fastapi import HTTPException
+from commons.settings import settings
+from core.cruds.idempotency_crud import IdempotencyCRUD
+from core.utils.idempotency import REPLAYED_HEADER, _fingerprint, run_idempotent
+
+
+def list_orders(client, headers) -> list:
+    response = client.get("/v1/users/me/orders", headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()["orders"]
+
+
+def test_retry_replays_the_first_response(client, user, order_body):
+    user_id, headers = user
+    headers = {**headers, "Idempotency-Key": "order-1"}
+    first = client.post("/v1/orders", json=order_body(user_id), headers=headers)
+    retry = client.post("/v1/orders", json=order_body(user_id), headers=headers)
+
+    assert first.status_code == retry.status_code == 201
+    assert REPLAYED_HEADER not in first.headers
+    assert retry.headers[REPLAYED_HEADER] == "true"
+    assert retry.json() == first.json()
+    assert len(list_orders(client, user[1])) == 1
+
+
+def test_signup_replay_issues_a_new_token(client, signup_body):
+    body = signup_body()
+    headers = {"Idempotency-Key": "signup-1"}
+    first = client.post("/v1/users", json=body, headers=headers)
+    retry = client.post("/v1/users", json=body, headers=headers)
+
+    assert first.status_code == retry.status_code == 201
+    assert retry.headers[REPLAYED_HEADER] == "true"
+    assert retry.json()["user"] == first.json()["user"]
+    me = client.get(
+        "/v1/users/me",
+        headers={"Authorization": f"Bearer {retry.json()['access_token']}"},
+    )
+    assert me.status_code == 200
+
+
+def test_key_reused_with_another_body_is_rejected(client, user, order_body):
+    user_id, headers = user
+    headers = {**headers, "Idempotency-Key": "order-2"}
+    first = client.post("/v1/orders", json=order_body(user_id), headers=headers)
+    other = client.post(
+        "/v1/orders", json=order_body(user_id, price=20.0), headers=headers
+    )
+
+    assert first.status_code == 201
+    assert other.status_code == 422
+    assert len(list_orders(client, user[1])) == 1
+
+
+def test_keys_are_scoped_per_client(client, signup, signup_body, order_body):
+    created = []
+    for user_id, headers in (signup(), signup()):
+        response = client.post(
+            "/v1/orders",
+            json=order_body(user_id),
+            headers={**headers, "Idempotency-Key": "same-key"},
+        )
+        assert response.status_code == 201
+        assert REPLAYED_HEADER not in response.headers
+        created.append(response.json()["order"]["id"])
+    assert created[0] != created[1]
+
+    for _ in range(2):
+        response = client.post(
+            "/v1/users", json=signup_body(), headers={"Idempotency-Key": "same-key"}
+        )
+        assert response.status_code == 201
+        assert REPLAYED_HEADER not in response.headers
+
+
+def test_key_in_progress_elsewhere_is_a_conflict(client, monkeypatch):
+    # Claimed by a request still running in another process
+    payload = {"value": 1}
+    client.portal.call(IdempotencyCRUD().claim, "test:busy", _fingerprint(payload))
+    monkeypatch.setattr(settings, "idempotency_wait_seconds", 0.2)
+    calls = []
+
+    async def handler():
+        calls.append(True)
+
+    with pytest.raises(HTTPException) as error:
+        client.portal.call(run_idempotent, "test", "busy", payload, handler)
+    assert error.value.status_code == 409
+    assert not calls
@@ -0,0 +1,56 @@
+"""
+Reads of archived orders, and of orders caught between the copy to the
+archive and their removal from orders.
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import orjson
+from odmantic import ObjectId
+from core.cruds.order_archive_crud import OrderArchiveCRUD
+from core.repositories.memory import memory_store
+
+
+def listed_ids(client, headers, **params) -> list:
+    response = client.get("/v1/users/me/orders", params=params, headers=headers)
+    assert response.status_code == 200, response.text
+    return [order["id"] for order in response.json()["orders"]]
+
+
+def exported_ids(client, headers, **params) -> list:
+    response = client.get("/v1/users/me/orders/export", params=params, headers=headers)
+    assert response.status_code == 200, response.text
+    return [orjson.loads(line)["id"] for line in response.text.splitlines()]
+
+
+def test_archived_orders_stay_readable(client, user, create_order):
+    _, headers = user
+    archived, active = create_order(), create_order()
+    client.patch(
+        f"/v1/orders/{archived['id']}", json={"status": "COMPLETED"}, headers=headers
+    )
+    client.portal.call(OrderArchiveCRUD().archive_orders, -1)
+
+    assert ObjectId(archived["id"]) in memory_store.orders_archive
+    response = client.get(f"/v1/orders/{archived['id']}", headers=headers)
+    assert response.json()["status"] == "COMPLETED"
+    assert sorted(listed_ids(client, headers)) == sorted([archived["id"], active["id"]])
+    assert listed_ids(client, headers, include_archived="false") == [active["id"]]
+    assert sorted(exported_ids(client, headers)) == sorted(
+        [archived["id"], active["id"]]
+    )
+
+
+def test_order_being_archived_is_read_once(client, user, create_order):
+    user_id, headers = user
+    orders = [create_order()["id"] for _ in range(3)]
+    # The archival job copies an order to the archive before deleting it
+    # from orders
+    copied = ObjectId(orders[1])
+    memory_store.orders_archive[copied] = dict(memory_store.orders[copied])
+    memory_store.archive_by_user.setdefault(ObjectId(user_id), {})[copied] = None
+
+    assert sorted(listed_ids(client, headers)) == sorted(orders)
+    assert sorted(exported_ids(client, headers)) == sorted(orders)
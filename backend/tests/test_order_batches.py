@@ -0,0 +1,124 @@
+"""
+Per-item results of POST /v1/orders/batch and PATCH /v1/orders/batch/status,
+and the status transition rules they share with PATCH /v1/orders/{id}.
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from odmantic import ObjectId
+
+
+def test_batch_create_reports_every_item(client, user, signup, order_body):
+    user_id, headers = user
+    other_user_id, _ = signup()
+    response = client.post(
+        "/v1/orders/batch",
+        json={
+            "orders": [
+                order_body(user_id, item_name="First"),
+                order_body(user_id, price=-1),
+                order_body(other_user_id),
+                order_body(user_id, item_name="Last"),
+            ]
+        },
+        headers=headers,
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["created"], body["failed"]) == (2, 2)
+    results = body["results"]
+    assert [result["index"] for result in results] == [0, 1, 2, 3]
+    assert [result["status"] for result in results] == [
+        "created",
+        "error",
+        "error",
+        "created",
+    ]
+    assert "another user" in results[2]["error"]
+    created = [results[0]["order"], results[3]["order"]]
+    assert [order["item_name"] for order in created] == ["First", "Last"]
+    assert created[0]["order_number"] < created[1]["order_number"]
+    for order in created:
+        fetched = client.get(f"/v1/orders/{order['id']}", headers=headers)
+        assert fetched.json()["order_number"] == order["order_number"]
+
+
+def test_batch_status_reports_every_order(
+    client, user, signup, create_order, order_body
+):
+    _, headers = user
+    booked, completed, cancelled = (create_order() for _ in range(3))
+    client.patch(
+        f"/v1/orders/{completed['id']}", json={"status": "COMPLETED"}, headers=headers
+    )
+    client.patch(
+        f"/v1/orders/{cancelled['id']}", json={"status": "CANCELLED"}, headers=headers
+    )
+    other_user_id, other_headers = signup()
+    foreign = client.post(
+        "/v1/orders",
+        json=order_body(other_user_id),
+        headers=other_headers,
+    ).json()["order"]
+
+    ids = [
+        booked["id"],
+        completed["id"],
+        cancelled["id"],
+        foreign["id"],
+        str(ObjectId()),
+        "not-an-id",
+    ]
+    response = client.patch(
+        "/v1/orders/batch/status",
+        json={"order_ids": ids, "status": "COMPLETED"},
+        headers=headers,
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["updated"], body["failed"]) == (1, 4)
+    results = body["results"]
+    assert [result["id"] for result in results] == ids
+    assert [result["outcome"] for result in results] == [
+        "updated",
+        "unchanged",
+        "error",
+        "error",
+        "error",
+        "error",
+    ]
+    assert [result["previous_status"] for result in results[:3]] == [
+        "BOOKED",
+        "COMPLETED",
+        "CANCELLED",
+    ]
+    assert results[2]["error"] == "Cannot move an order from CANCELLED to COMPLETED"
+    assert results[4]["error"] == "Order not found"
+    assert results[5]["error"] == "Invalid order id"
+
+    fetched = client.get(f"/v1/orders/{booked['id']}", headers=headers).json()
+    assert fetched["status"] == "COMPLETED"
+    fetched = client.get(f"/v1/orders/{foreign['id']}", headers=other_headers).json()
+    assert fetched["status"] == "BOOKED"
+
+
+def test_final_status_cannot_change(client, user, create_order):
+    _, headers = user
+    order = create_order()
+    url = f"/v1/orders/{order['id']}"
+    assert (
+        client.patch(url, json={"status": "PENDING"}, headers=headers).status_code
+        == 200
+    )
+    assert (
+        client.patch(url, json={"status": "CANCELLED"}, headers=headers).status_code
+        == 200
+    )
+
+    response = client.patch(url, json={"status": "BOOKED"}, headers=headers)
+    assert response.status_code == 409
+    assert client.get(url, headers=headers).json()["status"] == "CANCELLED"
@@ -0,0 +1,99 @@
+"""
+Cached GET responses of orders and users: conditional requests and
+invalidation by the writes, including writes racing an in-flight read.
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import asyncio
+import orjson
+from core.controllers.order_controller import OrderController
+from core.cruds.order_crud import OrderCRUD
+from core.cruds.user_crud import UserCRUD
+from core.repositories.memory import MemoryOrderRepository, MemoryUserRepository
+
+
+def test_patch_changes_the_etag(client, user, create_order):
+    _, headers = user
+    order = create_order()
+    url = f"/v1/orders/{order['id']}"
+
+    first = client.get(url, headers=headers)
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    assert (
+        client.get(url, headers={**headers, "If-None-Match": etag}).status_code == 304
+    )
+
+    patched = client.patch(url, json={"price": 25.0}, headers=headers)
+    assert patched.status_code == 200
+
+    after = client.get(url, headers={**headers, "If-None-Match": etag})
+    assert after.status_code == 200
+    assert after.json()["price"] == 25.0
+    assert after.headers["ETag"] != etag
+    new_etag = {**headers, "If-None-Match": after.headers["ETag"]}
+    assert client.get(url, headers=new_etag).status_code == 304
+
+
+def hold_first_read(monkeypatch, repository_class) -> asyncio.Event:
+    """
+    Make the next find_by_id of repository_class wait, after reading its
+    document, until the returned event is set.
+    """
+    gate = asyncio.Event()
+    read = repository_class.find_by_id
+    held = []
+
+    async def find_by_id(self, *args, **kwargs):
+        document = await read(self, *args, **kwargs)
+        if not held:
+            held.append(True)
+            await gate.wait()
+        return document
+
+    monkeypatch.setattr(repository_class, "find_by_id", find_by_id)
+    return gate
+
+
+def test_read_started_before_an_order_update(client, user, create_order, monkeypatch):
+    order = create_order()
+
+    async def race():
+        controller = OrderController()
+        gate = hold_first_read(monkeypatch, MemoryOrderRepository)
+        # Reads BOOKED, then waits
+        stale = asyncio.ensure_future(controller.get_order_response(order["id"]))
+        await asyncio.sleep(0.01)
+        await OrderCRUD().update_order(order["id"], {"status": "COMPLETED"})
+        # Must not join the read started before the update
+        fresh = asyncio.ensure_future(controller.get_order_response(order["id"]))
+        await asyncio.sleep(0.01)
+        gate.set()
+        await stale
+        later = await controller.get_order_response(order["id"])
+        return [orjson.loads(entry["body"])["status"] for entry in (await fresh, later)]
+
+    assert client.portal.call(race) == ["COMPLETED", "COMPLETED"]
+
+
+def test_read_started_before_a_user_update(client, user, monkeypatch):
+    user_id, _ = user
+
+    async def race():
+        users = UserCRUD()
+        gate = hold_first_read(monkeypatch, MemoryUserRepository)
+        stale = asyncio.ensure_future(users.get_by_id(user_id, include_sensitive=False))
+        await asyncio.sleep(0.01)
+        # The id is normalized before its cache entry is dropped
+        await users.update(user_id.upper(), {"first_name": "Updated"})
+        fresh = asyncio.ensure_future(users.get_by_id(user_id, include_sensitive=False))
+        await asyncio.sleep(0.01)
+        gate.set()
+        await stale
+        later = await users.get_by_id(user_id, include_sensitive=False)
+        return [(await fresh).first_name, later.first_name]
+
+    assert client.portal.call(race) == ["Updated", "Updated"]
@@ -0,0 +1,188 @@
+"""
+Check that every filter combination of GET /v1/users/me/orders is served by
+the index declared for it on the Order model.
+
+Creates a scratch database (<DATABASE_NAME>_index_check) on MONGODB_URI,
+builds the declared indexes, inserts sample orders, then explains the
+listing query for every combination of status / date range / price range /
+cursor. A combination fails if its winning plan contains a collection scan
+(COLLSCAN) or a blocking in-memory sort (SORT), or if it does not use
+user_status_created_price (status filter) or user_created_price (no status
+filter). The scratch database is dropped at the end.
+
+The tests need a MongoDB server: they are skipped when none answers on
+MONGODB_URI within CONNECT_TIMEOUT_MS.
+
+Usage:
+    MONGODB_URI=mongodb://localhost:27017 python -m pytest tests/test_order_indexes.py
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import asyncio
+import itertools
+from datetime import datetime, timedelta
+import pytest
+from motor.motor_asyncio import AsyncIOMotorClient
+from odmantic import AIOEngine, ObjectId
+from pymongo import MongoClient
+from pymongo.errors import PyMongoError
+from commons.settings import settings
+from core.repositories.mongo import (
+    ORDER_PROJECTION,
+    USER_ORDERS_SORT,
+    build_user_orders_query,
+)
+from core.models.order_model import Order, OrderStatus
+
+CONNECT_TIMEOUT_MS = 2000
+DATABASE = f"{settings.database_name}_index_check"
+SAMPLE_ORDERS = 5000
+SAMPLE_USERS = 10
+PAGE_SIZE = 21
+FORBIDDEN_STAGES = {"COLLSCAN", "SORT"}
+ADDRESS = {
+    "street_address": "456 Test Blvd",
+    "city": "Pune",
+    "state": "Maharashtra",
+    "postal_code": "411001",
+    "country": "India",
+}
+
+
+def mongo_available() -> bool:
+    client = MongoClient(
+        settings.mongodb_uri, serverSelectionTimeoutMS=CONNECT_TIMEOUT_MS
+    )
+    try:
+        client.admin.command("ping")
+        return True
+    except PyMongoError:
+        return False
+    finally:
+        client.close()
+
+
+if not mongo_available():
+    pytest.skip(
+        f"no MongoDB server answering on {settings.mongodb_uri}",
+        allow_module_level=True,
+    )
+
+
+def plan_stages(plan: dict):
+    """
+    Yield (stage, index name) for every stage of an explain plan tree.
+    """
+    if "queryPlan" in plan:
+        # Slot-based engine format (MongoDB 7+)
+        plan = plan["queryPlan"]
+    yield plan.get("stage"), plan.get("indexName")
+    children = plan.get("inputStages", [])
+    if "inputStage" in plan:
+        children = [plan["inputStage"], *children]
+    for child in children:
+        yield from plan_stages(child)
+
+
+def filter_combinations():
+    """
+    Yield the (statuses, date range, price range, use cursor) parameters of
+    every filter combination of the listing, named after its filters.
+    """
+    statuses = [None, [OrderStatus.BOOKED], [OrderStatus.BOOKED, OrderStatus.PENDING]]
+    dates = [None, (timedelta(days=30), timedelta(days=5))]
+    prices = [None, (100.0, 500.0)]
+    cursors = [False, True]
+    for status, date, price, after in itertools.product(
+        statuses, dates, prices, cursors
+    ):
+        name = ", ".join(
+            label
+            for label, value in [
+                ("status" if not status or len(status) == 1 else "statuses", status),
+                ("dates", date),
+                ("price", price),
+                ("cursor", after),
+            ]
+            if value
+        )
+        yield pytest.param(status, date, price, after, id=name or "no filter")
+
+
+async def configure_indexes():
+    client = AsyncIOMotorClient(settings.mongodb_uri)
+    try:
+        await AIOEngine(client=client, database=DATABASE).configure_database([Order])
+    finally:
+        client.close()
+
+
+@pytest.fixture(scope="module")
+def sample():
+    """
+    Build the declared indexes and insert the sample orders.
+
+    Yields:
+        tuple: (orders collection, listed user id, now, cursor)
+    """
+    client = MongoClient(settings.mongodb_uri)
+    client.drop_database(DATABASE)
+    try:
+        asyncio.run(configure_indexes())
+        collection = client[DATABASE][Order.__collection__]
+
+        now = datetime.utcnow()
+        user_ids = [ObjectId() for _ in range(SAMPLE_USERS)]
+        statuses = list(OrderStatus)
+        collection.insert_many(
+            [
+                Order(
+                    user_id=user_ids[i % len(user_ids)],
+                    item_name=f"Item {i}",
+                    price=float(i % 1000),
+                    order_number=i,
+                    item_list=["Smartphone"],
+                    Address=ADDRESS,
+                    status=statuses[i % len(statuses)],
+                    item_created_at=now - timedelta(minutes=i * 10),
+                ).model_dump_doc()
+                for i in range(SAMPLE_ORDERS)
+            ]
+        )
+
+        middle = collection.find_one(
+            {"user_id": user_ids[0]}, sort=USER_ORDERS_SORT, skip=SAMPLE_ORDERS // 40
+        )
+        cursor = (middle["item_created_at"], middle["_id"])
+        yield collection, str(user_ids[0]), now, cursor
+    finally:
+        client.drop_database(DATABASE)
+        client.close()
+
+
+@pytest.mark.parametrize("statuses,dates,prices,after", list(filter_combinations()))
+def test_listing_uses_its_index(sample, statuses, dates, prices, after):
+    collection, user_id, now, cursor = sample
+    query = build_user_orders_query(
+        user_id,
+        statuses=statuses,
+        created_from=now - dates[0] if dates else None,
+        created_to=now - dates[1] if dates else None,
+        min_price=prices[0] if prices else None,
+        max_price=prices[1] if prices else None,
+        after=cursor if after else None,
+    )
+    explain = (
+        collection.find(query, ORDER_PROJECTION)
+        .sort(USER_ORDERS_SORT)
+        .limit(PAGE_SIZE)
+        .explain()
+    )
+    stages = list(plan_stages(explain["queryPlanner"]["winningPlan"]))
+
+    assert not {stage for stage, _ in stages} & FORBIDDEN_STAGES, stages
+    expected = "user_status_created_price" if statuses else "user_created_price"
+    assert {index for _, index in stages if index} == {expected}, stages
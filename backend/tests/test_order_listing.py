@@ -0,0 +1,68 @@
+"""
+Keyset pagination of GET /v1/users/me/orders.
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+
+def read_pages(client, headers, limit: int, **params) -> list:
+    """
+    Follow next_cursor until the last page; return the pages of order ids.
+    """
+    pages, cursor = [], None
+    while True:
+        response = client.get(
+            "/v1/users/me/orders",
+            params={**params, "limit": limit, **({"cursor": cursor} if cursor else {})},
+            headers=headers,
+        )
+        assert response.status_code == 200, response.text
+        body = response.json()
+        pages.append([order["id"] for order in body["orders"]])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return pages
+
+
+def test_cursor_walks_every_order_once(client, user, create_order):
+    _, headers = user
+    created = [create_order(item_name=f"Order {i}")["id"] for i in range(7)]
+
+    pages = read_pages(client, headers, limit=3)
+
+    assert [len(page) for page in pages] == [3, 3, 1]
+    listed = [id for page in pages for id in page]
+    # Newest first; orders created in the same millisecond are ordered by id
+    assert sorted(listed) == sorted(created)
+    assert listed == read_pages(client, headers, limit=100)[0]
+
+
+def test_cursor_keeps_the_filters(client, user, create_order):
+    _, headers = user
+    cheap = [create_order(price=5.0)["id"] for _ in range(3)]
+    expensive = [create_order(price=50.0)["id"] for _ in range(4)]
+
+    pages = read_pages(client, headers, limit=2, min_price=20)
+
+    assert sorted(id for page in pages for id in page) == sorted(expensive)
+    assert not set(cheap) & {id for page in pages for id in page}
+
+
+def test_last_page_has_no_cursor(client, user, create_order):
+    _, headers = user
+    create_order()
+
+    pages = read_pages(client, headers, limit=1)
+
+    assert len(pages) == 1
+
+
+def test_invalid_cursor_is_rejected(client, user):
+    _, headers = user
+    response = client.get(
+        "/v1/users/me/orders", params={"cursor": "not-a-cursor"}, headers=headers
+    )
+    assert response.status_code == 400
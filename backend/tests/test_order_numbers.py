@@ -0,0 +1,61 @@
+"""
+Allocation of order_number from the order_number counter.
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import asyncio
+import uuid
+from core.cruds.counter_crud import SequenceAllocator
+from core.cruds.order_archive_crud import OrderArchiveCRUD
+from core.cruds.order_crud import order_numbers
+from core.repositories import get_order_repository
+
+
+def test_numbers_increase_across_single_and_batch_creations(
+    client, user, create_order, order_body
+):
+    user_id, headers = user
+    numbers = [create_order()["order_number"] for _ in range(3)]
+    batch = client.post(
+        "/v1/orders/batch",
+        json={"orders": [order_body(user_id) for _ in range(3)]},
+        headers=headers,
+    ).json()
+    numbers += [result["order"]["order_number"] for result in batch["results"]]
+    numbers.append(create_order()["order_number"])
+
+    assert numbers == sorted(set(numbers))
+
+
+def test_concurrent_allocations_never_overlap(client):
+    async def allocate():
+        return await asyncio.gather(
+            *(order_numbers.allocate(count) for count in [1, 7, 150, 3, 1] * 10)
+        )
+
+    blocks = client.portal.call(allocate)
+
+    numbers = [number for block in blocks for number in block]
+    assert len(numbers) == len(set(numbers)) == sum([1, 7, 150, 3, 1] * 10)
+    assert all(block == sorted(block) for block in blocks)
+
+
+def test_counter_starts_above_archived_orders(client, user, create_order):
+    _, headers = user
+    order = create_order()
+    client.patch(
+        f"/v1/orders/{order['id']}", json={"status": "COMPLETED"}, headers=headers
+    )
+    client.portal.call(OrderArchiveCRUD().archive_orders, -1)
+    assert client.get(f"/v1/orders/{order['id']}", headers=headers).status_code == 200
+
+    # A counter created after the order was archived, e.g. on a new database
+    allocator = SequenceAllocator(
+        f"order_number_{uuid.uuid4().hex}",
+        10,
+        floor=get_order_repository().max_order_number,
+    )
+    assert client.portal.call(allocator.next) > order["order_number"]
@@ -1,6 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import { Link } from 'react-router-dom';
 import api from '../services/api';
+import subscribeToOrderEvents from '../services/orderStream';
 import Card from '../components/ui/Card';
 import { Package, Clock, DollarSign, Calendar } from 'lucide-react';
 
@@ -10,6 +11,15 @@ const OrderList = () => {
 
     useEffect(() => {
         fetchOrders();
+        // Status changes are pushed by the server instead of re-fetching
+        return subscribeToOrderEvents({
+            onStatus: (event) => setOrders((current) => current.map((order) => (
+                order.id === event.id
+                    ? { ...order, status: event.status, item_updated_at: event.item_updated_at }
+                    : order
+            ))),
+            onResync: fetchOrders,
+        });
     }, []);
 
     const fetchOrders = async () => {
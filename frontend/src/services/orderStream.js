@@ -0,0 +1,55 @@
+// Subscribes to GET /users/me/orders/stream (Server-Sent Events).
+// fetch is used instead of EventSource so the token can be sent in the
+// Authorization header. Returns a function that closes the stream.
+const subscribeToOrderEvents = ({ onStatus, onResync }) => {
+    const controller = new AbortController();
+    const baseURL = import.meta.env.VITE_API_URL || '/v1';
+
+    const dispatch = (block) => {
+        let event = 'message';
+        let data = '';
+        block.split('\n').forEach((line) => {
+            if (line.startsWith('event:')) event = line.slice(6).trim();
+            else if (line.startsWith('data:')) data += line.slice(5).trim();
+        });
+        if (event === 'order_status' && data) onStatus(JSON.parse(data));
+        else if (event === 'resync') onResync();
+    };
+
+    const connect = async () => {
+        let reconnecting = false;
+        while (!controller.signal.aborted) {
+            try {
+                const response = await fetch(`${baseURL}/users/me/orders/stream`, {
+                    headers: { Authorization: `Bearer ${localStorage.getItem('token')}` },
+                    signal: controller.signal,
+                });
+                if (response.status === 401) return;
+                if (response.ok) {
+                    // Changes may have been missed while disconnected
+                    if (reconnecting) onResync();
+                    reconnecting = true;
+                    const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+                    let buffer = '';
+                    for (;;) {
+                        const { value, done } = await reader.read();
+                        if (done) break;
+                        buffer += value;
+                        const blocks = buffer.split('\n\n');
+                        buffer = blocks.pop();
+                        blocks.forEach(dispatch);
+                    }
+                }
+            } catch (error) {
+                if (controller.signal.aborted) return;
+                console.error("Order stream interrupted", error);
+            }
+            await new Promise((resolve) => setTimeout(resolve, 5000));
+        }
+    };
+
+    connect();
+    return () => controller.abort();
+};
+
+export default subscribeToOrderEvents;